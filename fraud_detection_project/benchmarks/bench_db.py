@@ -0,0 +1,95 @@
+import os
+import sys
+import asyncio
+import shutil
+import tempfile
+import time
+import warnings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'fraud_detection'))
+
+import logging  # noqa: E402
+import pandas as pd  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from db import dispose_engines  # noqa: E402
+from fraud_detection import (  # noqa: E402
+    load_data_from_db, load_data_from_db_async, write_predictions_to_db
+)
+from synthetic_data import generate_transactions  # noqa: E402
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+# ---------------------------------------------------
+# 🗄️ Repeated small loads/writes: engine per call vs pooled engine
+# ---------------------------------------------------
+
+
+def engine_per_call_load(db_path, table_name="transactions"):
+    engine = create_engine(f"sqlite:///{db_path}")
+    return pd.read_sql_table(table_name, con=engine)
+
+
+def engine_per_call_write(df, db_path, table_name="predictions"):
+    engine = create_engine(f"sqlite:///{db_path}")
+    df.to_sql(table_name, con=engine, if_exists='replace', index=False)
+
+
+def _timed(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+async def _gather_loads(db_path, calls):
+    await asyncio.gather(*(load_data_from_db_async(db_path)
+                           for _ in range(calls)))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DB layer microbenchmark")
+    parser.add_argument("--rows", type=int, default=100,
+                        help="Rows per load/write")
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    workdir = tempfile.mkdtemp(prefix="fraud_db_bench_")
+    try:
+        df = generate_transactions(args.rows)
+        old_db = os.path.join(workdir, "old.db")
+        new_db = os.path.join(workdir, "new.db")
+        engine_per_call_write(df, old_db, "transactions")
+        write_predictions_to_db(df, new_db, "transactions")
+
+        results = {
+            "load (engine per call)": _timed(
+                lambda: engine_per_call_load(old_db), args.calls),
+            "load (pooled)": _timed(
+                lambda: load_data_from_db(new_db), args.calls),
+            "write (engine per call)": _timed(
+                lambda: engine_per_call_write(df, old_db), args.calls),
+            "write (pooled)": _timed(
+                lambda: write_predictions_to_db(df, new_db), args.calls),
+        }
+        start = time.perf_counter()
+        asyncio.run(_gather_loads(new_db, args.calls))
+        results["load (async, gathered)"] = \
+            (time.perf_counter() - start) / args.calls
+
+        print(f"{args.rows} rows per call, {args.calls} calls")
+        for name, per_call in results.items():
+            print(f"{name:<26} {per_call * 1000:8.3f} ms/call")
+    finally:
+        dispose_engines()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'fraud_detection'))
+
+import numpy as np  # noqa: E402
+
+from dedup import BloomFilter  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ---------------------------------------------------
+# 🔁 Bloom filter throughput and memory at scale
+# ---------------------------------------------------
+#
+# Keys are generated block by block, so only the filter itself grows with
+# --keys. Membership is then checked for the same number of unseen keys,
+# which also measures the real false-positive rate.
+
+
+def _blocks(n_keys, block, seed):
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_keys, block):
+        size = min(block, n_keys - start)
+        yield rng.integers(0, 2**63, size, dtype=np.int64).view(np.uint64)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dedup filter benchmark")
+    parser.add_argument("--keys", type=int, default=100_000_000)
+    parser.add_argument("--fp-rate", type=float, default=0.01)
+    parser.add_argument("--block", type=int, default=5_000_000)
+    args = parser.parse_args(argv)
+
+    bf = BloomFilter.for_capacity(args.keys, args.fp_rate)
+    print(f"Filter: {bf.n_bits:,} bits, {bf.n_hashes} hashes, "
+          f"{bf.nbytes / 2**20:,.1f} MiB ({bf.nbytes / args.keys:.2f} B/key)")
+
+    start = time.perf_counter()
+    for keys in _blocks(args.keys, args.block, seed=1):
+        bf.add(keys)
+    add_s = time.perf_counter() - start
+
+    hits = 0
+    start = time.perf_counter()
+    for keys in _blocks(args.keys, args.block, seed=2):
+        hits += int(bf.contains(keys).sum())
+    check_s = time.perf_counter() - start
+
+    print(f"add:      {add_s:8.2f}s  {args.keys / add_s:14,.0f} keys/s")
+    print(f"contains: {check_s:8.2f}s  {args.keys / check_s:14,.0f} keys/s")
+    print(f"false-positive rate: {hits / args.keys:.5f} "
+          f"(target {args.fp_rate}, expected {bf.expected_fp_rate:.5f})")
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"peak RSS: {peak / 1024:,.0f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
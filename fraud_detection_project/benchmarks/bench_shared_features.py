@@ -0,0 +1,128 @@
+import os
+import sys
+import pickle
+import time
+import warnings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'fraud_detection'))
+
+import logging  # noqa: E402
+from concurrent.futures import ProcessPoolExecutor  # noqa: E402
+from multiprocessing import get_context, resource_tracker  # noqa: E402
+
+from sklearn.base import clone  # noqa: E402
+
+from fraud_detection import pipeline, prepare_features  # noqa: E402
+from shared_features import SharedMatrix, attach  # noqa: E402
+from synthetic_data import generate_transactions  # noqa: E402
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+# ---------------------------------------------------
+# 🧠 Shared memory vs pickling for process-parallel scoring
+# ---------------------------------------------------
+#
+#   pickle_full   - every task ships the whole feature frame + a row range
+#   pickle_slices - every task ships only its own rows
+#   shared        - the frame is shared once; tasks ship a handle + range
+#
+# Worker memory is the private (unshared) memory of the worker while it
+# holds its data, from /proc/self/smaps_rollup (Linux only).
+
+_model = None
+
+
+def _init(model):
+    global _model
+    _model = model
+
+
+def _private_kib():
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            return sum(int(line.split()[1]) for line in f
+                       if line.startswith(("Private_Clean", "Private_Dirty")))
+    except OSError:
+        return 0
+
+
+def _score_full(args):
+    X, lo, hi = args
+    _model.predict_proba(X.iloc[lo:hi])
+    return _private_kib()
+
+
+def _score_slice(X):
+    _model.predict_proba(X)
+    return _private_kib()
+
+
+def _score_shared(args):
+    handle, lo, hi = args
+    shm, X = attach(handle)
+    try:
+        _model.predict_proba(X.iloc[lo:hi])
+        return _private_kib()
+    finally:
+        del X
+        shm.close()
+
+
+def run_mode(mode, X, model, n_jobs, ctx):
+    block = -(-len(X) // n_jobs)
+    bounds = [(lo, min(lo + block, len(X))) for lo in range(0, len(X), block)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(n_jobs, mp_context=ctx, initializer=_init,
+                             initargs=(model,)) as pool:
+        # Pool start-up is timed separately from the data transfer + scoring
+        list(pool.map(_init, [model] * n_jobs))
+        ready = time.perf_counter()
+        if mode == "shared":
+            with SharedMatrix(X) as shared:
+                tasks = [(shared.handle, lo, hi) for lo, hi in bounds]
+                private = list(pool.map(_score_shared, tasks))
+        else:
+            tasks = [(X, lo, hi) for lo, hi in bounds] \
+                if mode == "pickle_full" else \
+                [X.iloc[lo:hi] for lo, hi in bounds]
+            fn = _score_full if mode == "pickle_full" else _score_slice
+            private = list(pool.map(fn, tasks))
+        end = time.perf_counter()
+    payload = sum(len(pickle.dumps(t)) for t in tasks)
+    return {"startup_s": ready - start, "score_s": end - ready,
+            "payload_bytes": payload, "worker_private_kib": max(private)}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared-memory benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=2)
+    parser.add_argument("--start-method", default=None,
+                        choices=["spawn", "fork", "forkserver"])
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    df = generate_transactions(args.rows)
+    fitted = clone(pipeline).fit(df.drop(columns=['isFraud']), df['isFraud'])
+    X = prepare_features(fitted, df.drop(columns=['isFraud'])).astype(float)
+    ctx = get_context(args.start_method)
+    resource_tracker.ensure_running()
+
+    print(f"{args.rows:,} rows, {args.jobs} workers "
+          f"({ctx.get_start_method()})")
+    print(f"{'mode':<14}{'startup':>9}{'score':>9}{'pickled':>12}"
+          f"{'worker private':>17}")
+    for mode in ("pickle_full", "pickle_slices", "shared"):
+        r = run_mode(mode, X, fitted[-1], args.jobs, ctx)
+        print(f"{mode:<14}{r['startup_s']:>8.2f}s{r['score_s']:>8.2f}s"
+              f"{r['payload_bytes'] / 2**20:>9.1f}MiB"
+              f"{r['worker_private_kib'] / 1024:>14.0f}MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
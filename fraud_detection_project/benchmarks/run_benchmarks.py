@@ -0,0 +1,377 @@
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+import warnings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'fraud_detection'))
+
+import logging  # noqa: E402
+from sklearn.base import clone  # noqa: E402
+
+from fraud_detection import (  # noqa: E402
+    pipeline, mask_account_ids, preprocess_fn, prepare_features,
+    load_data_from_db, write_predictions_to_db
+)
+from async_writer import PredictionWriter  # noqa: E402
+from dedup import BloomFilter, transaction_keys  # noqa: E402
+from drift import DriftMonitor, build_reference  # noqa: E402
+from explain import explainer_for  # noqa: E402
+from safe_logging import EventLogger  # noqa: E402
+from partitioned_store import (  # noqa: E402
+    connect, drop_partitions, write_partitioned
+)
+from shadow_scoring import score_models  # noqa: E402
+from synthetic_data import generate_transactions  # noqa: E402
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# ---------------------------------------------------
+# 🧰 Benchmark registry
+# ---------------------------------------------------
+
+CASES = {}
+
+
+def case(name):
+    """Register ``setup(ctx) -> callable``; only the callable is timed."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class Context:
+    def __init__(self, rows, workdir, seed=42):
+        self.rows = rows
+        self.workdir = workdir
+        self.data = generate_transactions(rows, seed=seed)
+        self._fitted = None
+
+    @property
+    def features(self):
+        return self.data.drop(columns=['isFraud'])
+
+    @property
+    def fitted(self):
+        if self._fitted is None:
+            self._fitted = clone(pipeline).fit(
+                self.features, self.data['isFraud'])
+        return self._fitted
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+
+# ---------------------------------------------------
+# ⏱️ Core pipeline cases
+# ---------------------------------------------------
+
+
+@case("mask_account_ids")
+def bench_mask(ctx):
+    return lambda: mask_account_ids(ctx.data.copy())
+
+
+@case("preprocess_fn")
+def bench_preprocess(ctx):
+    return lambda: preprocess_fn(ctx.data.copy())
+
+
+@case("load_data_from_db")
+def bench_load_db(ctx):
+    db_path = ctx.path("load.db")
+    write_predictions_to_db(ctx.data, db_path, "transactions")
+    return lambda: load_data_from_db(db_path)
+
+
+@case("write_predictions_to_db")
+def bench_write_db(ctx):
+    db_path = ctx.path("write.db")
+    return lambda: write_predictions_to_db(ctx.data, db_path, "predictions")
+
+
+@case("train")
+def bench_train(ctx):
+    X, y = ctx.features, ctx.data['isFraud']
+    return lambda: clone(pipeline).fit(X, y)
+
+
+@case("score")
+def bench_score(ctx):
+    fitted, X = ctx.fitted, ctx.features
+    return lambda: fitted.predict_proba(X)
+
+
+@case("explain_top_reasons")
+def bench_explain(ctx):
+    fitted = ctx.fitted
+    explainer = explainer_for(fitted)
+    X = prepare_features(fitted, ctx.features)
+    return lambda: explainer.explain(X)
+
+
+# ---------------------------------------------------
+# ✍️ Chunked scoring: writes inline vs on the background writer
+# ---------------------------------------------------
+
+WRITE_CHUNKS = 10
+
+
+def _scored_chunks(ctx):
+    fitted, X = ctx.fitted, ctx.features
+    size = -(-ctx.rows // WRITE_CHUNKS)
+    for start in range(0, ctx.rows, size):
+        chunk = X.iloc[start:start + size].copy()
+        chunk['Fraud_Probability'] = fitted.predict_proba(chunk)[:, 1]
+        yield chunk
+
+
+@case("score_write_sync")
+def bench_score_write_sync(ctx):
+    csv_path, db_path = ctx.path("sync.csv"), ctx.path("sync.db")
+
+    def run():
+        conn = sqlite3.connect(db_path)
+        for i, chunk in enumerate(_scored_chunks(ctx)):
+            chunk.to_csv(csv_path, index=False, mode='w' if i == 0 else 'a',
+                         header=i == 0)
+            chunk.to_sql("predictions", con=conn, index=False,
+                         if_exists='replace' if i == 0 else 'append')
+        conn.commit()
+        conn.close()
+    return run
+
+
+@case("score_write_async")
+def bench_score_write_async(ctx):
+    csv_path, db_path = ctx.path("async.csv"), ctx.path("async.db")
+
+    def run():
+        with PredictionWriter(csv_path=csv_path, db_path=db_path,
+                              table_name="predictions") as writer:
+            for chunk in _scored_chunks(ctx):
+                writer.submit(chunk)
+    return run
+
+
+# ---------------------------------------------------
+# 📈 Drift monitoring: sketch update per scored batch (compare with "score")
+# ---------------------------------------------------
+
+
+@case("drift_monitor_update")
+def bench_drift_update(ctx):
+    X = prepare_features(ctx.fitted, ctx.features)
+    reference = build_reference(X)
+    return lambda: DriftMonitor(reference).update(X)
+
+
+# ---------------------------------------------------
+# 🥊 Shadow scoring: one shared pass vs N separate runs
+# ---------------------------------------------------
+
+SHADOW_MODELS = 3
+
+
+def _shadow_pipelines(ctx):
+    X, y = ctx.features, ctx.data['isFraud']
+    return {f"model_{depth}": clone(pipeline).set_params(
+        model__max_depth=depth).fit(X, y)
+        for depth in range(8, 8 + SHADOW_MODELS)}
+
+
+@case("shadow_score_shared_pass")
+def bench_shadow_shared(ctx):
+    pipelines, X = _shadow_pipelines(ctx), ctx.features
+    return lambda: score_models(pipelines, mask_account_ids(X.copy()))
+
+
+@case("shadow_score_separate_runs")
+def bench_shadow_separate(ctx):
+    pipelines, X = _shadow_pipelines(ctx), ctx.features
+    return lambda: [p.predict_proba(mask_account_ids(X.copy()))
+                    for p in pipelines.values()]
+
+
+# ---------------------------------------------------
+# 🗂️ Step-partitioned storage: windowed loads and retention
+# ---------------------------------------------------
+
+PARTITION_SIZE = 24   # one day of hourly steps
+WINDOW_STEPS = 72     # load roughly 10% of a 743-step month
+
+
+def _monolithic_db(ctx, name):
+    db_path = ctx.path(name)
+    write_predictions_to_db(ctx.data, db_path, "transactions")
+    return db_path
+
+
+def _partitioned_db(ctx, name):
+    db_path = ctx.path(name)
+    conn = connect(db_path)
+    write_partitioned(conn, ctx.data, "transactions", PARTITION_SIZE)
+    conn.close()
+    return db_path
+
+
+@case("windowed_load_monolithic")
+def bench_window_monolithic(ctx):
+    db_path = _monolithic_db(ctx, "window_mono.db")
+    return lambda: load_data_from_db(db_path, step_min=301,
+                                     step_max=300 + WINDOW_STEPS)
+
+
+@case("windowed_load_partitioned")
+def bench_window_partitioned(ctx):
+    db_path = _partitioned_db(ctx, "window_part.db")
+    return lambda: load_data_from_db(db_path, step_min=301,
+                                     step_max=300 + WINDOW_STEPS)
+
+
+def _purge_next_day(purge):
+    # Each timed call purges the next day, so repeats never purge nothing
+    cutoff = iter(range(1 + PARTITION_SIZE, 10**6, PARTITION_SIZE))
+    return lambda: purge(next(cutoff))
+
+
+@case("retention_purge_monolithic")
+def bench_purge_monolithic(ctx):
+    conn = connect(_monolithic_db(ctx, "purge_mono.db"))
+
+    def purge(before_step):
+        conn.execute("DELETE FROM transactions WHERE step < ?",
+                     (before_step,))
+        conn.commit()
+    return _purge_next_day(purge)
+
+
+@case("retention_purge_partitioned")
+def bench_purge_partitioned(ctx):
+    conn = connect(_partitioned_db(ctx, "purge_part.db"))
+    return _purge_next_day(
+        lambda before_step: drop_partitions(conn, "transactions", before_step))
+
+
+# ---------------------------------------------------
+# 🔁 Replay protection: key hashing + Bloom filter check
+# ---------------------------------------------------
+
+
+@case("dedup_check")
+def bench_dedup(ctx):
+    # Half the rows were seen in an earlier load
+    seen = BloomFilter.for_capacity(2 * ctx.rows, fp_rate=0.001)
+    seen.add(transaction_keys(ctx.data.iloc[::2]))
+    return lambda: seen.contains(transaction_keys(ctx.data))
+
+
+# ---------------------------------------------------
+# 🎚️ Logging: cost of a sampled-out per-transaction event (rows = calls)
+# ---------------------------------------------------
+
+
+@case("log_event_suppressed")
+def bench_log_event(ctx):
+    events = EventLogger("bench", sample_every=ctx.rows + 1)
+
+    def run():
+        log = events.log
+        for _ in range(ctx.rows):
+            log("Flagged transaction", nameOrig="C1231006815", amount=1.0)
+    return run
+
+
+# ---------------------------------------------------
+# 🏃 Runner and baseline comparison
+# ---------------------------------------------------
+
+
+def run(rows, repeat=3, names=None):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="fraud_bench_")
+    try:
+        ctx = Context(rows, workdir)
+        for name, setup in CASES.items():
+            if names and name not in names:
+                continue
+            fn = setup(ctx)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            results[name] = {"best_s": best, "rows_per_s": rows / best}
+            print(f"{name:<28} {best:>9.4f}s  {rows / best:>14,.0f} rows/s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        allowed = baseline[name]["best_s"] * (1 + tolerance)
+        if result["best_s"] > allowed:
+            regressions.append(
+                f"{name}: {result['best_s']:.4f}s > {allowed:.4f}s "
+                f"(baseline {baseline[name]['best_s']:.4f}s)")
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fraud pipeline benchmarks")
+    parser.add_argument("--rows", type=int, default=100_000,
+                        help="Synthetic rows per case (10K to 10M)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--case", action="append", dest="cases",
+                        choices=sorted(CASES), help="Run only these cases")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store results as the baseline for --rows")
+    parser.add_argument("--compare", action="store_true",
+                        help="Exit non-zero if any case regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    results = run(args.rows, args.repeat, args.cases)
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines.setdefault(str(args.rows), {}).update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {BASELINE_PATH}")
+
+    if args.compare:
+        baseline = baselines.get(str(args.rows))
+        if not baseline:
+            print(f"No baseline stored for {args.rows} rows")
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------
+# 🧪 Deterministic PaySim-style transaction generator
+# ---------------------------------------------------
+
+# Same column order as fraud_detection/unseen_data.csv
+COLUMNS = ['step', 'type', 'amount', 'nameOrig', 'oldbalanceOrg',
+           'newbalanceOrig', 'nameDest', 'oldbalanceDest', 'newbalanceDest',
+           'isFraud', 'isFlaggedFraud']
+
+TYPES = np.array(['CASH_OUT', 'PAYMENT', 'CASH_IN', 'TRANSFER', 'DEBIT'])
+TYPE_WEIGHTS = [0.35, 0.34, 0.22, 0.08, 0.01]
+STEPS = 743  # one month of hourly steps, as in PaySim
+
+
+def generate_transactions(n_rows, seed=42, fraud_rate=0.01, start_step=1,
+                          steps=STEPS):
+    """Return ``n_rows`` synthetic transactions with the PaySim schema.
+
+    The same ``n_rows`` / ``seed`` always produce the same frame. Fraud
+    only occurs on TRANSFER and CASH_OUT rows and empties the origin
+    account, which gives the tree something real to learn.
+    """
+    rng = np.random.default_rng(seed)
+    type_idx = rng.choice(len(TYPES), size=n_rows, p=TYPE_WEIGHTS)
+    tx_type = TYPES[type_idx]
+    outgoing = tx_type != 'CASH_IN'
+    to_merchant = tx_type == 'PAYMENT'
+
+    step = np.sort(rng.integers(start_step, start_step + steps, size=n_rows))
+    amount = np.round(rng.lognormal(mean=10.5, sigma=1.6, size=n_rows), 2)
+    old_org = np.round(rng.lognormal(mean=10.0, sigma=2.5, size=n_rows), 2)
+    old_org[rng.random(n_rows) < 0.3] = 0.0
+    old_dest = np.round(rng.lognormal(mean=12.0, sigma=2.0, size=n_rows), 2)
+    old_dest[to_merchant | (rng.random(n_rows) < 0.35)] = 0.0
+
+    fraud_candidate = (tx_type == 'TRANSFER') | (tx_type == 'CASH_OUT')
+    is_fraud = fraud_candidate & (rng.random(n_rows) < fraud_rate / 0.43)
+    # Fraudsters drain the whole origin balance
+    old_org = np.where(is_fraud, np.maximum(old_org, amount), old_org)
+    amount = np.where(is_fraud, old_org, amount)
+
+    new_org = np.where(outgoing, np.maximum(old_org - amount, 0.0),
+                       old_org + amount)
+    new_dest = np.where(to_merchant, 0.0,
+                        np.where(outgoing, old_dest + amount,
+                                 np.maximum(old_dest - amount, 0.0)))
+    is_flagged = is_fraud & (tx_type == 'TRANSFER') & (amount > 200_000)
+
+    orig_ids = rng.integers(10**8, 10**10, size=n_rows)
+    dest_ids = rng.integers(10**8, 10**10, size=n_rows)
+    name_orig = pd.Series(orig_ids).astype(str)
+    name_dest = pd.Series(dest_ids).astype(str)
+
+    return pd.DataFrame({
+        'step': step,
+        'type': tx_type,
+        'amount': amount,
+        'nameOrig': 'C' + name_orig,
+        'oldbalanceOrg': old_org,
+        'newbalanceOrig': np.round(new_org, 2),
+        'nameDest': np.where(to_merchant, 'M', 'C') + name_dest,
+        'oldbalanceDest': old_dest,
+        'newbalanceDest': np.round(new_dest, 2),
+        'isFraud': is_fraud.astype(int),
+        'isFlaggedFraud': is_flagged.astype(int),
+    }, columns=COLUMNS)
+
+
+def write_transactions_csv(path, n_rows, seed=42, chunk_size=1_000_000,
+                           **kwargs):
+    """Stream a large synthetic file to ``path`` without holding it all."""
+    n_chunks = max(1, -(-n_rows // chunk_size))
+    steps_per_chunk = max(1, STEPS // n_chunks)
+    for i, start in enumerate(range(0, n_rows, chunk_size)):
+        chunk = generate_transactions(
+            min(chunk_size, n_rows - start), seed=seed + i,
+            start_step=1 + i * steps_per_chunk, steps=steps_per_chunk,
+            **kwargs)
+        chunk.to_csv(path, index=False, mode='w' if i == 0 else 'a',
+                     header=i == 0)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic PaySim-style transactions")
+    parser.add_argument("rows", type=int, help="Number of rows (e.g. 10000)")
+    parser.add_argument("output", help="Path of the CSV file to write")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fraud-rate", type=float, default=0.01)
+    parser.add_argument("--unlabeled", action="store_true",
+                        help="Drop isFraud so the file exercises scoring")
+    args = parser.parse_args()
+
+    if args.unlabeled:
+        df = generate_transactions(args.rows, args.seed, args.fraud_rate)
+        df.drop(columns=['isFraud']).to_csv(args.output, index=False)
+    else:
+        write_transactions_csv(args.output, args.rows, seed=args.seed,
+                               fraud_rate=args.fraud_rate)
+    print(f"Wrote {args.rows} synthetic transactions to {args.output}")
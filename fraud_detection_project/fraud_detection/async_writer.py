@@ -0,0 +1,147 @@
+import os
+import queue
+import threading
+
+from db import get_engine
+from partitioned_store import drop_partitions, write_partitioned
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+
+# ---------------------------------------------------
+# ✍️ Background writer for scored prediction chunks
+# ---------------------------------------------------
+
+_DONE = object()
+_ABORT = object()
+
+
+class PredictionWriter:
+    """Write scored chunks to CSV / Parquet / SQLite on a background thread.
+
+    ``submit`` blocks once ``max_pending`` chunks are queued, so a slow
+    disk throttles scoring instead of buffering the whole result set.
+    ``close`` drains the queue, commits the DB writes and re-raises any
+    error hit by the writer thread. If no chunk was submitted the outputs
+    are still replaced, by an empty CSV and no table or Parquet file, so
+    a previous run's predictions never pass for this run's. With
+    ``partition_size`` the SQLite output is split into step-range
+    partitions (see partitioned_store). Used as a context manager, an
+    exception in the block aborts the writer instead: its thread stops, any
+    open DB transaction is rolled back and the connection is released.
+    """
+
+    def __init__(self, csv_path=None, parquet_path=None, db_path=None,
+                 table_name="predictions", max_pending=4,
+                 partition_size=None):
+        if parquet_path and pq is None:
+            raise ImportError("pyarrow is required for Parquet output")
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.db_path = db_path
+        self.table_name = table_name
+        self.partition_size = partition_size
+        self.rows_written = 0
+        self._error = None
+        self._closed = False
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, chunk):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_DONE)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.rows_written
+
+    def abort(self):
+        """Stop the writer thread, rolling back any open DB transaction."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_ABORT)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def _run(self):
+        parquet_writer = None
+        pooled = conn = None
+        first = True
+        done = False
+        try:
+            if self.db_path:
+                # Pooled sqlite3 connection: pandas' native executemany path
+                # is several times faster than going through SQLAlchemy
+                pooled = get_engine(self.db_path).raw_connection()
+                conn = pooled.dbapi_connection
+            while True:
+                chunk = self._queue.get()
+                if chunk is _ABORT:
+                    done = True
+                    if conn is not None:
+                        conn.rollback()
+                    return
+                if chunk is _DONE:
+                    done = True
+                    if first:
+                        self._clear_outputs(conn)
+                    break
+                if self.csv_path:
+                    chunk.to_csv(self.csv_path, index=False,
+                                 mode='w' if first else 'a', header=first)
+                if self.parquet_path:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(
+                            self.parquet_path, table.schema)
+                    parquet_writer.write_table(table)
+                if conn is not None and self.partition_size:
+                    if first:
+                        drop_partitions(conn, self.table_name)
+                    write_partitioned(conn, chunk, self.table_name,
+                                      self.partition_size)
+                elif conn is not None:
+                    chunk.to_sql(self.table_name, con=conn, index=False,
+                                 if_exists='replace' if first else 'append')
+                self.rows_written += len(chunk)
+                first = False
+            if conn is not None:
+                conn.commit()
+        except Exception as e:
+            self._error = e
+            # Drain remaining chunks so producers blocked on put() wake up
+            while not done:
+                done = self._queue.get() in (_DONE, _ABORT)
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+            if pooled is not None:
+                pooled.close()
+
+    def _clear_outputs(self, conn):
+        if self.csv_path:
+            open(self.csv_path, 'w').close()
+        if self.parquet_path and os.path.exists(self.parquet_path):
+            os.remove(self.parquet_path)
+        if conn is not None:
+            if self.partition_size:
+                drop_partitions(conn, self.table_name)
+            conn.execute(f'DROP TABLE IF EXISTS "{self.table_name}"')
@@ -8,6 +8,7 @@ cursor = conn.cursor()
 cursor.execute("""
 CREATE TABLE IF NOT EXISTS transactions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    step INTEGER,
     type TEXT,
     amount REAL,
     nameOrig TEXT,
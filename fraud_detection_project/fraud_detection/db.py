@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+# ---------------------------------------------------
+# 🗄️ Pooled SQLite engines, one per database file
+# ---------------------------------------------------
+#
+# SQLAlchemy 1.4 opens a new connection per checkout for file databases,
+# so each load/write paid for connect + schema parsing. Engines are
+# cached per path with a small QueuePool, and every new connection gets
+# the pragmas below. WAL lets a scorer keep reading while predictions are
+# written, and busy_timeout makes concurrent writers wait instead of
+# failing with "database is locked".
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA busy_timeout=5000",
+)
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def get_engine(db_path):
+    """Cached engine for ``db_path``; safe to share across threads."""
+    key = os.path.abspath(db_path)
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None:
+            # Pooled connections move between threads (e.g. asyncio.to_thread)
+            engine = create_engine(
+                f"sqlite:///{key}", poolclass=QueuePool,
+                pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW,
+                connect_args={"check_same_thread": False})
+            event.listen(engine, "connect", _apply_pragmas)
+            _engines[key] = engine
+    return engine
+
+
+def dispose_engines():
+    """Close every pooled connection (e.g. before deleting database files)."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+@contextmanager
+def connection(db_path):
+    """Pooled ``sqlite3`` connection, returned to the pool on exit.
+
+    A raw DBAPI connection lets pandas use its native sqlite3 path, which
+    is several times faster than going through SQLAlchemy for writes.
+    Uncommitted work is rolled back when the connection is returned.
+    """
+    pooled = get_engine(db_path).raw_connection()
+    try:
+        yield pooled.dbapi_connection
+    finally:
+        pooled.close()
+
+
+def read_query(db_path, query, params=None):
+    with connection(db_path) as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def write_frame(df, db_path, table_name, if_exists='replace'):
+    with connection(db_path) as conn:
+        df.to_sql(table_name, con=conn, if_exists=if_exists, index=False)
+        conn.commit()
+    return len(df)
+
+# ---------------------------------------------------
+# ⚡ Async variants: run on a worker thread, off the event loop
+# ---------------------------------------------------
+
+
+async def read_query_async(db_path, query, params=None):
+    return await asyncio.to_thread(read_query, db_path, query, params)
+
+
+async def write_frame_async(df, db_path, table_name, if_exists='replace'):
+    return await asyncio.to_thread(write_frame, df, db_path, table_name,
+                                   if_exists)
@@ -0,0 +1,126 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------
+# 🔁 Replay protection: transaction keys + persisted Bloom filter
+# ---------------------------------------------------
+#
+# Every transaction is reduced to a 64-bit key, and keys already seen are
+# remembered in a Bloom filter saved next to the data. Memory is fixed by
+# the capacity and false-positive rate chosen when the filter is created
+# (about 1.2 bytes per key at 1%). A false positive makes a *new* row look
+# seen, so it is skipped; a seen row is never let through twice.
+
+KEY_COLUMNS = ['step', 'nameOrig', 'nameDest', 'amount']
+# Keys are hashed from fixed dtypes: pandas infers amount as int64 or
+# float64 depending on the rest of the file, and the two hash differently
+KEY_DTYPES = {'step': 'int64', 'nameOrig': str, 'nameDest': str,
+              'amount': 'float64'}
+DEFAULT_CAPACITY = 10_000_000
+DEFAULT_FP_RATE = 0.001
+BLOCK = 1 << 20  # keys hashed per block, bounds temporary memory
+
+
+def transaction_keys(df, columns=KEY_COLUMNS):
+    """64-bit key per row from whichever key columns are present."""
+    cols = [c for c in columns if c in df.columns]
+    if not cols:
+        raise ValueError(f"None of the key columns {columns} are present")
+    keys = df[cols].astype({c: KEY_DTYPES[c] for c in cols if c in KEY_DTYPES})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(
+        dtype=np.uint64)
+
+
+def _mix(keys):
+    # splitmix64 finaliser: an independent second hash for double hashing
+    z = keys + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over uint64 keys (Kirsch-Mitzenmacher hashing)."""
+
+    def __init__(self, n_bits, n_hashes, capacity=0, count=0, bits=None):
+        self.n_bits = int(n_bits)
+        self.n_hashes = int(n_hashes)
+        self.capacity = int(capacity)
+        self.count = int(count)
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8) \
+            if bits is None else bits
+
+    @classmethod
+    def for_capacity(cls, capacity=DEFAULT_CAPACITY, fp_rate=DEFAULT_FP_RATE):
+        capacity = max(int(capacity), 1)
+        n_bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+        return cls(n_bits, n_hashes, capacity)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    @property
+    def expected_fp_rate(self):
+        return (1 - math.exp(-self.n_hashes * self.count / self.n_bits)) \
+            ** self.n_hashes
+
+    def _positions(self, keys):
+        m = np.uint64(self.n_bits)
+        h1, h2 = keys % m, _mix(keys) % m | np.uint64(1)
+        for i in range(self.n_hashes):
+            yield (h1 + np.uint64(i) * h2) % m
+
+    def contains(self, keys):
+        keys = np.asarray(keys, dtype=np.uint64)
+        found = np.ones(len(keys), dtype=bool)
+        for start in range(0, len(keys), BLOCK):
+            block = found[start:start + BLOCK]
+            for pos in self._positions(keys[start:start + BLOCK]):
+                block &= (self.bits[pos >> np.uint64(3)]
+                          >> (pos & np.uint64(7)).astype(np.uint8)) & 1 == 1
+        return found
+
+    def add(self, keys):
+        keys = np.asarray(keys, dtype=np.uint64)
+        for start in range(0, len(keys), BLOCK):
+            block = keys[start:start + BLOCK]
+            pos = np.concatenate(list(self._positions(block)))
+            # ufunc.at applies repeated byte indices one by one, unlike |=
+            np.bitwise_or.at(self.bits, pos >> np.uint64(3),
+                             np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8))
+        self.count += len(keys)
+        return self
+
+    def add_new(self, keys):
+        """Mask of keys not seen before (first occurrence only); adds them."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        new = ~self.contains(keys) & ~pd.Series(keys).duplicated().to_numpy()
+        self.add(keys[new])
+        return new
+
+    def save(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, bits=self.bits, meta=np.array(
+                [self.n_bits, self.n_hashes, self.capacity, self.count],
+                dtype=np.int64))
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            n_bits, n_hashes, capacity, count = data['meta'].tolist()
+            return cls(n_bits, n_hashes, capacity, count, data['bits'])
+
+
+def open_filter(path, capacity=DEFAULT_CAPACITY, fp_rate=DEFAULT_FP_RATE):
+    """Load the filter at ``path``, or size a new one if it does not exist."""
+    if os.path.exists(path):
+        return BloomFilter.load(path)
+    return BloomFilter.for_capacity(capacity, fp_rate)
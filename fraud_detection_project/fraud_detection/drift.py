@@ -0,0 +1,162 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from db import write_frame
+
+# ---------------------------------------------------
+# 📉 Mergeable per-feature histograms for drift checks
+# ---------------------------------------------------
+
+PSI_EPSILON = 1e-4
+
+
+class FeatureSketch:
+    """Fixed-edge histogram of one feature; ``merge`` is just count addition.
+
+    Bucket ``i`` holds values in ``[edges[i-1], edges[i])``, with open
+    buckets at both ends, so unseen extremes in scoring data are still
+    counted. Missing values are tracked separately.
+    """
+
+    def __init__(self, edges, counts=None, missing=0):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64) \
+            if counts is None else np.asarray(counts, dtype=np.int64)
+        self.missing = int(missing)
+
+    @classmethod
+    def from_values(cls, values, n_bins=10):
+        values = np.asarray(values, dtype=float)
+        present = values[~np.isnan(values)]
+        if len(present):
+            quantiles = np.quantile(present, np.linspace(0, 1, n_bins + 1))
+            edges = np.unique(quantiles[1:-1])
+            # Low-cardinality features (e.g. encoded 'type') get one bucket
+            # per distinct value instead of collapsed quantile edges
+            distinct = np.unique(present)
+            if len(distinct) <= n_bins:
+                edges = distinct[1:]
+        else:
+            edges = np.array([])
+        sketch = cls(edges)
+        sketch.update(values)
+        return sketch
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        nan_mask = np.isnan(values)
+        self.missing += int(nan_mask.sum())
+        buckets = np.searchsorted(self.edges, values[~nan_mask], side='right')
+        self.counts += np.bincount(buckets, minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge sketches with different edges")
+        return FeatureSketch(self.edges, self.counts + other.counts,
+                             self.missing + other.missing)
+
+    def to_dict(self):
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist(),
+                "missing": self.missing}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["edges"], data["counts"], data.get("missing", 0))
+
+
+def psi(expected_counts, actual_counts):
+    expected = np.maximum(expected_counts / max(expected_counts.sum(), 1),
+                          PSI_EPSILON)
+    actual = np.maximum(actual_counts / max(actual_counts.sum(), 1),
+                        PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected_counts, actual_counts):
+    # KS statistic evaluated at the bucket edges (a lower bound on exact KS)
+    expected = np.cumsum(expected_counts) / max(expected_counts.sum(), 1)
+    actual = np.cumsum(actual_counts) / max(actual_counts.sum(), 1)
+    return float(np.max(np.abs(expected - actual)))
+
+# ---------------------------------------------------
+# 🧭 Reference profile (training) and monitor (scoring)
+# ---------------------------------------------------
+
+
+def build_reference(X, n_bins=10):
+    numeric = X.select_dtypes(include=[np.number])
+    return {col: FeatureSketch.from_values(numeric[col].to_numpy(), n_bins)
+            for col in numeric.columns}
+
+
+def save_reference(reference, path):
+    with open(path, "w") as f:
+        json.dump({col: s.to_dict() for col, s in reference.items()}, f)
+    return path
+
+
+def load_reference(path):
+    with open(path) as f:
+        return {col: FeatureSketch.from_dict(d)
+                for col, d in json.load(f).items()}
+
+
+class DriftMonitor:
+    """Accumulate scoring batches into sketches sharing the reference edges.
+
+    Only bucket counts are kept, so memory is independent of the number
+    of rows scored and two monitors can be merged after the fact.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.current = {col: FeatureSketch(s.edges)
+                        for col, s in reference.items()}
+
+    def update(self, X):
+        for col, sketch in self.current.items():
+            if col in X.columns:
+                sketch.update(X[col].to_numpy())
+        return self
+
+    def merge(self, other):
+        merged = DriftMonitor(self.reference)
+        merged.current = {col: s.merge(other.current[col])
+                          for col, s in self.current.items()}
+        return merged
+
+    def scores(self):
+        rows = []
+        for col, ref in self.reference.items():
+            cur = self.current[col]
+            if cur.total == 0:
+                continue
+            rows.append({
+                "feature": col,
+                "psi": psi(ref.counts, cur.counts),
+                "ks": binned_ks(ref.counts, cur.counts),
+                "rows": cur.total,
+                "missing": cur.missing,
+            })
+        return pd.DataFrame(rows, columns=["feature", "psi", "ks", "rows",
+                                           "missing"])
+
+
+def write_drift_report(scores, path):
+    with open(path, "w") as f:
+        json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "features": scores.to_dict(orient="records")}, f, indent=2)
+    return path
+
+
+def write_drift_to_db(scores, db_path, table_name="drift_scores"):
+    scores = scores.assign(scored_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    write_frame(scores, db_path, table_name, if_exists='append')
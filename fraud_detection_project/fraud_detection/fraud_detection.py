@@ -1,11 +1,10 @@
+import asyncio
 import pandas as pd
 import numpy as np
-import logging
 import os
 from hashlib import sha256
 from joblib import dump, load
 import matplotlib.pyplot as plt
-from sqlalchemy import create_engine
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import FunctionTransformer
 from sklearn.model_selection import train_test_split
@@ -14,23 +13,37 @@ from sklearn.metrics import (
     accuracy_score, classification_report,
     confusion_matrix, roc_curve, auc
 )
+from async_writer import PredictionWriter
+from db import connection, write_frame
+from dedup import open_filter, transaction_keys
+from explain import explainer_for
+from evaluation import bootstrap_ci, format_ci_report
+from thresholds import (
+    format_threshold_report, loss_at, optimal_threshold, sweep_thresholds
+)
+from shared_features import SharedScorer
+from partitioned_store import is_partitioned, load_partitions
+from instrumentation import StageMetrics, NULL_METRICS
+from safe_logging import configure_logging, log_safe  # noqa: F401
+from drift import (
+    DriftMonitor, build_reference, save_reference, load_reference,
+    write_drift_report, write_drift_to_db
+)
 
 # 🔧 Configuration
 THRESHOLD = 0.3
 TYPE_MAP = {"CASH_OUT": 1, "PAYMENT": 2,
             "CASH_IN": 3, "TRANSFER": 4, "DEBIT": 5}
 DROP_COLS = ['isFlaggedFraud']
+PSI_ALERT = 0.2
+REVIEW_COST = 10.0  # cost of manually reviewing one flagged transaction
 
 # Output directory setup
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "Outputs")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # 🧪 PII-safe Logging Setup
-logging.basicConfig(level=logging.INFO,
-                    format="%(asctime)s - %(levelname)s - %(message)s")
-
-
-def log_safe(message): logging.info("[SAFE] " + message)
+configure_logging()
 
 # ---------------------------------------------------
 # 🧼 Preprocessing Functions
@@ -46,12 +59,14 @@ def mask_account_ids(df):
 
 
 def preprocess_fn(df):
-    df = mask_account_ids(df)
+    # Account IDs never reach the model, so drop them without hashing first
     df = df.drop(columns=['nameOrig', 'nameDest'], errors='ignore')
     df = df.drop(
         columns=[col for col in DROP_COLS if col in df.columns], errors='ignore')
-    if 'type' in df.columns:
-        df['type'] = df['type'].map(TYPE_MAP).fillna(0).astype(int)
+    # Already-encoded frames (e.g. cached features) pass through unchanged
+    if 'type' in df.columns and not pd.api.types.is_numeric_dtype(df['type']):
+        df['type'] = df['type'].astype(object).map(TYPE_MAP).fillna(0) \
+            .astype(int)
     return df
 
 # ---------------------------------------------------
@@ -89,27 +104,61 @@ pipeline = Pipeline([
     ))
 ])
 
+# ---------------------------------------------------
+# 🎯 Align raw rows with a fitted pipeline's features
+# ---------------------------------------------------
+
+
+def prepare_features(fitted_pipeline, df):
+    X = fitted_pipeline[:-1].transform(df)
+    feature_names = getattr(fitted_pipeline[-1], 'feature_names_in_', None)
+    if feature_names is not None:
+        X = X.reindex(columns=feature_names, fill_value=0)
+    return X
+
 # ---------------------------------------------------
 # 🗃️ Load data from SQLite DB
 # ---------------------------------------------------
 
 
-def load_data_from_db(db_path, table_name="transactions"):
-    engine = create_engine(f"sqlite:///{db_path}")
-    df = pd.read_sql_table(table_name, con=engine)
+def load_data_from_db(db_path, table_name="transactions",
+                      step_min=None, step_max=None):
+    windowed = step_min is not None or step_max is not None
+    with connection(db_path) as conn:
+        if is_partitioned(conn, table_name):
+            # Partition pruning: only tables overlapping the window are read
+            df = load_partitions(conn, table_name, step_min, step_max)
+        elif windowed:
+            lo = step_min if step_min is not None else -2**63
+            hi = step_max if step_max is not None else 2**63 - 1
+            df = pd.read_sql_query(
+                f'SELECT * FROM "{table_name}" WHERE step BETWEEN ? AND ?',
+                conn, params=(lo, hi))
+        else:
+            # A plain query skips read_sql_table's per-call schema reflection
+            df = pd.read_sql_query(f'SELECT * FROM "{table_name}"', conn)
     log_safe(f"Loaded {len(df)} records from {db_path}")
     return df
 
+
+async def load_data_from_db_async(db_path, table_name="transactions",
+                                  step_min=None, step_max=None):
+    return await asyncio.to_thread(load_data_from_db, db_path, table_name,
+                                   step_min, step_max)
+
 # ---------------------------------------------------
 # 💾 Save predictions to DB
 # ---------------------------------------------------
 
 
 def write_predictions_to_db(df, db_path, table_name="predictions"):
-    engine = create_engine(f"sqlite:///{db_path}")
-    df.to_sql(table_name, con=engine, if_exists='replace', index=False)
+    write_frame(df, db_path, table_name, if_exists='replace')
     log_safe(f"Predictions written to {db_path} → {table_name}")
 
+
+async def write_predictions_to_db_async(df, db_path, table_name="predictions"):
+    await asyncio.to_thread(write_predictions_to_db, df, db_path, table_name)
+
 # ---------------------------------------------------
 # 📈 Plot ROC curve
 # ---------------------------------------------------
@@ -132,77 +181,209 @@ def plot_roc(y_train, train_prob, y_test, test_prob):
     plt.close()
     log_safe(f"ROC curve saved as {roc_path}")
 
+# ---------------------------------------------------
+# 📉 Drift report for scored data
+# ---------------------------------------------------
+
+
+def report_drift(monitor, db_path=None):
+    scores = monitor.scores()
+    report_path = write_drift_report(
+        scores, os.path.join(OUTPUT_DIR, "drift_report.json"))
+    if db_path:
+        write_drift_to_db(scores, db_path)
+    drifted = scores.loc[scores['psi'] >= PSI_ALERT, 'feature'].tolist()
+    if drifted:
+        log_safe(f"Drift detected (PSI >= {PSI_ALERT}): {', '.join(drifted)}")
+    log_safe(f"Drift report saved as {report_path}")
+    return scores
+
 # ---------------------------------------------------
 # 🚀 Main pipeline logic
 # ---------------------------------------------------
 
 
-def run_pipeline(input_path, is_db=False, save_to_db=False, output_db_path=None):
-    df = load_data_from_db(input_path) if is_db else pd.read_csv(input_path)
-    df = mask_account_ids(df)
+def run_pipeline(input_path, is_db=False, save_to_db=False, output_db_path=None,
+                 chunk_size=100_000, metrics=False, step_min=None, step_max=None,
+                 partition_size=None, bootstrap=0, n_jobs=1,
+                 optimize_threshold=False, review_cost=REVIEW_COST,
+                 dedup_path=None, explain=False, trace_memory=False):
+    # Memory tracing implies metrics; it inflates the stage times it reports
+    m = StageMetrics(log=log_safe, trace_memory=trace_memory) \
+        if metrics or trace_memory else NULL_METRICS
+
+    with m.stage("load") as st:
+        df = load_data_from_db(input_path, step_min=step_min,
+                               step_max=step_max) \
+            if is_db else pd.read_csv(input_path)
+        st.rows = len(df)
+    with m.stage("mask", rows=len(df)):
+        df = mask_account_ids(df)
     labeled = 'isFraud' in df.columns
+    db_path = output_db_path if save_to_db and output_db_path else None
 
     if labeled:
-        X = df.drop(columns=['isFraud'])
-        y = df['isFraud']
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42)
-
-        pipeline.fit(X_train, y_train)
-
-        y_train_prob = pipeline.predict_proba(X_train)[:, 1]
-        y_test_prob = pipeline.predict_proba(X_test)[:, 1]
-        y_train_pred = (y_train_prob >= THRESHOLD).astype(int)
-        y_test_pred = (y_test_prob >= THRESHOLD).astype(int)
-
-        train_acc = accuracy_score(y_train, y_train_pred)
-        test_acc = accuracy_score(y_test, y_test_pred)
-        roc_auc = auc(*roc_curve(y_test, y_test_prob)[:2])
-
-        log_safe(f"Training Accuracy: {train_acc:.4f}")
-        log_safe(f"Testing Accuracy: {test_acc:.4f}")
-        log_safe(f"ROC AUC: {roc_auc:.4f}")
-
-        report_path = os.path.join(OUTPUT_DIR, "model_report.txt")
-        with open(report_path, "w") as f:
-            f.write("Classification Report:\n")
-            f.write(classification_report(y_test, y_test_pred))
-            f.write("\nConfusion Matrix:\n")
-            f.write(str(confusion_matrix(y_test, y_test_pred)))
-            f.write(f"\nROC AUC: {roc_auc:.4f}\n")
-
-        plot_roc(y_train, y_train_prob, y_test, y_test_prob)
-
-        X_test['Actual_isFraud'] = y_test
-        X_test['Predicted_isFraud'] = y_test_pred
-        X_test['Fraud_Probability'] = y_test_prob
+        with m.stage("split", rows=len(df)):
+            X = df.drop(columns=['isFraud'])
+            y = df['isFraud']
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42)
+
+        with m.stage("fit", rows=len(X_train)):
+            pipeline.fit(X_train, y_train)
+            # Leaf explanations are saved with the model for scoring runs
+            explainer = explainer_for(pipeline)
+
+        with m.stage("predict", rows=len(X_train) + len(X_test)):
+            y_train_prob = pipeline.predict_proba(X_train)[:, 1]
+            y_test_prob = pipeline.predict_proba(X_test)[:, 1]
+
+        # The chosen threshold is stored on the pipeline, so scoring runs
+        # that load the saved model make the same decisions
+        threshold, threshold_report = THRESHOLD, None
+        if optimize_threshold:
+            with m.stage("threshold", rows=len(X_test)):
+                sweep = sweep_thresholds(y_test, y_test_prob,
+                                         X_test['amount'], review_cost)
+                best = optimal_threshold(sweep)
+                threshold = float(best['threshold'])
+                threshold_report = format_threshold_report(
+                    best, loss_at(sweep, THRESHOLD), THRESHOLD, review_cost)
+                log_safe(f"Cost-optimal threshold: {threshold:.4f} "
+                         f"(expected loss {best['expected_loss']:,.2f})")
+        pipeline.decision_threshold_ = threshold
+        y_train_pred = (y_train_prob >= threshold).astype(int)
+        y_test_pred = (y_test_prob >= threshold).astype(int)
+
+        # Predictions are written in the background while we report and plot;
+        # if anything below fails the writer is aborted, not left running
         pred_path = os.path.join(OUTPUT_DIR, "fraud_predictions.csv")
-        X_test.to_csv(pred_path, index=False)
-
-        if save_to_db and output_db_path:
-            write_predictions_to_db(
-                X_test, output_db_path, "predicted_results")
-
-        model_path = os.path.join(OUTPUT_DIR, "decision_tree_pipeline.joblib")
-        dump(pipeline, model_path)
+        with PredictionWriter(csv_path=pred_path, db_path=db_path,
+                              table_name="predicted_results",
+                              partition_size=partition_size) as writer:
+            with m.stage("write", rows=len(X_test)):
+                reasons = explainer.explain(
+                    prepare_features(pipeline, X_test)) if explain else None
+                X_test['Actual_isFraud'] = y_test
+                X_test['Predicted_isFraud'] = y_test_pred
+                X_test['Fraud_Probability'] = y_test_prob
+                if reasons is not None:
+                    X_test['Top_Reasons'] = reasons
+                writer.submit(X_test)
+
+            with m.stage("report", rows=len(X_test)):
+                train_acc = accuracy_score(y_train, y_train_pred)
+                test_acc = accuracy_score(y_test, y_test_pred)
+                roc_auc = auc(*roc_curve(y_test, y_test_prob)[:2])
+
+                log_safe(f"Training Accuracy: {train_acc:.4f}")
+                log_safe(f"Testing Accuracy: {test_acc:.4f}")
+                log_safe(f"ROC AUC: {roc_auc:.4f}")
+
+                report_path = os.path.join(OUTPUT_DIR, "model_report.txt")
+                with open(report_path, "w") as f:
+                    f.write("Classification Report:\n")
+                    f.write(classification_report(y_test, y_test_pred))
+                    f.write("\nConfusion Matrix:\n")
+                    f.write(str(confusion_matrix(y_test, y_test_pred)))
+                    f.write(f"\nROC AUC: {roc_auc:.4f}\n")
+                    if threshold_report:
+                        f.write("\n" + threshold_report)
+                    if bootstrap:
+                        ci = bootstrap_ci(y_test, y_test_prob, threshold,
+                                          n_resamples=bootstrap, n_jobs=n_jobs)
+                        f.write("\n" + format_ci_report(ci, bootstrap,
+                                                        threshold=threshold))
+                        log_safe(f"ROC AUC 95% CI: "
+                                 f"[{ci['roc_auc']['ci_low']:.4f}, "
+                                 f"{ci['roc_auc']['ci_high']:.4f}]")
+
+            with m.stage("plot", rows=len(X_train) + len(X_test)):
+                plot_roc(y_train, y_train_prob, y_test, y_test_prob)
+
+            # Compact training profile used by the scoring path's drift monitor
+            with m.stage("drift", rows=len(X_train)):
+                save_reference(
+                    build_reference(prepare_features(pipeline, X_train)),
+                    os.path.join(OUTPUT_DIR, "drift_reference.json"))
+
+            with m.stage("write"):
+                model_path = os.path.join(
+                    OUTPUT_DIR, "decision_tree_pipeline.joblib")
+                dump(pipeline, model_path)
+                writer.close()
+        if db_path:
+            log_safe(f"Predictions written to {db_path} → predicted_results")
         log_safe(f"Model and predictions saved to {OUTPUT_DIR}.")
 
     else:
         loaded_pipeline = load(os.path.join(
             OUTPUT_DIR, "decision_tree_pipeline.joblib"))
-        X = preprocess_fn(df.copy())
-        preds = loaded_pipeline.predict(X)
-        probs = loaded_pipeline.predict_proba(X)[:, 1]
-        X['Predicted_isFraud'] = preds
-        X['Fraud_Probability'] = probs
+        threshold = getattr(loaded_pipeline, 'decision_threshold_', THRESHOLD)
+        explainer = explainer_for(loaded_pipeline) if explain else None
+        # Worker processes read each chunk's features from shared memory
+        scorer = SharedScorer(loaded_pipeline[-1], n_jobs) \
+            if n_jobs > 1 else None
         pred_path = os.path.join(OUTPUT_DIR, "fraud_predictions_unlabeled.csv")
-        X.to_csv(pred_path, index=False)
+        table_name = "predicted_results_unlabeled"
+        reference_path = os.path.join(OUTPUT_DIR, "drift_reference.json")
+        monitor = DriftMonitor(load_reference(reference_path)) \
+            if os.path.exists(reference_path) else None
+        # Replay protection: rows scored by an earlier run are skipped
+        seen = open_filter(dedup_path) if dedup_path else None
+        skipped = 0
+
+        # Score chunk by chunk; each scored chunk is written while the
+        # next one is being scored
+        with PredictionWriter(csv_path=pred_path, db_path=db_path,
+                              table_name=table_name,
+                              partition_size=partition_size) as writer:
+            for start in range(0, len(df), chunk_size):
+                chunk = df.iloc[start:start + chunk_size]
+                if seen is not None:
+                    with m.stage("dedup", rows=len(chunk)):
+                        new = seen.add_new(transaction_keys(chunk))
+                        skipped += len(chunk) - int(new.sum())
+                        chunk = chunk[new]
+                    if chunk.empty:
+                        continue
+                with m.stage("preprocess", rows=len(chunk)):
+                    X = preprocess_fn(chunk.copy())
+                if monitor is not None:
+                    with m.stage("drift", rows=len(X)):
+                        monitor.update(X)
+                with m.stage("predict", rows=len(X)):
+                    if scorer is not None:
+                        probs = scorer.predict_proba(
+                            prepare_features(loaded_pipeline, X))
+                    else:
+                        probs = loaded_pipeline.predict_proba(X)[:, 1]
+                    reasons = explainer.explain(X) if explainer else None
+                    X['Predicted_isFraud'] = (probs >= threshold).astype(int)
+                    X['Fraud_Probability'] = probs
+                    if reasons is not None:
+                        X['Top_Reasons'] = reasons
+                with m.stage("write", rows=len(X)):
+                    writer.submit(X)
+            with m.stage("write"):
+                writer.close()
+        if scorer is not None:
+            scorer.close()
+        # Only remember rows once their predictions are safely written
+        if seen is not None:
+            seen.save(dedup_path)
+            log_safe(f"Skipped {skipped} previously scored rows")
+
+        if db_path:
+            log_safe(f"Predictions written to {db_path} → {table_name}")
+        log_safe("Unlabeled predictions saved.")
 
-        if save_to_db and output_db_path:
-            write_predictions_to_db(
-                X, output_db_path, "predicted_results_unlabeled")
+        if monitor is not None:
+            report_drift(monitor, db_path)
 
-        log_safe("Unlabeled predictions saved.")
+    if m.enabled:
+        metrics_path = m.write(os.path.join(OUTPUT_DIR, "pipeline_metrics.json"))
+        log_safe(f"Stage metrics saved as {metrics_path}")
 
 
 # ---------------------------------------------------
@@ -218,14 +399,105 @@ if __name__ == "__main__":
     parser.add_argument("--save-db", action="store_true",
                         help="Flag: write results to DB")
     parser.add_argument("--output-db", help="Path to output SQLite DB")
+    parser.add_argument("--chunk-size", type=int, default=100_000,
+                        help="Rows scored per chunk for unlabeled input")
+    parser.add_argument("--step-min", type=int,
+                        help="With --db: only load rows with step >= this")
+    parser.add_argument("--step-max", type=int,
+                        help="With --db: only load rows with step <= this")
+    parser.add_argument("--partition-size", type=int,
+                        help="With --save-db: store predictions in tables "
+                             "of this many steps each")
+    parser.add_argument("--bootstrap", type=int, default=0, metavar="N",
+                        help="Add bootstrap CIs from N resamples to the report")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for --bootstrap and for "
+                             "scoring unlabeled input")
+    parser.add_argument("--optimize-threshold", action="store_true",
+                        help="Flag: pick the threshold minimising expected "
+                             "loss and save it with the model")
+    parser.add_argument("--review-cost", type=float, default=REVIEW_COST,
+                        help="Cost of reviewing one flagged transaction")
+    parser.add_argument("--dedup", metavar="PATH",
+                        help="Bloom filter file of scored rows; unlabeled "
+                             "runs skip rows already scored")
+    parser.add_argument("--explain", action="store_true",
+                        help="Flag: add a Top_Reasons column to predictions")
+    parser.add_argument("--retrain", action="store_true",
+                        help="Flag: retrain on the latest window of labeled "
+                             "rows in the DB if enough is new or drifted")
+    parser.add_argument("--window-steps", type=int, default=168,
+                        help="With --retrain: steps of history to train on")
+    parser.add_argument("--min-new-rows", type=int, default=10_000,
+                        help="With --retrain: new labeled rows needed to "
+                             "retrain without drift")
+    parser.add_argument("--force", action="store_true",
+                        help="With --retrain: retrain even if nothing changed")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Flag: record per-stage time metrics")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Flag: also record per-stage peak memory with "
+                             "tracemalloc (slows the stages it measures)")
+    parser.add_argument("--models", nargs="+", metavar="MODEL",
+                        help="Shadow mode: score with several .joblib "
+                             "pipelines in one pass (first is champion)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="Threads used to score models in --models mode")
+    parser.add_argument("--stream", action="store_true",
+                        help="Flag: score JSON lines from stdin ('-'), a "
+                             "file/named pipe or tcp://host:port")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Max events per micro-batch in --stream mode")
+    parser.add_argument("--max-latency-ms", type=float, default=50.0,
+                        help="Max wait before flushing a partial micro-batch")
 
     args = parser.parse_args()
 
-    run_pipeline(
-        input_path=args.input,
-        is_db=args.db,
-        save_to_db=args.save_db,
-        output_db_path=args.output_db
-    )
-
-    test_preprocess()
+    if args.models:
+        from shadow_scoring import run_shadow
+        run_shadow(
+            args.input,
+            args.models,
+            is_db=args.db,
+            save_to_db=args.save_db,
+            output_db_path=args.output_db,
+            chunk_size=args.chunk_size,
+            n_threads=args.threads
+        )
+    elif args.retrain:
+        from retrain import retrain
+        retrain(
+            args.input,
+            window_steps=args.window_steps,
+            min_new_rows=args.min_new_rows,
+            force=args.force
+        )
+    elif args.stream:
+        from stream_scoring import score_stream
+        score_stream(
+            args.input,
+            batch_size=args.batch_size,
+            max_latency_ms=args.max_latency_ms,
+            explain=args.explain
+        )
+    else:
+        run_pipeline(
+            input_path=args.input,
+            is_db=args.db,
+            save_to_db=args.save_db,
+            output_db_path=args.output_db,
+            chunk_size=args.chunk_size,
+            metrics=args.metrics,
+            trace_memory=args.trace_memory,
+            step_min=args.step_min,
+            step_max=args.step_max,
+            partition_size=args.partition_size,
+            bootstrap=args.bootstrap,
+            n_jobs=args.jobs,
+            optimize_threshold=args.optimize_threshold,
+            review_cost=args.review_cost,
+            dedup_path=args.dedup,
+            explain=args.explain
+        )
+
+        test_preprocess()
@@ -0,0 +1,121 @@
+import json
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# ---------------------------------------------------
+# ⏱️ Stage-level timing and memory metrics
+# ---------------------------------------------------
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "rows", "_wall", "_cpu")
+
+    def __init__(self, metrics, name, rows):
+        self.metrics = metrics
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        if self.metrics.trace_memory:
+            tracemalloc.reset_peak()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        peak = tracemalloc.get_traced_memory()[1] \
+            if self.metrics.trace_memory else None
+        self.metrics._record(self.name, wall, cpu, self.rows, peak)
+
+
+class _NullStage:
+    __slots__ = ("rows",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+class StageMetrics:
+    """Collect wall time, CPU time, rows and peak memory per named stage.
+
+    Stages entered more than once (e.g. per scoring chunk) are aggregated.
+    Peak memory comes from ``tracemalloc`` and is opt-in (``trace_memory``):
+    tracing slows every allocation, so with it on the stage times run high.
+    Without it ``peak_mem_bytes`` is None and only ``max_rss_bytes`` is set.
+    """
+
+    enabled = True
+
+    def __init__(self, log=None, trace_memory=False):
+        self.log = log
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self._started_tracemalloc = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stage(self, name, rows=None):
+        return _Stage(self, name, rows)
+
+    def _record(self, name, wall, cpu, rows, peak):
+        entry = self.stages.setdefault(name, {
+            "stage": name, "calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+            "rows": 0, "peak_mem_bytes": 0 if self.trace_memory else None})
+        entry["calls"] += 1
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        entry["rows"] += rows or 0
+        if peak is not None:
+            entry["peak_mem_bytes"] = max(entry["peak_mem_bytes"], peak)
+        if self.log is not None:
+            self.log("metrics " + json.dumps({
+                "stage": name, "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6), "rows": rows,
+                "peak_mem_bytes": peak}))
+
+    def summary(self):
+        stages = list(self.stages.values())
+        return {
+            "stages": stages,
+            "total_wall_s": sum(s["wall_s"] for s in stages),
+            "total_cpu_s": sum(s["cpu_s"] for s in stages),
+            # ru_maxrss is reported in kilobytes on Linux
+            "max_rss_bytes": resource.getrusage(
+                resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else None,
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+            self.trace_memory = False
+        return path
+
+
+class NullMetrics:
+    """Drop-in for StageMetrics when instrumentation is off."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name, rows=None):
+        return self._stage
+
+    def write(self, path):
+        return None
+
+
+NULL_METRICS = NullMetrics()
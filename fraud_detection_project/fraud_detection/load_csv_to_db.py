@@ -1,16 +1,62 @@
 import pandas as pd
-from sqlalchemy import create_engine
 
+from db import write_frame
+from dedup import (
+    DEFAULT_CAPACITY, DEFAULT_FP_RATE, open_filter, transaction_keys
+)
+from partitioned_store import connect, drop_partitions, write_partitioned
 
-def csv_to_sqlite(csv_path, db_path="transactions.db", table_name="transactions"):
+
+def csv_to_sqlite(csv_path, db_path="transactions.db", table_name="transactions",
+                  partition_size=None, dedup_path=None,
+                  dedup_capacity=DEFAULT_CAPACITY, dedup_fp_rate=DEFAULT_FP_RATE):
     df = pd.read_csv(csv_path)
+    total = len(df)
+
+    # With a dedup filter, loads append and skip rows ingested before, so
+    # re-running on overlapping files is idempotent
+    seen = None
+    if dedup_path:
+        seen = open_filter(dedup_path, dedup_capacity, dedup_fp_rate)
+        df = df[seen.add_new(transaction_keys(df))]
 
-    engine = create_engine(f"sqlite:///{db_path}")
-    df.to_sql(table_name, con=engine, if_exists="replace", index=False)
+    if partition_size:
+        # One table per `partition_size` steps, tracked in partition_catalog
+        conn = connect(db_path)
+        try:
+            if seen is None:
+                drop_partitions(conn, table_name)
+            write_partitioned(conn, df, table_name, partition_size)
+        finally:
+            conn.close()
+    else:
+        write_frame(df, db_path, table_name,
+                    if_exists="append" if seen is not None else "replace")
 
+    if seen is not None:
+        seen.save(dedup_path)
+        print(f"Skipped {total - len(df)} already loaded rows")
     print(
         f"Loaded {len(df)} rows from {csv_path} into {db_path} -> table `{table_name}`")
 
 
 # usage
-csv_to_sqlite("sample_data.csv")
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load a CSV into SQLite")
+    parser.add_argument("csv", nargs="?", default="sample_data.csv")
+    parser.add_argument("--db", default="transactions.db")
+    parser.add_argument("--table", default="transactions")
+    parser.add_argument("--partition-size", type=int,
+                        help="Store rows in tables of this many steps each")
+    parser.add_argument("--dedup", metavar="PATH",
+                        help="Bloom filter file of loaded rows; skip repeats")
+    parser.add_argument("--dedup-capacity", type=int, default=DEFAULT_CAPACITY,
+                        help="Rows a new --dedup filter is sized for")
+    parser.add_argument("--dedup-fp-rate", type=float, default=DEFAULT_FP_RATE,
+                        help="False-positive rate of a new --dedup filter")
+    args = parser.parse_args()
+
+    csv_to_sqlite(args.csv, args.db, args.table, args.partition_size,
+                  args.dedup, args.dedup_capacity, args.dedup_fp_rate)
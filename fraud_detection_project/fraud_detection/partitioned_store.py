@@ -0,0 +1,145 @@
+import sqlite3
+
+import pandas as pd
+
+# ---------------------------------------------------
+# 🗂️ Step-partitioned SQLite tables with a catalog
+# ---------------------------------------------------
+#
+# Rows of a logical table (e.g. ``transactions``) live in physical tables
+# named ``<base>__p<first step>``, each covering ``partition_size`` steps.
+# ``partition_catalog`` records every partition's step range and row
+# count, so windowed loads only touch overlapping partitions and
+# retention is a DROP TABLE instead of a large DELETE. ``partition_sizes``
+# pins each logical table to one partition size, since the catalog's step
+# ranges (and so pruning) assume every write used the same one.
+
+CATALOG_TABLE = "partition_catalog"
+SIZES_TABLE = "partition_sizes"
+
+
+def connect(db_path):
+    return sqlite3.connect(db_path)
+
+
+def _ensure_catalog(conn):
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+        partition_table TEXT PRIMARY KEY,
+        base_table TEXT NOT NULL,
+        step_lo INTEGER NOT NULL,
+        step_hi INTEGER NOT NULL,
+        row_count INTEGER NOT NULL DEFAULT 0
+    )""")
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS {SIZES_TABLE} (
+        base_table TEXT PRIMARY KEY,
+        partition_size INTEGER NOT NULL
+    )""")
+
+
+def _check_partition_size(conn, base_table, partition_size):
+    row = conn.execute(
+        f"SELECT partition_size FROM {SIZES_TABLE} WHERE base_table=?",
+        (base_table,)).fetchone()
+    if row is None:
+        # Catalogs written before sizes were recorded: infer from a partition
+        row = conn.execute(
+            f"SELECT step_hi - step_lo + 1 FROM {CATALOG_TABLE} "
+            f"WHERE base_table=? LIMIT 1", (base_table,)).fetchone()
+        conn.execute(f"INSERT INTO {SIZES_TABLE} VALUES (?, ?)",
+                     (base_table, row[0] if row else partition_size))
+    if row is not None and row[0] != partition_size:
+        raise ValueError(
+            f"{base_table} is partitioned by {row[0]} steps, "
+            f"not {partition_size}; drop its partitions to change the size")
+
+
+def is_partitioned(conn, base_table):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        (CATALOG_TABLE,)).fetchone()
+    if not exists:
+        return False
+    return conn.execute(
+        f"SELECT 1 FROM {CATALOG_TABLE} WHERE base_table=? LIMIT 1",
+        (base_table,)).fetchone() is not None
+
+
+def list_partitions(conn, base_table, step_min=None, step_max=None):
+    """Catalog rows for ``base_table`` overlapping [step_min, step_max]."""
+    _ensure_catalog(conn)
+    query = (f"SELECT partition_table, step_lo, step_hi, row_count "
+             f"FROM {CATALOG_TABLE} WHERE base_table=?")
+    params = [base_table]
+    if step_min is not None:
+        query += " AND step_hi >= ?"
+        params.append(int(step_min))
+    if step_max is not None:
+        query += " AND step_lo <= ?"
+        params.append(int(step_max))
+    return pd.read_sql_query(query + " ORDER BY step_lo", conn, params=params)
+
+
+def write_partitioned(conn, df, base_table, partition_size=24):
+    """Append ``df`` to step partitions of ``base_table``; returns rows."""
+    if 'step' not in df.columns:
+        raise ValueError("Partitioned storage requires a 'step' column")
+    if df['step'].isna().any():
+        # groupby would silently drop these rows from every partition
+        raise ValueError(f"{int(df['step'].isna().sum())} row(s) have no "
+                         f"'step'; cannot assign them to a partition")
+    _ensure_catalog(conn)
+    _check_partition_size(conn, base_table, partition_size)
+    part_lo = (df['step'] - 1) // partition_size * partition_size + 1
+    for lo, part in df.groupby(part_lo):
+        lo = int(lo)
+        name = f"{base_table}__p{lo:06d}"
+        part.to_sql(name, con=conn, if_exists='append', index=False)
+        conn.execute(f"""
+        INSERT INTO {CATALOG_TABLE}
+            (partition_table, base_table, step_lo, step_hi, row_count)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(partition_table) DO UPDATE
+            SET row_count = row_count + excluded.row_count""",
+                     (name, base_table, lo, lo + partition_size - 1,
+                      len(part)))
+    conn.commit()
+    return len(df)
+
+
+def load_partitions(conn, base_table, step_min=None, step_max=None):
+    """Read only the partitions that overlap the requested step window."""
+    frames = []
+    parts = list_partitions(conn, base_table, step_min, step_max)
+    for row in parts.itertuples():
+        query = f'SELECT * FROM "{row.partition_table}"'
+        params = []
+        # Only partitions cut by the window need a row filter
+        if step_min is not None and row.step_lo < step_min:
+            query += " WHERE step >= ?"
+            params.append(int(step_min))
+        if step_max is not None and row.step_hi > step_max:
+            query += (" AND" if params else " WHERE") + " step <= ?"
+            params.append(int(step_max))
+        frames.append(pd.read_sql_query(query, conn, params=params))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def drop_partitions(conn, base_table, before_step=None):
+    """Drop whole partitions ending before ``before_step`` (all if None)."""
+    parts = list_partitions(conn, base_table)
+    if before_step is not None:
+        parts = parts[parts['step_hi'] < before_step]
+    for name in parts['partition_table']:
+        conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+        conn.execute(f"DELETE FROM {CATALOG_TABLE} WHERE partition_table=?",
+                     (name,))
+    if not is_partitioned(conn, base_table):
+        # Nothing left to be consistent with; the next write picks the size
+        conn.execute(f"DELETE FROM {SIZES_TABLE} WHERE base_table=?",
+                     (base_table,))
+    conn.commit()
+    return len(parts)
@@ -0,0 +1,209 @@
+import json
+import os
+import time
+
+import pandas as pd
+from joblib import dump
+from sklearn.base import clone
+
+from db import connection
+from drift import DriftMonitor, build_reference, load_reference, save_reference
+from explain import explainer_for
+from fraud_detection import (
+    OUTPUT_DIR, PSI_ALERT, load_data_from_db, log_safe, pipeline,
+    prepare_features, preprocess_fn
+)
+from partitioned_store import is_partitioned, list_partitions
+
+# ---------------------------------------------------
+# 🔄 Incremental retraining over a sliding window of steps
+# ---------------------------------------------------
+#
+# Labeled rows are grouped into blocks of ``block_steps`` steps. Each
+# block's preprocessed features are cached on disk together with a
+# signature of the rows they were built from (count, fraud labels, amount
+# total and newest rowid), so a retrain only reloads blocks that were
+# appended to or corrected (usually just the newest one). A retrain
+# happens only when enough new labeled rows arrived or the new rows
+# drifted; the new artifact replaces the old one with os.replace, so
+# scorers never see a half-written file.
+
+WINDOW_STEPS = 168   # one week of hourly steps
+BLOCK_STEPS = 24
+MIN_NEW_ROWS = 10_000
+MODEL_FILE = "decision_tree_pipeline.joblib"
+STATE_FILE = "retrain_state.json"
+
+
+def labeled_block_signatures(db_path, table_name="transactions",
+                             block_steps=BLOCK_STEPS):
+    """{first step of block: (labeled rows, frauds, amount total, max rowid)}.
+
+    One pass per table; the signature changes when a block's labeled rows
+    are appended to, relabeled or have their amounts corrected.
+    """
+    query = ('SELECT (step - 1) / {b} * {b} + 1 AS block, COUNT(isFraud), '
+             'TOTAL(isFraud), TOTAL(CASE WHEN isFraud IS NOT NULL '
+             'THEN amount END), MAX(CASE WHEN isFraud IS NOT NULL '
+             'THEN rowid END) FROM "{t}" GROUP BY block'
+             ).format(b=int(block_steps), t="{t}")
+    with connection(db_path) as conn:
+        tables = list_partitions(conn, table_name)['partition_table'] \
+            if is_partitioned(conn, table_name) else [table_name]
+        signatures = {}
+        for table in tables:
+            for block, n, frauds, amount, rowid in conn.execute(
+                    query.format(t=table)):
+                prev = signatures.get(int(block), (0, 0.0, 0.0, 0))
+                signatures[int(block)] = (
+                    prev[0] + int(n), prev[1] + frauds,
+                    round(prev[2] + amount, 6), max(prev[3], rowid or 0))
+    return {b: sig for b, sig in sorted(signatures.items()) if sig[0]}
+
+
+def labeled_block_counts(db_path, table_name="transactions",
+                         block_steps=BLOCK_STEPS):
+    """{first step of block: labeled row count} in one pass per table."""
+    return {b: sig[0] for b, sig in labeled_block_signatures(
+        db_path, table_name, block_steps).items()}
+
+
+class FeatureCache:
+    """Preprocessed (X, y) per step block, valid while its signature holds."""
+
+    def __init__(self, cache_dir, db_path, table_name, block_steps):
+        self.cache_dir = cache_dir
+        self.db_path = db_path
+        self.table_name = table_name
+        self.block_steps = block_steps
+        self.hits = self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, block):
+        return os.path.join(self.cache_dir,
+                            f"{self.table_name}_b{block:06d}.pkl")
+
+    def get(self, block, signature):
+        path = self._path(block)
+        signature = list(signature)
+        if os.path.exists(path):
+            cached = pd.read_pickle(path)
+            if cached.get("signature") == signature:
+                self.hits += 1
+                return cached["X"], cached["y"]
+        self.misses += 1
+        df = load_data_from_db(self.db_path, self.table_name, step_min=block,
+                               step_max=block + self.block_steps - 1)
+        df = df[df['isFraud'].notna()]
+        y = df.pop('isFraud').astype(int)
+        X = preprocess_fn(df)
+        pd.to_pickle({"signature": signature, "X": X, "y": y}, path)
+        return X, y
+
+    def prune(self, keep):
+        keep = {os.path.basename(self._path(b)) for b in keep}
+        prefix = f"{self.table_name}_b"
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix) and name not in keep:
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+def _atomic_dump(obj, path):
+    tmp = f"{path}.tmp"
+    dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def _load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def retrain(db_path, table_name="transactions", window_steps=WINDOW_STEPS,
+            min_new_rows=MIN_NEW_ROWS, psi_threshold=PSI_ALERT,
+            block_steps=BLOCK_STEPS, force=False, output_dir=OUTPUT_DIR):
+    """Retrain on the latest window if the data warrants it; returns a summary."""
+    start = time.perf_counter()
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    reference_path = os.path.join(output_dir, "drift_reference.json")
+    state_path = os.path.join(output_dir, STATE_FILE)
+    state = _load_state(state_path)
+    trained = {int(b): n for b, n in state.get("block_counts", {}).items()}
+
+    signatures = labeled_block_signatures(db_path, table_name, block_steps)
+    counts = {b: sig[0] for b, sig in signatures.items()}
+    if not counts:
+        log_safe(f"No labeled rows in {db_path} → {table_name}; nothing to do")
+        return {"retrained": False, "reason": "no labeled data"}
+    last = max(counts)
+    window = [b for b in counts if b > last - window_steps]
+    new_rows = sum(max(0, counts[b] - trained.get(b, 0)) for b in window)
+
+    cache = FeatureCache(os.path.join(output_dir, "feature_cache"),
+                         db_path, table_name, block_steps)
+    frames = {}
+
+    # Drift of the blocks that changed since the last training run
+    max_psi = 0.0
+    changed = [b for b in window if counts[b] != trained.get(b)]
+    if trained and changed and os.path.exists(reference_path):
+        monitor = DriftMonitor(load_reference(reference_path))
+        for b in changed:
+            frames[b] = cache.get(b, signatures[b])
+            monitor.update(frames[b][0])
+        scores = monitor.scores()
+        if len(scores):
+            max_psi = float(scores['psi'].max())
+
+    if force or not trained:
+        reason = "forced" if force else "first run"
+    elif new_rows >= min_new_rows:
+        reason = f"{new_rows} new labeled rows"
+    elif max_psi >= psi_threshold:
+        reason = f"drift (max PSI {max_psi:.3f})"
+    else:
+        log_safe(f"Retrain skipped: {new_rows} new labeled rows, "
+                 f"max PSI {max_psi:.3f}")
+        return {"retrained": False, "new_rows": new_rows, "max_psi": max_psi}
+
+    for b in window:
+        if b not in frames:
+            frames[b] = cache.get(b, signatures[b])
+    X = pd.concat([frames[b][0] for b in window], ignore_index=True)
+    y = pd.concat([frames[b][1] for b in window], ignore_index=True)
+    cache.prune(window)
+
+    # No decision_threshold_: a threshold tuned for the previous fit does
+    # not carry over, so scorers fall back to THRESHOLD until the next
+    # --optimize-threshold training run
+    fitted = clone(pipeline).fit(X, y)
+    explainer_for(fitted)
+
+    # Reference first: a scorer that reloads the new model also reloads
+    # the reference and finds the matching training profile
+    tmp_reference = save_reference(
+        build_reference(prepare_features(fitted, X)), f"{reference_path}.tmp")
+    os.replace(tmp_reference, reference_path)
+    _atomic_dump(fitted, model_path)
+
+    summary = {
+        "retrained": True,
+        "reason": reason,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "window": [window[0], window[-1] + block_steps - 1],
+        "rows": len(y),
+        "new_rows": new_rows,
+        "max_psi": max_psi,
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "wall_s": time.perf_counter() - start,
+        "block_counts": {str(b): counts[b] for b in window},
+    }
+    with open(state_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    log_safe(f"Retrained on steps {summary['window'][0]}-{summary['window'][1]}"
+             f" ({len(y)} rows, {reason}); {cache.hits} cached blocks, "
+             f"{cache.misses} loaded, {summary['wall_s']:.2f}s")
+    return summary
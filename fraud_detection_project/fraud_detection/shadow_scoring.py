@@ -0,0 +1,150 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from joblib import load
+from sklearn.metrics import roc_auc_score
+
+from async_writer import PredictionWriter
+from fraud_detection import (
+    OUTPUT_DIR, THRESHOLD, load_data_from_db, log_safe, mask_account_ids
+)
+
+# ---------------------------------------------------
+# 🥊 Champion / challenger scoring in one data pass
+# ---------------------------------------------------
+
+
+def load_pipelines(model_paths):
+    """Load versioned pipelines keyed by file name; the first is champion."""
+    pipelines = {}
+    for path in model_paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        key, n = name, 2
+        while key in pipelines:
+            key, n = f"{name}_{n}", n + 1
+        pipelines[key] = load(path)
+    return pipelines
+
+
+def score_models(pipelines, chunk, n_threads=1):
+    """Return {name: fraud probabilities} for one chunk of raw rows.
+
+    The champion's preprocessing step runs once and every model scores
+    the shared feature matrix, so all pipelines must share the same
+    (stateless) preprocessing; only column selection may differ.
+    """
+    champion = next(iter(pipelines.values()))
+    shared = champion[:-1].transform(chunk.copy())
+
+    def _score(fitted_pipeline):
+        model = fitted_pipeline[-1]
+        names = getattr(model, 'feature_names_in_', None)
+        X = shared if names is None or list(names) == list(shared.columns) \
+            else shared.reindex(columns=names, fill_value=0)
+        return model.predict_proba(X)[:, 1]
+
+    if n_threads > 1 and len(pipelines) > 1:
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            probs = list(pool.map(_score, pipelines.values()))
+    else:
+        probs = [_score(p) for p in pipelines.values()]
+    return shared, dict(zip(pipelines, probs))
+
+
+class DisagreementStats:
+    """Running champion-vs-challenger comparison, updated per chunk.
+
+    ``thresholds`` maps model name to the decision threshold it is
+    deployed with; models missing from it use THRESHOLD.
+    """
+
+    def __init__(self, names, thresholds=None):
+        self.champion = names[0]
+        self.names = list(names)
+        self.thresholds = {name: (thresholds or {}).get(name, THRESHOLD)
+                           for name in self.names}
+        self.rows = 0
+        self.flagged = dict.fromkeys(self.names, 0)
+        self.disagree = dict.fromkeys(self.names[1:], 0)
+        self.abs_diff = dict.fromkeys(self.names[1:], 0.0)
+        self.max_diff = dict.fromkeys(self.names[1:], 0.0)
+
+    def update(self, probs):
+        champ = probs[self.champion]
+        champ_flag = champ >= self.thresholds[self.champion]
+        self.rows += len(champ)
+        for name in self.names:
+            self.flagged[name] += int(
+                (probs[name] >= self.thresholds[name]).sum())
+        for name in self.names[1:]:
+            diff = np.abs(probs[name] - champ)
+            flag = probs[name] >= self.thresholds[name]
+            self.disagree[name] += int((flag != champ_flag).sum())
+            self.abs_diff[name] += float(diff.sum())
+            if len(diff):
+                self.max_diff[name] = max(self.max_diff[name],
+                                          float(diff.max()))
+
+    def summary(self):
+        rows = max(self.rows, 1)
+        return {
+            "champion": self.champion,
+            "rows": self.rows,
+            "thresholds": self.thresholds,
+            "flag_rate": {n: c / rows for n, c in self.flagged.items()},
+            "challengers": {
+                name: {
+                    "decision_disagreement_rate": self.disagree[name] / rows,
+                    "mean_abs_prob_diff": self.abs_diff[name] / rows,
+                    "max_abs_prob_diff": self.max_diff[name],
+                } for name in self.names[1:]
+            },
+        }
+
+
+def run_shadow(input_path, model_paths, is_db=False, save_to_db=False,
+               output_db_path=None, chunk_size=100_000, n_threads=1):
+    pipelines = load_pipelines(model_paths)
+    names = list(pipelines)
+    df = load_data_from_db(input_path) if is_db else pd.read_csv(input_path)
+    df = mask_account_ids(df)
+    labels = df.pop('isFraud') if 'isFraud' in df.columns else None
+    db_path = output_db_path if save_to_db and output_db_path else None
+
+    # Compare the labels each model emits in production (see run_pipeline)
+    thresholds = {name: getattr(pipeline, 'decision_threshold_', THRESHOLD)
+                  for name, pipeline in pipelines.items()}
+    stats = DisagreementStats(names, thresholds)
+    all_probs = {name: [] for name in names} if labels is not None else None
+    pred_path = os.path.join(OUTPUT_DIR, "shadow_predictions.csv")
+    writer = PredictionWriter(csv_path=pred_path, db_path=db_path,
+                              table_name="shadow_results")
+    for start in range(0, len(df), chunk_size):
+        X, probs = score_models(
+            pipelines, df.iloc[start:start + chunk_size], n_threads)
+        stats.update(probs)
+        if labels is not None:
+            X['Actual_isFraud'] = labels.iloc[start:start + chunk_size].values
+        for name in names:
+            X[f'Fraud_Probability_{name}'] = probs[name]
+            X[f'Predicted_isFraud_{name}'] = \
+                (probs[name] >= thresholds[name]).astype(int)
+            if all_probs is not None:
+                all_probs[name].append(probs[name])
+        writer.submit(X)
+    writer.close()
+
+    summary = stats.summary()
+    if all_probs is not None and labels.nunique() > 1:
+        summary["roc_auc"] = {
+            name: float(roc_auc_score(labels, np.concatenate(chunks)))
+            for name, chunks in all_probs.items()}
+    report_path = os.path.join(OUTPUT_DIR, "shadow_report.json")
+    with open(report_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    log_safe(f"Shadow scoring of {len(names)} models on {stats.rows} rows "
+             f"saved to {pred_path} and {report_path}")
+    return summary
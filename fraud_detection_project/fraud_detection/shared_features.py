@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------
+# 🧠 Shared-memory feature matrices for worker processes
+# ---------------------------------------------------
+#
+# The preprocessed (all-numeric) feature matrix is copied once into a
+# named shared-memory block. Workers receive only a small handle (block
+# name, shape, dtype, column names) and map the same pages, so nothing
+# proportional to the data is pickled per worker or per task.
+
+BLOCK_ROWS = 50_000  # rows per scoring task
+
+
+class SharedMatrix:
+    """A DataFrame, Series or ndarray copied into named shared memory.
+
+    The creating process owns the block: ``close()`` also unlinks it.
+    Use as a context manager so the block is released on errors.
+    """
+
+    def __init__(self, data, dtype=np.float64):
+        self.columns = list(data.columns) if isinstance(data, pd.DataFrame) \
+            else None
+        self.series_name = data.name if isinstance(data, pd.Series) else None
+        values = np.asarray(data, dtype=dtype)
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=max(values.nbytes, 1))
+        self.array = np.ndarray(values.shape, dtype=values.dtype,
+                                buffer=self._shm.buf)
+        self.array[...] = values
+
+    @property
+    def handle(self):
+        return {"name": self._shm.name, "shape": self.array.shape,
+                "dtype": self.array.dtype.str, "columns": self.columns,
+                "series_name": self.series_name}
+
+    def close(self):
+        if self._shm is not None:
+            del self.array
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(handle):
+    """Map a shared matrix by handle; returns ``(shm, data)`` without copying.
+
+    Keep ``shm`` referenced while ``data`` is in use and ``shm.close()``
+    it afterwards (never ``unlink``: the creator owns the block).
+    """
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    array = np.ndarray(handle["shape"], dtype=np.dtype(handle["dtype"]),
+                       buffer=shm.buf)
+    if handle["columns"] is not None:
+        return shm, pd.DataFrame(array, columns=handle["columns"], copy=False)
+    if array.ndim == 1 and handle.get("series_name") is not None:
+        return shm, pd.Series(array, name=handle["series_name"], copy=False)
+    return shm, array
+
+
+# ---------------------------------------------------
+# 🏭 Process-parallel scoring over a shared matrix
+# ---------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(model):
+    _worker["model"] = model
+
+
+def _score_block(args):
+    handle, lo, hi = args
+    shm, X = attach(handle)
+    try:
+        return _worker["model"].predict_proba(X.iloc[lo:hi])[:, 1]
+    finally:
+        del X
+        shm.close()
+
+
+class SharedScorer:
+    """Pool of processes that each hold one copy of ``model``.
+
+    ``predict_proba(X)`` shares ``X`` once and sends each worker only the
+    handle and a row range.
+    """
+
+    def __init__(self, model, n_jobs=None, block_rows=BLOCK_ROWS,
+                 mp_context=None):
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.block_rows = block_rows
+        if os.name == "posix":
+            # Forked workers must share the parent's tracker; one started
+            # later in a worker would unlink the parent's blocks at exit
+            resource_tracker.ensure_running()
+        self._pool = ProcessPoolExecutor(max_workers=self.n_jobs,
+                                         mp_context=mp_context,
+                                         initializer=_init_worker,
+                                         initargs=(model,))
+
+    def predict_proba(self, X):
+        block = max(1, min(self.block_rows, -(-len(X) // self.n_jobs)))
+        with SharedMatrix(X) as shared:
+            tasks = [(shared.handle, lo, min(lo + block, len(X)))
+                     for lo in range(0, len(X), block)]
+            parts = list(self._pool.map(_score_block, tasks))
+        return np.concatenate(parts) if parts else np.array([])
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
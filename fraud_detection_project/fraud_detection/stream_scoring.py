@@ -0,0 +1,234 @@
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+import pandas as pd
+from joblib import load
+
+from drift import DriftMonitor, load_reference
+from explain import explainer_for
+from safe_logging import EventLogger
+from fraud_detection import (
+    OUTPUT_DIR, THRESHOLD, log_safe, prepare_features, report_drift
+)
+
+# ---------------------------------------------------
+# 📡 Event sources: stdin, file / named pipe, TCP socket
+# ---------------------------------------------------
+
+
+def open_source(source):
+    """Return a binary line reader for '-', 'tcp://host:port' or a path."""
+    if source == "-":
+        return sys.stdin.buffer
+    if source.startswith("tcp://"):
+        host, port = source[len("tcp://"):].rsplit(":", 1)
+        conn = socket.create_connection((host, int(port)))
+        return conn.makefile("rb")
+    # Regular files and named pipes (FIFOs) are both read line by line
+    return open(source, "rb")
+
+
+def _reader(stream, events):
+    try:
+        for line in stream:
+            events.put((time.perf_counter(), line))
+    finally:
+        events.put(None)
+
+
+def iter_micro_batches(stream, batch_size=1000, max_latency_ms=50.0):
+    """Yield lists of (arrival_time, raw_line) bounded by size and age.
+
+    A batch is flushed when it holds ``batch_size`` events or when its
+    oldest event has waited ``max_latency_ms``, whichever comes first.
+    """
+    events = queue.Queue(maxsize=batch_size * 4)
+    threading.Thread(target=_reader, args=(stream, events),
+                     daemon=True).start()
+    max_wait = max_latency_ms / 1000.0
+    done = False
+    while not done:
+        item = events.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = item[0] + max_wait
+        while len(batch) < batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = events.get(timeout=timeout) if timeout > 0 \
+                    else events.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                done = True
+                break
+            batch.append(item)
+        yield batch
+
+# ---------------------------------------------------
+# 📊 Throughput / latency counters
+# ---------------------------------------------------
+
+
+class StreamStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = 0
+        self.batches = 0
+        self.bad_lines = 0
+        self.flagged = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, batch, n_scored, n_flagged):
+        now = time.perf_counter()
+        latency = now - batch[0][0]
+        self.events += n_scored
+        self.batches += 1
+        self.bad_lines += len(batch) - n_scored
+        self.flagged += n_flagged
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def snapshot(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "bad_lines": self.bad_lines,
+            "flagged": self.flagged,
+            "events_per_sec": round(self.events / elapsed, 1),
+            "avg_batch_latency_ms": round(
+                1000 * self.latency_total / max(self.batches, 1), 3),
+            "max_batch_latency_ms": round(1000 * self.latency_max, 3),
+        }
+
+# ---------------------------------------------------
+# 🚰 Streaming scorer
+# ---------------------------------------------------
+
+
+def _parse(batch):
+    records = []
+    for _, line in batch:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def score_batch(fitted_pipeline, records, threshold=None, explainer=None):
+    if threshold is None:
+        threshold = getattr(fitted_pipeline, 'decision_threshold_', THRESHOLD)
+    X = prepare_features(fitted_pipeline, pd.DataFrame.from_records(records))
+    probs = fitted_pipeline[-1].predict_proba(X)[:, 1]
+    reasons = explainer.explain(X) if explainer is not None else None
+    X['Predicted_isFraud'] = (probs >= threshold).astype(int)
+    X['Fraud_Probability'] = probs
+    if reasons is not None:
+        X['Top_Reasons'] = reasons
+    return X
+
+
+def _score_records(fitted_pipeline, records, explainer=None):
+    """Score a batch, dropping events whose fields cannot be scored.
+
+    Returns the scored frame and the records it holds, in order; the
+    caller counts the dropped events as bad lines.
+    """
+    try:
+        return score_batch(fitted_pipeline, records,
+                           explainer=explainer), records
+    except (ValueError, TypeError):
+        pass
+    # One bad event must not stop the stream: retry the batch event by event
+    frames, kept = [], []
+    for record in records:
+        try:
+            frames.append(score_batch(fitted_pipeline, [record],
+                                      explainer=explainer))
+        except (ValueError, TypeError):
+            continue
+        kept.append(record)
+    if not frames:
+        return None, kept
+    return pd.concat(frames, ignore_index=True), kept
+
+
+def score_stream(source, output=None, model_path=None, batch_size=1000,
+                 max_latency_ms=50.0, stats_interval=10.0, explain=False,
+                 reload_interval=5.0):
+    if model_path is None:
+        model_path = os.path.join(OUTPUT_DIR, "decision_tree_pipeline.joblib")
+    output = output if output is not None else sys.stdout
+    fitted_pipeline = load(model_path)
+    explainer = explainer_for(fitted_pipeline) if explain else None
+    # Retraining swaps the artifact atomically; pick it up between batches
+    model_mtime = os.stat(model_path).st_mtime_ns
+    next_reload_check = time.perf_counter() + reload_interval
+    reference_path = os.path.join(OUTPUT_DIR, "drift_reference.json")
+    monitor = DriftMonitor(load_reference(reference_path)) \
+        if os.path.exists(reference_path) else None
+    log_safe("Streaming scorer ready", batch_size=batch_size,
+             max_latency_ms=max_latency_ms)
+    # Per-transaction events are sampled; account IDs are masked on output
+    log_flagged = EventLogger("flagged", sample_every=10, max_per_second=5)
+
+    stream = open_source(source)
+    stats = StreamStats()
+    next_report = time.perf_counter() + stats_interval
+    try:
+        for batch in iter_micro_batches(stream, batch_size, max_latency_ms):
+            if time.perf_counter() >= next_reload_check:
+                next_reload_check = time.perf_counter() + reload_interval
+                mtime = os.stat(model_path).st_mtime_ns
+                if mtime != model_mtime:
+                    fitted_pipeline, model_mtime = load(model_path), mtime
+                    explainer = explainer_for(fitted_pipeline) \
+                        if explain else None
+                    # retrain writes the new training profile first; drift
+                    # is measured against it from here on
+                    if os.path.exists(reference_path):
+                        monitor = DriftMonitor(load_reference(reference_path))
+                    log_safe("Reloaded model", model_path=model_path)
+            records = _parse(batch)
+            n_flagged = 0
+            scored = None
+            if records:
+                scored, records = _score_records(fitted_pipeline, records,
+                                                 explainer=explainer)
+            if scored is not None:
+                if monitor is not None:
+                    monitor.update(scored)
+                flagged = scored['Predicted_isFraud'].to_numpy() == 1
+                n_flagged = int(flagged.sum())
+                for i in flagged.nonzero()[0]:
+                    log_flagged.log("Flagged transaction",
+                                    nameOrig=records[i].get('nameOrig'),
+                                    amount=records[i].get('amount'),
+                                    probability=float(
+                                        scored['Fraud_Probability'].iat[i]))
+                output.write(scored.to_json(orient="records", lines=True))
+                output.flush()
+            stats.record(batch, len(records), n_flagged)
+            if time.perf_counter() >= next_report:
+                log_safe("Stream stats", **stats.snapshot())
+                next_report += stats_interval
+    finally:
+        if source != "-":
+            stream.close()
+
+    summary = stats.snapshot()
+    log_safe("Stream finished", **summary)
+    if monitor is not None and stats.events:
+        report_drift(monitor)
+    return summary
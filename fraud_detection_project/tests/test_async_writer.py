@@ -0,0 +1,87 @@
+import sys
+import os
+import sqlite3
+import pandas as pd
+import pytest
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from async_writer import PredictionWriter
+
+
+def _chunk(start, n):
+    return pd.DataFrame({
+        'amount': range(start, start + n),
+        'Predicted_isFraud': [0] * n,
+        'Fraud_Probability': [0.1] * n
+    })
+
+
+# === Test: chunks land in CSV and SQLite in order ===
+def test_writer_writes_all_chunks(tmp_path):
+    csv_path = tmp_path / "preds.csv"
+    db_path = tmp_path / "preds.db"
+
+    with PredictionWriter(csv_path=str(csv_path), db_path=str(db_path),
+                          table_name="predicted_results",
+                          max_pending=1) as writer:
+        for start in range(0, 50, 10):
+            writer.submit(_chunk(start, 10))
+
+    assert writer.rows_written == 50
+    csv = pd.read_csv(csv_path)
+    assert list(csv['amount']) == list(range(50)), "CSV rows out of order"
+
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM predicted_results").fetchone()[0]
+    conn.close()
+    assert count == 50, "Expected 50 rows in SQLite"
+
+
+# === Test: writer errors surface in the caller ===
+def test_writer_error_is_raised_on_close(tmp_path):
+    bad_path = tmp_path / "missing_dir" / "preds.csv"
+    writer = PredictionWriter(csv_path=str(bad_path), max_pending=1)
+    writer.submit(_chunk(0, 5))
+    with pytest.raises(OSError):
+        writer.close()
+
+
+# === Test: closing without chunks replaces the previous outputs ===
+def test_writer_without_chunks_clears_outputs(tmp_path):
+    csv_path = tmp_path / "preds.csv"
+    db_path = tmp_path / "preds.db"
+    with PredictionWriter(csv_path=str(csv_path), db_path=str(db_path),
+                          table_name="predicted_results") as writer:
+        writer.submit(_chunk(0, 10))
+
+    with PredictionWriter(csv_path=str(csv_path), db_path=str(db_path),
+                          table_name="predicted_results") as writer:
+        pass
+
+    assert writer.rows_written == 0
+    assert csv_path.read_text() == "", "Stale CSV rows left behind"
+    conn = sqlite3.connect(db_path)
+    table = conn.execute("SELECT name FROM sqlite_master "
+                         "WHERE name='predicted_results'").fetchone()
+    conn.close()
+    assert table is None, "Stale predictions table left behind"
+
+
+# === Test: an error in the with-block stops the writer thread ===
+def test_writer_is_aborted_when_caller_fails(tmp_path):
+    db_path = tmp_path / "preds.db"
+    with pytest.raises(RuntimeError):
+        with PredictionWriter(db_path=str(db_path),
+                              table_name="predicted_results") as writer:
+            writer.submit(_chunk(0, 10))
+            raise RuntimeError("scoring failed")
+
+    assert not writer._thread.is_alive()
+    # No write transaction is left open on the database
+    conn = sqlite3.connect(db_path, timeout=0)
+    conn.execute("CREATE TABLE probe (x INTEGER)")
+    conn.commit()
+    conn.close()
@@ -0,0 +1,61 @@
+import sys
+import os
+import asyncio
+import pandas as pd
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from db import (
+    connection, dispose_engines, get_engine, read_query_async,
+    write_frame_async
+)
+from fraud_detection import (
+    load_data_from_db, load_data_from_db_async, write_predictions_to_db
+)
+
+FRAME = pd.DataFrame({'step': [1, 2, 3], 'amount': [10.0, 20.0, 30.0]})
+
+
+# === Test: one cached engine per file, with pragmas on each connection ===
+def test_engine_cached_and_pragmas_applied(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    assert get_engine(db_path) is get_engine(os.path.join(
+        str(tmp_path), ".", "cache.db"))
+
+    with connection(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    dispose_engines()
+
+
+# === Test: repeated calls reuse pooled connections ===
+def test_connections_are_reused(tmp_path):
+    db_path = str(tmp_path / "pool.db")
+    write_predictions_to_db(FRAME, db_path, "transactions")
+    with connection(db_path) as first:
+        pass
+    load_data_from_db(db_path)
+    with connection(db_path) as again:
+        assert again is first, "Connection should come back from the pool"
+    dispose_engines()
+
+
+# === Test: async variants run concurrently off the event loop ===
+def test_async_reads_and_writes(tmp_path):
+    db_path = str(tmp_path / "async.db")
+
+    async def scenario():
+        await write_frame_async(FRAME, db_path, "transactions")
+        frames = await asyncio.gather(
+            *(load_data_from_db_async(db_path) for _ in range(8)))
+        counts = await read_query_async(
+            db_path, "SELECT COUNT(*) AS n FROM transactions WHERE step >= ?",
+            params=(2,))
+        return frames, counts
+
+    frames, counts = asyncio.run(scenario())
+    assert all(f.equals(FRAME) for f in frames)
+    assert counts['n'].iloc[0] == 2
+    dispose_engines()
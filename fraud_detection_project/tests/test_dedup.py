@@ -0,0 +1,90 @@
+import sys
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from dedup import BloomFilter, open_filter, transaction_keys
+from load_csv_to_db import csv_to_sqlite
+
+
+def _keys(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2**63, n, dtype=np.int64).view(np.uint64)
+
+
+# === Test: no false negatives, false positives near the target rate ===
+def test_bloom_filter_error_rates():
+    bf = BloomFilter.for_capacity(50_000, fp_rate=0.01)
+    seen = _keys(50_000, seed=0)
+    bf.add(seen)
+
+    assert bf.contains(seen).all(), "Added keys must always be found"
+    fp = bf.contains(_keys(50_000, seed=1)).mean()
+    assert fp < 0.02, f"False-positive rate too high: {fp:.4f}"
+
+
+# === Test: add_new skips seen keys and repeats within a batch ===
+def test_add_new_and_persistence(tmp_path):
+    path = str(tmp_path / "seen.npz")
+    bf = open_filter(path, capacity=1000)
+    keys = np.array([1, 2, 2, 3], dtype=np.uint64)
+    assert bf.add_new(keys).tolist() == [True, True, False, True]
+    bf.save(path)
+
+    reloaded = open_filter(path)
+    assert reloaded.count == 3
+    assert reloaded.add_new(np.array([3, 4], dtype=np.uint64)).tolist() \
+        == [False, True]
+
+
+# === Test: keys depend on transaction fields, not the row index ===
+def test_transaction_keys_ignore_index():
+    df = pd.DataFrame({'step': [1, 1], 'nameOrig': ['C1', 'C2'],
+                       'nameDest': ['M1', 'M1'], 'amount': [10.0, 10.0]})
+    keys = transaction_keys(df)
+    assert keys[0] != keys[1]
+    assert (transaction_keys(df.iloc[::-1].reset_index(drop=True))
+            == keys[::-1]).all()
+
+
+# === Test: keys do not depend on the dtypes pandas inferred ===
+def test_transaction_keys_ignore_inferred_dtypes(tmp_path):
+    whole = tmp_path / "whole.csv"
+    mixed = tmp_path / "mixed.csv"
+    whole.write_text("step,nameOrig,nameDest,amount\n1,C1,M1,1000\n")
+    mixed.write_text("step,nameOrig,nameDest,amount\n"
+                     "1,C1,M1,1000\n2,C2,M2,12.5\n")
+    as_int, as_float = pd.read_csv(whole), pd.read_csv(mixed)
+    assert as_int['amount'].dtype != as_float['amount'].dtype
+    assert transaction_keys(as_int)[0] == transaction_keys(as_float)[0]
+
+
+# === Test: overlapping CSV loads insert each transaction once ===
+def test_csv_to_sqlite_is_idempotent_with_dedup(tmp_path):
+    rows = pd.DataFrame({
+        'step': [1, 1, 2, 2],
+        'type': ['CASH_OUT', 'TRANSFER', 'PAYMENT', 'CASH_IN'],
+        'amount': [100.0, 200.0, 300.0, 400.0],
+        'nameOrig': ['C1', 'C2', 'C3', 'C4'],
+        'nameDest': ['M1', 'M2', 'M3', 'M4'],
+        'isFraud': [0, 1, 0, 0]
+    })
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    rows.iloc[:3].to_csv(first, index=False)
+    rows.iloc[1:].to_csv(second, index=False)
+    db_path = str(tmp_path / "tx.db")
+    seen_path = str(tmp_path / "seen.npz")
+
+    for path in (first, second, second):
+        csv_to_sqlite(str(path), db_path, dedup_path=seen_path)
+
+    conn = sqlite3.connect(db_path)
+    loaded = pd.read_sql_query("SELECT * FROM transactions", conn)
+    conn.close()
+    assert len(loaded) == 4
+    assert sorted(loaded['nameOrig']) == ['C1', 'C2', 'C3', 'C4']
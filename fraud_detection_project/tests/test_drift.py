@@ -0,0 +1,52 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from drift import (
+    DriftMonitor, FeatureSketch, build_reference, load_reference, save_reference
+)
+
+
+def _features(n, shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'type': rng.integers(1, 6, size=n),
+        'amount': rng.lognormal(10 + shift, 1.0, size=n),
+    })
+
+
+# === Test: same distribution → low PSI, shifted amounts → high PSI ===
+def test_drift_scores_detect_shift(tmp_path):
+    path = tmp_path / "reference.json"
+    save_reference(build_reference(_features(20000)), str(path))
+    reference = load_reference(str(path))
+
+    stable = DriftMonitor(reference).update(_features(5000, seed=1)).scores()
+    shifted = DriftMonitor(reference).update(_features(5000, 1.0, seed=2)).scores()
+
+    stable = stable.set_index('feature')
+    shifted = shifted.set_index('feature')
+    assert stable.loc['amount', 'psi'] < 0.05
+    assert shifted.loc['amount', 'psi'] > 0.2
+    assert shifted.loc['amount', 'ks'] > stable.loc['amount', 'ks']
+    assert shifted.loc['type', 'psi'] < 0.05, "type was not shifted"
+
+
+# === Test: batch sketches merge to the same counts as one pass ===
+def test_sketches_are_mergeable():
+    values = np.random.default_rng(3).normal(size=1000)
+    edges = FeatureSketch.from_values(values).edges
+    whole = FeatureSketch(edges).update(values)
+    merged = FeatureSketch(edges).update(values[:400]).merge(
+        FeatureSketch(edges).update(values[400:]))
+    assert np.array_equal(whole.counts, merged.counts)
+    assert merged.total == 1000
+
+    with pytest.raises(ValueError):
+        whole.merge(FeatureSketch(edges[:-1]))
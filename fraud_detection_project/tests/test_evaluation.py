@@ -0,0 +1,43 @@
+import sys
+import os
+import numpy as np
+from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from evaluation import bootstrap_ci, format_ci_report
+
+
+def _scores(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.1).astype(int)
+    # Few distinct scores, like the leaves of a decision tree
+    prob = np.round(np.clip(rng.normal(0.2 + 0.4 * y, 0.2), 0, 1), 1)
+    return y, prob
+
+
+# === Test: point estimates match sklearn ===
+def test_point_estimates_match_sklearn():
+    y, prob = _scores()
+    pred = (prob >= 0.3).astype(int)
+    ci = bootstrap_ci(y, prob, 0.3, n_resamples=200)
+
+    assert np.isclose(ci['roc_auc']['estimate'], roc_auc_score(y, prob))
+    assert np.isclose(ci['precision']['estimate'], precision_score(y, pred))
+    assert np.isclose(ci['recall']['estimate'], recall_score(y, pred))
+    assert np.isclose(ci['f1']['estimate'], f1_score(y, pred))
+
+
+# === Test: intervals bracket the estimate and are reproducible ===
+def test_intervals_are_sane_and_seeded():
+    y, prob = _scores()
+    first = bootstrap_ci(y, prob, 0.3, n_resamples=500, n_jobs=2, seed=1)
+    second = bootstrap_ci(y, prob, 0.3, n_resamples=500, n_jobs=2, seed=1)
+
+    assert first == second, "Same seed should give the same intervals"
+    for name, r in first.items():
+        assert r['ci_low'] <= r['estimate'] <= r['ci_high'], name
+        assert r['ci_high'] - r['ci_low'] < 0.2, name
+    assert "ROC AUC:" in format_ci_report(first, 500)
@@ -0,0 +1,58 @@
+import sys
+import os
+import numpy as np
+from sklearn.base import clone
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+BENCH_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+sys.path.insert(0, os.path.abspath(BENCH_DIR))
+
+from explain import explainer_for
+from fraud_detection import pipeline, prepare_features
+from synthetic_data import generate_transactions
+
+import warnings
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+
+def _fitted(rows=5000, seed=0):
+    df = generate_transactions(rows, seed=seed, fraud_rate=0.05)
+    X = df.drop(columns=['isFraud'])
+    return clone(pipeline).fit(X, df['isFraud']), X
+
+
+# === Test: leaf contributions add up to the predicted probability ===
+def test_contributions_sum_to_probability():
+    fitted, X = _fitted()
+    explainer = explainer_for(fitted)
+    features = prepare_features(fitted, X)
+
+    probs = fitted[-1].predict_proba(features)[:, 1]
+    total = explainer.contributions(features).sum(axis=1) + explainer.bias
+    assert np.allclose(total, probs)
+
+
+# === Test: high-risk rows get reasons that their features satisfy ===
+def test_top_reasons_for_flagged_rows():
+    fitted, X = _fitted()
+    features = prepare_features(fitted, X)
+    probs = fitted[-1].predict_proba(features)[:, 1]
+    reasons = explainer_for(fitted).explain(features)
+
+    row = int(np.argmax(probs))
+    assert reasons[row], "Highest-risk row should have reasons"
+    assert len(reasons[row].split("; ")) <= 3
+
+
+# === Test: explainer is cached and rebuilt after refitting ===
+def test_explainer_cache_follows_model():
+    fitted, X = _fitted()
+    first = explainer_for(fitted)
+    assert explainer_for(fitted) is first
+
+    df = generate_transactions(5000, seed=1, fraud_rate=0.05)
+    fitted.fit(df.drop(columns=['isFraud']), df['isFraud'])
+    assert explainer_for(fitted) is not first
@@ -0,0 +1,89 @@
+import sys
+import os
+import pandas as pd
+import pytest
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from fraud_detection import load_data_from_db
+from partitioned_store import (
+    connect, drop_partitions, list_partitions, write_partitioned
+)
+
+
+def _transactions(steps):
+    return pd.DataFrame({
+        'step': steps,
+        'type': ['PAYMENT'] * len(steps),
+        'amount': [float(s) for s in steps],
+        'isFraud': [0] * len(steps)
+    })
+
+
+# === Test: rows are sharded by step range and tracked in the catalog ===
+def test_write_partitioned_builds_catalog(tmp_path):
+    conn = connect(str(tmp_path / "tx.db"))
+    write_partitioned(conn, _transactions([1, 2, 10, 11, 25]), "transactions", 10)
+    write_partitioned(conn, _transactions([3]), "transactions", 10)
+    parts = list_partitions(conn, "transactions")
+    conn.close()
+
+    assert list(parts['step_lo']) == [1, 11, 21]
+    assert list(parts['row_count']) == [4, 1, 1]
+
+
+# === Test: windowed loads prune partitions and trim partial ones ===
+def test_load_data_from_db_prunes_by_step(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    conn = connect(db_path)
+    write_partitioned(conn, _transactions(list(range(1, 41))), "transactions", 10)
+    conn.close()
+
+    window = load_data_from_db(db_path, step_min=15, step_max=22)
+    assert sorted(window['step']) == list(range(15, 23))
+    assert len(load_data_from_db(db_path)) == 40
+
+
+# === Test: retention drops whole partitions only ===
+def test_drop_partitions_before_step(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    conn = connect(db_path)
+    write_partitioned(conn, _transactions(list(range(1, 41))), "transactions", 10)
+    dropped = drop_partitions(conn, "transactions", before_step=25)
+    remaining = conn.execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE 'transactions__p%'"
+    ).fetchall()
+    conn.close()
+
+    assert dropped == 2
+    assert sorted(r[0] for r in remaining) == ['transactions__p000021',
+                                                'transactions__p000031']
+    assert load_data_from_db(db_path)['step'].min() == 21
+
+
+# === Test: a table keeps one partition size until it is dropped ===
+def test_write_partitioned_rejects_other_partition_size(tmp_path):
+    conn = connect(str(tmp_path / "tx.db"))
+    write_partitioned(conn, _transactions([1, 2]), "transactions", 10)
+    with pytest.raises(ValueError, match="partitioned by 10 steps"):
+        write_partitioned(conn, _transactions([3]), "transactions", 24)
+
+    drop_partitions(conn, "transactions")
+    write_partitioned(conn, _transactions([3]), "transactions", 24)
+    parts = list_partitions(conn, "transactions")
+    conn.close()
+    assert list(parts['step_hi']) == [24]
+
+
+# === Test: rows without a step are rejected, not silently dropped ===
+def test_write_partitioned_rejects_missing_step(tmp_path):
+    conn = connect(str(tmp_path / "tx.db"))
+    df = _transactions([1, 2, 3])
+    df.loc[1, 'step'] = None
+    with pytest.raises(ValueError, match="1 row\\(s\\) have no 'step'"):
+        write_partitioned(conn, df, "transactions", 10)
+    parts = list_partitions(conn, "transactions")
+    conn.close()
+    assert parts.empty
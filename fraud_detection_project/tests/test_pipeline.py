@@ -67,6 +67,17 @@ def test_missing_type_column():
     assert 'type' in processed.columns or 'type' not in df.columns, "Type column handling failed"
 
 
+# === Test: string and category type columns are encoded too ===
+def test_type_encoding_for_string_and_category_dtypes():
+    for dtype in ('string', 'category'):
+        df = pd.DataFrame({'type': ['CASH_OUT', 'PAYMENT', 'UNKNOWN'],
+                           'amount': [1, 2, 3]})
+        df['type'] = df['type'].astype(dtype)
+        processed = preprocess_fn(df)
+        assert processed['type'].tolist() == [1, 2, 0], dtype
+        assert pd.api.types.is_integer_dtype(processed['type']), dtype
+
+
 # === Test: Empty dataframe ===
 def test_empty_dataframe():
     df = pd.DataFrame(columns=['nameOrig', 'nameDest', 'type'])
@@ -130,3 +141,151 @@ def test_run_pipeline_with_unlabeled_data(tmp_path):
     except Exception as e:
         pytest.fail(f"run_pipeline (unlabeled) crashed: {e}")
 
+
+# === Test: --metrics writes per-stage timings to Outputs ===
+def test_run_pipeline_records_stage_metrics(tmp_path):
+    import json
+    from fraud_detection import OUTPUT_DIR
+
+    data = pd.DataFrame({
+        'type': ['CASH_OUT', 'TRANSFER', 'CASH_OUT', 'PAYMENT', 'TRANSFER'],
+        'amount': [1000, 2000, 1500, 300, 2500],
+        'nameOrig': ['C123', 'C456', 'C789', 'C111', 'C222'],
+        'nameDest': ['M123', 'M456', 'M789', 'M111', 'M222'],
+        'oldbalanceOrg': [5000, 1000, 3000, 800, 2500],
+        'newbalanceOrig': [4000, 800, 1500, 500, 0],
+        'oldbalanceDest': [1000, 300, 200, 0, 10],
+        'newbalanceDest': [2000, 500, 100, 300, 2510],
+        'isFraud': [0, 1, 0, 0, 1]
+    })
+    file_path = tmp_path / "test_labeled.csv"
+    data.to_csv(file_path, index=False)
+
+    run_pipeline(str(file_path), metrics=True)
+
+    with open(os.path.join(OUTPUT_DIR, "pipeline_metrics.json")) as f:
+        summary = json.load(f)
+    stages = {s['stage']: s for s in summary['stages']}
+    for name in ['load', 'mask', 'split', 'fit', 'predict', 'report', 'plot', 'write']:
+        assert name in stages, f"Missing stage {name}"
+    assert stages['load']['rows'] == 5
+    # Memory tracing is opt-in, so plain --metrics timings are not slowed
+    assert stages['fit']['peak_mem_bytes'] is None
+
+    run_pipeline(str(file_path), trace_memory=True)
+    with open(os.path.join(OUTPUT_DIR, "pipeline_metrics.json")) as f:
+        stages = {s['stage']: s for s in json.load(f)['stages']}
+    assert stages['fit']['peak_mem_bytes'] > 0
+
+
+# === Test: optimised threshold is saved with the model and reused ===
+def test_optimized_threshold_persists_with_model(tmp_path):
+    from joblib import load
+    from fraud_detection import OUTPUT_DIR
+
+    rows = 50
+    data = pd.DataFrame({
+        'type': ['CASH_OUT', 'TRANSFER'] * (rows // 2),
+        'amount': [100.0 * (i + 1) for i in range(rows)],
+        'nameOrig': [f'C{i}' for i in range(rows)],
+        'nameDest': [f'M{i}' for i in range(rows)],
+        'oldbalanceOrg': [float(i % 7) * 1000 for i in range(rows)],
+        'newbalanceOrig': [0.0] * rows,
+        'oldbalanceDest': [float(i % 3) * 500 for i in range(rows)],
+        'newbalanceDest': [float(i % 5) * 400 for i in range(rows)],
+        'isFraud': [1 if i % 5 == 0 else 0 for i in range(rows)]
+    })
+    labeled = tmp_path / "labeled.csv"
+    data.to_csv(labeled, index=False)
+    run_pipeline(str(labeled), optimize_threshold=True, review_cost=50.0)
+
+    model = load(os.path.join(OUTPUT_DIR, "decision_tree_pipeline.joblib"))
+    threshold = model.decision_threshold_
+    with open(os.path.join(OUTPUT_DIR, "model_report.txt")) as f:
+        assert "Cost-optimal threshold" in f.read()
+
+    unlabeled = tmp_path / "unlabeled.csv"
+    data.drop(columns=['isFraud']).to_csv(unlabeled, index=False)
+    run_pipeline(str(unlabeled))
+    scored = pd.read_csv(os.path.join(OUTPUT_DIR,
+                                      "fraud_predictions_unlabeled.csv"))
+    expected = (scored['Fraud_Probability'] >= threshold).astype(int)
+    assert (scored['Predicted_isFraud'] == expected).all()
+
+
+# === Test: --dedup skips rows scored by an earlier run ===
+def test_unlabeled_rescoring_skips_seen_rows(tmp_path):
+    from fraud_detection import OUTPUT_DIR
+
+    labeled = tmp_path / "labeled.csv"
+    pd.DataFrame({
+        'step': [1, 1, 2, 2],
+        'type': ['CASH_OUT', 'TRANSFER', 'CASH_OUT', 'PAYMENT'],
+        'amount': [1000, 2000, 1500, 300],
+        'nameOrig': ['C1', 'C2', 'C3', 'C4'],
+        'nameDest': ['M1', 'M2', 'M3', 'M4'],
+        'isFraud': [0, 1, 0, 1]
+    }).to_csv(labeled, index=False)
+    run_pipeline(str(labeled))
+
+    batch = pd.DataFrame({
+        'step': [1, 1, 2],
+        'type': ['CASH_OUT', 'TRANSFER', 'PAYMENT'],
+        'amount': [100.0, 200.0, 300.0],
+        'nameOrig': ['C7', 'C8', 'C9'],
+        'nameDest': ['M7', 'M8', 'M9']
+    })
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    batch.iloc[:2].to_csv(first, index=False)
+    batch.to_csv(second, index=False)
+    seen_path = str(tmp_path / "scored.npz")
+    pred_path = os.path.join(OUTPUT_DIR, "fraud_predictions_unlabeled.csv")
+
+    run_pipeline(str(first), dedup_path=seen_path)
+    assert len(pd.read_csv(pred_path)) == 2
+    run_pipeline(str(second), dedup_path=seen_path)
+    rescored = pd.read_csv(pred_path)
+    assert len(rescored) == 1 and rescored['amount'].iloc[0] == 300.0
+
+
+# === Test: a --dedup rerun of the same file leaves empty outputs ===
+def test_unlabeled_rerun_with_dedup_replaces_outputs(tmp_path):
+    import sqlite3
+    from fraud_detection import OUTPUT_DIR
+
+    labeled = tmp_path / "labeled.csv"
+    pd.DataFrame({
+        'type': ['CASH_OUT', 'TRANSFER', 'CASH_OUT', 'PAYMENT'],
+        'amount': [1000, 2000, 1500, 300],
+        'nameOrig': ['C1', 'C2', 'C3', 'C4'],
+        'nameDest': ['M1', 'M2', 'M3', 'M4'],
+        'isFraud': [0, 1, 0, 1]
+    }).to_csv(labeled, index=False)
+    run_pipeline(str(labeled))
+
+    unlabeled = tmp_path / "unlabeled.csv"
+    pd.DataFrame({
+        'type': ['CASH_OUT', 'TRANSFER'],
+        'amount': [100.0, 200.0],
+        'nameOrig': ['C7', 'C8'],
+        'nameDest': ['M7', 'M8']
+    }).to_csv(unlabeled, index=False)
+    seen_path = str(tmp_path / "scored.npz")
+    db_path = str(tmp_path / "predictions.db")
+    pred_path = os.path.join(OUTPUT_DIR, "fraud_predictions_unlabeled.csv")
+
+    for expected in (2, 0):
+        run_pipeline(str(unlabeled), save_to_db=True, output_db_path=db_path,
+                     dedup_path=seen_path)
+        with open(pred_path) as f:
+            rows = [line for line in f.read().splitlines()[1:] if line]
+        conn = sqlite3.connect(db_path)
+        table = conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE name='predicted_results_unlabeled'").fetchone()
+        count = conn.execute(
+            "SELECT COUNT(*) FROM predicted_results_unlabeled"
+        ).fetchone()[0] if table else 0
+        conn.close()
+        assert len(rows) == expected and count == expected, \
+            "Rerun must not leave the previous predictions in place"
@@ -0,0 +1,109 @@
+import sys
+import os
+import json
+import sqlite3
+from joblib import dump, load
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+BENCH_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+sys.path.insert(0, os.path.abspath(BENCH_DIR))
+
+from db import write_frame
+from retrain import labeled_block_counts, retrain
+from synthetic_data import generate_transactions
+
+import warnings
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+
+def _append(db_path, start_step, steps=24, rows=2_000, seed=0):
+    df = generate_transactions(rows, seed=seed, start_step=start_step,
+                               steps=steps)
+    write_frame(df, db_path, "transactions", if_exists='append')
+    return df
+
+
+# === Test: labeled rows are counted per block of steps ===
+def test_labeled_block_counts(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    df = _append(db_path, start_step=1, steps=48)
+    counts = labeled_block_counts(db_path, block_steps=24)
+    assert list(counts) == [1, 25]
+    assert sum(counts.values()) == len(df)
+
+
+# === Test: first run trains, an unchanged DB is skipped ===
+def test_retrain_skips_when_nothing_is_new(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    _append(db_path, start_step=1, steps=72)
+
+    first = retrain(db_path, output_dir=str(tmp_path), window_steps=72)
+    assert first["retrained"] and first["reason"] == "first run"
+    assert os.path.exists(tmp_path / "decision_tree_pipeline.joblib")
+    assert not os.path.exists(tmp_path / "decision_tree_pipeline.joblib.tmp")
+
+    second = retrain(db_path, output_dir=str(tmp_path), window_steps=72)
+    assert not second["retrained"] and second["new_rows"] == 0
+
+
+# === Test: enough new rows retrains, reusing unchanged cached blocks ===
+def test_retrain_reuses_cached_blocks(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    _append(db_path, start_step=1, steps=72)
+    retrain(db_path, output_dir=str(tmp_path), window_steps=72)
+    old_model = load(tmp_path / "decision_tree_pipeline.joblib")
+    old_model.decision_threshold_ = 0.42
+    dump(old_model, tmp_path / "decision_tree_pipeline.joblib")
+
+    _append(db_path, start_step=73, steps=24, seed=1)
+    result = retrain(db_path, output_dir=str(tmp_path), window_steps=72,
+                     min_new_rows=1_000)
+
+    assert result["retrained"] and result["new_rows"] == 2_000
+    # Window slid by one block: two cached blocks, one loaded
+    assert result["window"] == [25, 96]
+    assert (result["cache_hits"], result["cache_misses"]) == (2, 1)
+    assert sorted(os.listdir(tmp_path / "feature_cache")) == [
+        "transactions_b000025.pkl", "transactions_b000049.pkl",
+        "transactions_b000073.pkl"]
+
+    # A threshold tuned for the old fit is not carried over
+    new_model = load(tmp_path / "decision_tree_pipeline.joblib")
+    assert not hasattr(new_model, 'decision_threshold_')
+    with open(tmp_path / "retrain_state.json") as f:
+        assert json.load(f)["block_counts"]["73"] == 2_000
+
+
+# === Test: a small batch of new rows stays below the volume trigger ===
+def test_retrain_waits_for_min_new_rows(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    _append(db_path, start_step=1, steps=48)
+    retrain(db_path, output_dir=str(tmp_path))
+
+    _append(db_path, start_step=49, steps=24, rows=50, seed=2)
+    result = retrain(db_path, output_dir=str(tmp_path), min_new_rows=1_000,
+                     psi_threshold=float("inf"))
+    assert not result["retrained"] and result["new_rows"] == 50
+
+
+# === Test: relabeled rows invalidate their cached block ===
+def test_retrain_reloads_corrected_blocks(tmp_path):
+    db_path = str(tmp_path / "tx.db")
+    _append(db_path, start_step=1, steps=48)
+    retrain(db_path, output_dir=str(tmp_path), window_steps=48)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE transactions SET isFraud = 1 - isFraud "
+                 "WHERE rowid = (SELECT MIN(rowid) FROM transactions "
+                 "WHERE step > 24)")
+    conn.commit()
+    conn.close()
+    result = retrain(db_path, output_dir=str(tmp_path), window_steps=48,
+                     force=True)
+
+    # Same row counts, but the second block's labels changed
+    assert result["new_rows"] == 0
+    assert (result["cache_hits"], result["cache_misses"]) == (1, 1)
@@ -0,0 +1,54 @@
+import sys
+import os
+import io
+import pytest
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from safe_logging import (
+    EventLogger, configure_logging, flush_logging, log_safe
+)
+
+
+@pytest.fixture
+def log_output():
+    buf = io.StringIO()
+    configure_logging(stream=buf)
+
+    def read():
+        flush_logging()
+        return buf.getvalue()
+    yield read
+    configure_logging()
+
+
+# === Test: account IDs never reach the log, in text or fields ===
+def test_account_ids_are_masked(log_output):
+    log_safe("Scored %s -> %s", "C1231006815", "M1979787155",
+             nameOrig="C1231006815", amount=181.0)
+    out = log_output()
+
+    assert "C1231006815" not in out and "M1979787155" not in out
+    assert "[SAFE] Scored acct:" in out
+    assert '"amount": 181.0' in out and '"nameOrig": "acct:' in out
+
+
+# === Test: events are sampled and report what was skipped ===
+def test_event_logger_samples(log_output):
+    events = EventLogger("test_sampled", sample_every=10, max_per_second=1e6)
+    emitted = sum(events.log("Flagged", amount=i) for i in range(35))
+    out = log_output()
+
+    assert emitted == 3
+    assert out.count("Flagged") == 3
+    assert '"suppressed": 9' in out
+
+
+# === Test: bursts beyond the rate limit are dropped ===
+def test_event_logger_rate_limit(log_output):
+    events = EventLogger("test_limited", sample_every=1, max_per_second=2)
+    emitted = sum(events.log("Flagged") for _ in range(50))
+    assert emitted == 2
+    assert events.suppressed == 48
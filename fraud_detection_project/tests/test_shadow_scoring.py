@@ -0,0 +1,98 @@
+import sys
+import os
+import pandas as pd
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from fraud_detection import OUTPUT_DIR, preprocess_fn
+from shadow_scoring import load_pipelines, run_shadow, score_models
+
+import warnings
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+DATA = pd.DataFrame({
+    'type': ['CASH_OUT', 'TRANSFER', 'CASH_OUT', 'PAYMENT'],
+    'amount': [1000, 2000, 1500, 300],
+    'nameOrig': ['C123', 'C456', 'C789', 'C111'],
+    'nameDest': ['M123', 'M456', 'M789', 'M111'],
+    'oldbalanceOrg': [5000, 1000, 3000, 800],
+    'newbalanceOrig': [4000, 800, 1500, 500],
+    'oldbalanceDest': [1000, 300, 200, 0],
+    'newbalanceDest': [2000, 500, 100, 300],
+    'isFraud': [0, 1, 0, 1]
+})
+
+
+def _dump_models(tmp_path):
+    from sklearn.dummy import DummyClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import FunctionTransformer
+    from sklearn.tree import DecisionTreeClassifier
+    from joblib import dump
+
+    X, y = DATA.drop(columns=['isFraud']), DATA['isFraud']
+    paths = []
+    for name, model in [('champion', DecisionTreeClassifier(random_state=0)),
+                        ('challenger', DummyClassifier(strategy='prior'))]:
+        pipe = Pipeline([
+            ('preprocess', FunctionTransformer(preprocess_fn, validate=False)),
+            ('model', model)
+        ]).fit(X, y)
+        path = tmp_path / f"{name}.joblib"
+        dump(pipe, path)
+        paths.append(str(path))
+    return paths
+
+
+# === Test: every model scores the shared feature matrix ===
+def test_score_models_shares_preprocessing(tmp_path):
+    pipelines = load_pipelines(_dump_models(tmp_path))
+    X, probs = score_models(pipelines, DATA.drop(columns=['isFraud']),
+                            n_threads=2)
+    assert list(probs) == ['champion', 'challenger']
+    assert 'nameOrig' not in X.columns
+    assert list(probs['champion']) == [0, 1, 0, 1]
+    assert list(probs['challenger']) == [0.5] * 4
+
+
+# === Test: side-by-side output and disagreement report ===
+def test_run_shadow_reports_disagreement(tmp_path):
+    input_path = tmp_path / "labeled.csv"
+    DATA.to_csv(input_path, index=False)
+
+    summary = run_shadow(str(input_path), _dump_models(tmp_path),
+                         chunk_size=3)
+
+    assert summary['rows'] == 4
+    challenger = summary['challengers']['challenger']
+    # prior 0.5 >= 0.3 flags everything; champion flags half
+    assert challenger['decision_disagreement_rate'] == 0.5
+    assert summary['roc_auc']['champion'] == 1.0
+
+    out = pd.read_csv(os.path.join(OUTPUT_DIR, "shadow_predictions.csv"))
+    assert len(out) == 4
+    assert {'Fraud_Probability_champion', 'Fraud_Probability_challenger',
+            'Actual_isFraud'} <= set(out.columns)
+
+
+# === Test: each model's saved decision threshold is honoured ===
+def test_run_shadow_uses_model_thresholds(tmp_path):
+    from joblib import dump, load
+
+    input_path = tmp_path / "labeled.csv"
+    DATA.to_csv(input_path, index=False)
+    paths = _dump_models(tmp_path)
+    challenger = load(paths[1])
+    challenger.decision_threshold_ = 0.6
+    dump(challenger, paths[1])
+
+    summary = run_shadow(str(input_path), paths)
+
+    assert summary['thresholds'] == {'champion': 0.3, 'challenger': 0.6}
+    # prior 0.5 < 0.6 flags nothing
+    assert summary['flag_rate']['challenger'] == 0.0
+    out = pd.read_csv(os.path.join(OUTPUT_DIR, "shadow_predictions.csv"))
+    assert (out['Predicted_isFraud_challenger'] == 0).all()
@@ -0,0 +1,58 @@
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from shared_features import SharedMatrix, SharedScorer, attach
+
+
+def _column_sums(handle):
+    shm, X = attach(handle)
+    try:
+        return X.sum().tolist()
+    finally:
+        del X
+        shm.close()
+
+
+def _frame(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.random((rows, 4)), columns=list("abcd"))
+
+
+# === Test: attaching maps the same memory instead of copying ===
+def test_attach_is_zero_copy():
+    df = _frame()
+    with SharedMatrix(df) as shared:
+        shm, view = attach(shared.handle)
+        assert list(view.columns) == list("abcd")
+        assert np.shares_memory(view.to_numpy(), shm.buf)
+        shared.array[0, 0] = -1.0
+        assert view.iloc[0, 0] == -1.0, "Views should see writes in place"
+        del view
+        shm.close()
+
+
+# === Test: other processes attach by name ===
+def test_workers_attach_by_name():
+    df = _frame()
+    with SharedMatrix(df) as shared, ProcessPoolExecutor(2) as pool:
+        sums = list(pool.map(_column_sums, [shared.handle] * 2))
+    assert np.allclose(sums, [df.sum().tolist()] * 2)
+
+
+# === Test: parallel scoring matches single-process scoring ===
+def test_shared_scorer_matches_predict_proba():
+    X = _frame(5000)
+    y = (X['a'] + X['b'] > 1).astype(int)
+    model = DecisionTreeClassifier(max_depth=5, random_state=0).fit(X, y)
+
+    with SharedScorer(model, n_jobs=2, block_rows=700) as scorer:
+        probs = scorer.predict_proba(X)
+    assert np.array_equal(probs, model.predict_proba(X)[:, 1])
@@ -0,0 +1,123 @@
+import sys
+import os
+import io
+import json
+import pandas as pd
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from fraud_detection import preprocess_fn
+from stream_scoring import iter_micro_batches, score_stream
+
+import warnings
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+EVENTS = [
+    {'type': 'CASH_OUT', 'amount': 1200, 'nameOrig': 'C999', 'nameDest': 'M999',
+     'oldbalanceOrg': 5000, 'newbalanceOrig': 3800,
+     'oldbalanceDest': 100, 'newbalanceDest': 1300},
+    {'type': 'TRANSFER', 'amount': 800, 'nameOrig': 'C888', 'nameDest': 'M888',
+     'oldbalanceOrg': 2000, 'newbalanceOrig': 1500,
+     'oldbalanceDest': 50, 'newbalanceDest': 400},
+]
+
+
+def _dump_tree_pipeline(path):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import FunctionTransformer
+    from sklearn.tree import DecisionTreeClassifier
+    from joblib import dump
+
+    data = pd.DataFrame(EVENTS)
+    pipe = Pipeline([
+        ('preprocess', FunctionTransformer(preprocess_fn, validate=False)),
+        ('model', DecisionTreeClassifier(random_state=42))
+    ])
+    pipe.fit(data, [0, 1])
+    dump(pipe, path)
+
+
+# === Test: micro-batches respect the size bound ===
+def test_micro_batches_are_size_bounded():
+    lines = io.BytesIO(b"".join(b'{"amount": %d}\n' % i for i in range(25)))
+    batches = list(iter_micro_batches(lines, batch_size=10, max_latency_ms=1000))
+    assert [len(b) for b in batches] == [10, 10, 5], "Unexpected batch sizes"
+
+
+# === Test: JSONL in, scored JSONL out, bad lines skipped ===
+def test_score_stream_emits_jsonl(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    _dump_tree_pipeline(model_path)
+
+    # Keys in a different order than training, plus one malformed line
+    events_path = tmp_path / "events.jsonl"
+    with open(events_path, "w") as f:
+        for event in reversed(EVENTS):
+            f.write(json.dumps(dict(reversed(list(event.items())))) + "\n")
+        f.write("not json\n")
+
+    out = io.StringIO()
+    stats = score_stream(str(events_path), output=out,
+                         model_path=str(model_path), batch_size=100)
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats['events'] == 2 and stats['bad_lines'] == 1
+    assert [r['Predicted_isFraud'] for r in rows] == [1, 0]
+    assert all('nameOrig' not in r and 'nameDest' not in r for r in rows), \
+        "Account IDs must not be emitted"
+
+
+# === Test: --explain adds per-event reasons ===
+def test_score_stream_with_explanations(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    _dump_tree_pipeline(model_path)
+    events_path = tmp_path / "events.jsonl"
+    with open(events_path, "w") as f:
+        f.write("".join(json.dumps(e) + "\n" for e in EVENTS))
+
+    out = io.StringIO()
+    score_stream(str(events_path), output=out, model_path=str(model_path),
+                 explain=True)
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert rows[0]['Top_Reasons'] == ""
+    assert rows[1]['Top_Reasons'].endswith("(+0.50)")
+
+
+# === Test: an unscorable event is counted, not fatal ===
+def test_score_stream_skips_unscorable_events(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    _dump_tree_pipeline(model_path)
+    events_path = tmp_path / "events.jsonl"
+    with open(events_path, "w") as f:
+        f.write(json.dumps(EVENTS[0]) + "\n")
+        f.write(json.dumps(dict(EVENTS[1], amount="a lot")) + "\n")
+        f.write(json.dumps(EVENTS[1]) + "\n")
+
+    out = io.StringIO()
+    stats = score_stream(str(events_path), output=out,
+                         model_path=str(model_path), batch_size=100)
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats['events'] == 2 and stats['bad_lines'] == 1
+    assert [r['Predicted_isFraud'] for r in rows] == [0, 1]
+
+
+# === Test: output stays strict JSONL across micro-batches ===
+def test_score_stream_output_has_no_blank_lines(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    _dump_tree_pipeline(model_path)
+    events_path = tmp_path / "events.jsonl"
+    with open(events_path, "w") as f:
+        f.write("".join(json.dumps(e) + "\n" for e in EVENTS * 3))
+
+    out = io.StringIO()
+    score_stream(str(events_path), output=out, model_path=str(model_path),
+                 batch_size=1)
+
+    lines = out.getvalue().split("\n")
+    assert lines[-1] == "" and all(lines[:-1]), "Blank line in JSONL output"
+    assert len(lines) - 1 == 6
@@ -0,0 +1,41 @@
+import sys
+import os
+import pandas as pd
+
+# Dynamically add fraud_detection_project/benchmarks to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from synthetic_data import COLUMNS, generate_transactions, write_transactions_csv
+
+
+# === Test: generator is deterministic and matches unseen_data.csv ===
+def test_generator_is_deterministic_with_expected_schema():
+    unseen = os.path.join(os.path.dirname(__file__), '..',
+                          'fraud_detection', 'unseen_data.csv')
+    expected_cols = list(pd.read_csv(unseen, nrows=1).columns)
+
+    first = generate_transactions(5000, seed=7)
+    second = generate_transactions(5000, seed=7)
+
+    assert list(first.columns) == expected_cols == COLUMNS
+    assert first.equals(second), "Same seed should give identical data"
+    assert not first.equals(generate_transactions(5000, seed=8))
+
+
+# === Test: fraud only on TRANSFER / CASH_OUT and drains the origin ===
+def test_generator_fraud_pattern():
+    df = generate_transactions(20000, seed=1, fraud_rate=0.05)
+    fraud = df[df['isFraud'] == 1]
+    assert len(fraud) > 0
+    assert set(fraud['type']) <= {'TRANSFER', 'CASH_OUT'}
+    assert (fraud['newbalanceOrig'] == 0).all()
+
+
+# === Test: chunked CSV writer produces the requested row count ===
+def test_write_transactions_csv_in_chunks(tmp_path):
+    path = tmp_path / "synthetic.csv"
+    write_transactions_csv(str(path), 2500, chunk_size=1000)
+    df = pd.read_csv(path)
+    assert len(df) == 2500
+    assert df['step'].is_monotonic_increasing
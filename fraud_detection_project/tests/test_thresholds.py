@@ -0,0 +1,55 @@
+import sys
+import os
+import numpy as np
+
+# Dynamically add fraud_detection_project/fraud_detection to sys.path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', 'fraud_detection')))
+
+from thresholds import loss_at, optimal_threshold, sweep_thresholds
+
+
+def _data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.05).astype(int)
+    # Rounded scores give many ties, like tree leaf probabilities
+    prob = np.round(np.clip(rng.normal(0.2 + 0.5 * y, 0.2), 0, 1), 2)
+    amount = rng.lognormal(7, 1, n)
+    return y, prob, amount
+
+
+# === Test: single-pass sweep matches brute force at every threshold ===
+def test_sweep_matches_brute_force():
+    y, prob, amount = _data()
+    sweep = sweep_thresholds(y, prob, amount, review_cost=25.0)
+
+    assert sweep['threshold'].is_monotonic_decreasing
+    assert sweep['flagged'].iloc[0] == 0, "First row should flag nothing"
+    for row in sweep.sample(40, random_state=0).itertuples():
+        flag = prob >= row.threshold
+        tp = int((flag & (y == 1)).sum())
+        fp = int((flag & (y == 0)).sum())
+        missed = amount[(y == 1) & ~flag].sum()
+        assert (row.tp, row.fp) == (tp, fp)
+        assert np.isclose(row.expected_loss, missed + 25.0 * fp)
+
+
+# === Test: optimum is the minimum-loss threshold ===
+def test_optimal_threshold_minimises_loss():
+    y, prob, amount = _data()
+    sweep = sweep_thresholds(y, prob, amount, review_cost=25.0)
+    best = optimal_threshold(sweep)
+
+    assert best['expected_loss'] == sweep['expected_loss'].min()
+    assert best['expected_loss'] <= loss_at(sweep, 0.3)['expected_loss']
+    # Prohibitive review costs only allow flags that are all fraud
+    pricey = optimal_threshold(sweep_thresholds(y, prob, amount, 1e12))
+    assert pricey['fp'] == 0
+
+
+# === Test: loss_at reproduces a fixed cut ===
+def test_loss_at_fixed_threshold():
+    y, prob, amount = _data()
+    sweep = sweep_thresholds(y, prob, amount, review_cost=5.0)
+    row = loss_at(sweep, 0.3)
+    assert row['flagged'] == int((prob >= 0.3).sum())
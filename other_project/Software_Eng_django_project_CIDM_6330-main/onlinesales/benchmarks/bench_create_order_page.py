@@ -0,0 +1,115 @@
+"""create_order page render time with a large catalog.
+
+    python benchmarks/bench_create_order_page.py --products 100000
+
+"legacy" rebuilds the previous page: every product rendered into the
+<select> plus the whole price map serialised into the page on each
+request (its size excludes that map, which today's template no longer
+embeds). The current page renders no products; the browser fetches the
+cached price map once (revalidated by ETag) and searches products through
+the autocomplete endpoint.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_order_page_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+import json  # noqa: E402
+
+from django import forms  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.shortcuts import render  # noqa: E402
+from django.test import Client, RequestFactory  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from catalog.forms import OrderForm  # noqa: E402
+from catalog.models import Product  # noqa: E402
+
+
+class LegacyOrderForm(OrderForm):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['product'].widget = forms.Select(choices=self.fields['product'].choices)
+
+
+def legacy_create_order(request):
+    form = LegacyOrderForm()
+    products = Product.objects.all().values('id', 'list_price')
+    product_prices = json.dumps({str(product['id']): (float(product['list_price']) if product['list_price'] else 0) for product in products})
+    return render(request, 'catalog/order_form.html', {'form': form, 'product_prices': product_prices})
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='create_order page benchmark')
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    call_command('migrate', verbosity=0)
+    Product.objects.bulk_create(
+        [Product(english_product_name=f'Product {i}', list_price=i % 500 + 0.99, finished_goods_flag=True, color='Red')
+         for i in range(args.products)], batch_size=5000)
+    cache.clear()
+
+    client = Client()
+    factory = RequestFactory()
+    prices_url = reverse('product-prices')
+
+    legacy_s, legacy = timed(lambda: legacy_create_order(factory.get('/catalog/create-order/')), args.repeat)
+    page_s, page = timed(lambda: client.get(reverse('create-order')), args.repeat)
+    cache.clear()
+    cold_s, prices = timed(lambda: client.get(prices_url), 1)
+    warm_s, _ = timed(lambda: client.get(prices_url), args.repeat)
+    revalidate_s, not_modified = timed(
+        lambda: client.get(prices_url, HTTP_IF_NONE_MATCH=prices['ETag']), args.repeat)
+    search_s, _ = timed(lambda: client.get(reverse('product-autocomplete'), {'q': 'Product 9999'}), args.repeat)
+    assert not_modified.status_code == 304
+
+    print(f'{args.products:,} products (median of {args.repeat})')
+    rows = [
+        ('legacy page', legacy_s, len(legacy.content)),
+        ('page', page_s, len(page.content)),
+        ('price map (cold)', cold_s, len(prices.content)),
+        ('price map (cached)', warm_s, len(prices.content)),
+        ('price map (304)', revalidate_s, len(not_modified.content)),
+        ('autocomplete', search_s, None),
+    ]
+    print(f"{'request':<20}{'time':>11}{'bytes':>12}")
+    for name, seconds, size in rows:
+        print(f"{name:<20}{seconds * 1000:>9.1f}ms{size if size is not None else '':>12}")
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Home page requests/sec with per-request vs cached subcategory counts.
+
+    python benchmarks/bench_home_page.py --products 100000 --seconds 5
+
+"aggregate" restores the previous per-request
+ProductSubcategory.objects.annotate(total_products=Count('product'));
+"cached" is the current view, which reads the counts from the cache.
+"""
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_home_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from catalog import views  # noqa: E402
+from catalog.models import Product, ProductSubcategory  # noqa: E402
+
+
+def requests_per_second(client, url, seconds):
+    client.get(url)  # warm-up (fills the cache in "cached" mode)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        assert client.get(url).status_code == 200
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Home page subcategory count benchmark')
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--subcategories', type=int, default=40)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    call_command('migrate', verbosity=0)
+    subcategories = ProductSubcategory.objects.bulk_create(
+        [ProductSubcategory(english_product_subcategory_name=f'Subcategory {i}') for i in range(args.subcategories)])
+    Product.objects.bulk_create(
+        [Product(english_product_name=f'Product {i}', product_subcategory=subcategories[i % len(subcategories)],
+                 finished_goods_flag=True, color='Red')
+         for i in range(args.products)], batch_size=5000)
+    cache.clear()
+
+    client = Client()
+    url = reverse('index')
+    cached = views.get_subcategory_counts
+    views.get_subcategory_counts = lambda: ProductSubcategory.objects.annotate(total_products=Count('product'))
+    before = requests_per_second(client, url, args.seconds)
+    views.get_subcategory_counts = cached
+    after = requests_per_second(client, url, args.seconds)
+
+    print(f'{args.products:,} products in {args.subcategories} subcategories, anonymous home page')
+    print(f'aggregate per request: {before:>8.1f} req/s')
+    print(f'cached counts:         {after:>8.1f} req/s  ({after / before:.1f}x)')
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Order lines per minute: import_orders vs saving orders one at a time.
+
+    python benchmarks/bench_import_orders.py --lines 100000
+
+"per-order save" is how orders are created today (create_order / admin):
+Orders.save() plus its post_save signals for each line, timed on
+--save-lines lines. "import_orders" loads the full CSV.
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from io import StringIO
+from contextlib import redirect_stdout
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_import_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+
+from catalog.models import Currency, Customer, Date, Orders, Product  # noqa: E402
+
+
+def load_dimensions(n_customers, n_products, n_dates):
+    start = date(2020, 1, 1)
+    days = [start + timedelta(d) for d in range(n_dates)]
+    Date.objects.bulk_create([
+        Date(date_key=int(day.strftime('%Y%m%d')), full_date_alternate_key=day, day_number_of_week=1,
+             english_day_name_of_week='', spanish_day_name_of_week='', french_day_name_of_week='',
+             day_number_of_month=1, day_number_of_year=1, week_number_of_year=1, english_month_name='',
+             spanish_month_name='', french_month_name='', month_number_of_year=1, calendar_quarter=1,
+             calendar_year=day.year) for day in days])
+    Currency.objects.create(currency_alternate_key='USD', currency_name='US Dollar')
+    Customer.objects.bulk_create([
+        Customer(customer_alternate_key=f'AW{i:08d}', first_name='First', last_name='Last',
+                 birth_date='1980-01-01', email_address=f'customer{i}@example.com') for i in range(n_customers)],
+        batch_size=5000)
+    Product.objects.bulk_create([
+        Product(product_alternate_key=f'P-{i:05d}', english_product_name=f'Product {i}', finished_goods_flag=True,
+                color='Red', inventory_count=1_000_000) for i in range(n_products)])
+    return days
+
+
+def write_csv(path, n_lines, n_customers, n_products, days):
+    rng = random.Random(42)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['sales_order_number', 'sales_order_line_number', 'product', 'customer', 'currency',
+                         'order_date', 'order_quantity', 'unit_price', 'status'])
+        line = 0
+        order = 0
+        while line < n_lines:
+            order += 1
+            customer, day = f'AW{rng.randrange(n_customers):08d}', rng.choice(days).isoformat()
+            for number in range(1, min(rng.randint(1, 4), n_lines - line) + 1):
+                writer.writerow([f'SO{order:08d}', number, f'P-{rng.randrange(n_products):05d}', customer, 'USD',
+                                 day, rng.randint(1, 5), f'{rng.uniform(1, 500):.2f}', rng.choice('psd')])
+                line += 1
+
+
+def per_order_save(n_lines):
+    products = list(Product.objects.values_list('id', flat=True))
+    customers = list(Customer.objects.values_list('id', flat=True)[:1000])
+    currency = Currency.objects.get()
+    rng = random.Random(7)
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):  # the logging signal prints per order
+        for i in range(n_lines):
+            # create_order saves each order in its own transaction
+            with transaction.atomic():
+                Orders(product_id=rng.choice(products), customer_id=rng.choice(customers), currency=currency,
+                       sales_order_number=f'WEB{i:08d}', sales_order_line_number=1,
+                       order_quantity=1, unit_price=10).save()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Bulk order import benchmark')
+    parser.add_argument('--lines', type=int, default=100_000)
+    parser.add_argument('--save-lines', type=int, default=2000)
+    parser.add_argument('--customers', type=int, default=20_000)
+    parser.add_argument('--products', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    call_command('migrate', verbosity=0)
+    days = load_dimensions(args.customers, args.products, n_dates=1500)
+    path = os.path.join(WORKDIR, 'orders.csv')
+    write_csv(path, args.lines, args.customers, args.products, days)
+
+    save_s = per_order_save(args.save_lines)
+    start = time.perf_counter()
+    call_command('import_orders', path, stdout=StringIO())
+    import_s = time.perf_counter() - start
+    assert Orders.objects.filter(order_date__isnull=False).count() == args.lines
+
+    print(f"{'method':<18}{'lines':>9}{'seconds':>10}{'lines/min':>12}")
+    for name, lines, seconds in (('per-order save', args.save_lines, save_s),
+                                 ('import_orders', args.lines, import_s)):
+        print(f'{name:<18}{lines:>9,}{seconds:>10.2f}{lines / seconds * 60:>12,.0f}')
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
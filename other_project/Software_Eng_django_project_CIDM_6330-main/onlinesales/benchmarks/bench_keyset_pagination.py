@@ -0,0 +1,130 @@
+"""All-orders page queries: OFFSET pagination vs keyset cursors, by depth.
+
+    python benchmarks/bench_keyset_pagination.py --orders 1000000
+
+"offset" is what ListView's Paginator ran before: COUNT(*) over the whole
+table plus ORDER BY ... LIMIT 25 OFFSET n. "keyset" is AllOrdersListView
+today: a cursor seek on (order_date, id) plus its capped count. About 10%
+of the orders have no order_date, like orders placed through the site.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_keyset_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.core.paginator import Paginator  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from catalog.pagination import encode_cursor  # noqa: E402
+from catalog.views import AllOrdersListView, order_list_queryset  # noqa: E402
+
+PAGE_SIZE = AllOrdersListView.paginate_by
+
+
+def load_data(n_orders, n_customers=20_000, n_products=500, n_dates=1500, batch=50_000):
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    date_keys = [int((start + timedelta(d)).strftime('%Y%m%d')) for d in range(n_dates)]
+    with connection.cursor() as cursor:
+        # Throwaway database: trade durability for load speed
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA cache_size=-262144")
+        cursor.execute("INSERT INTO catalog_currency (currency_alternate_key, currency_name) VALUES ('USD', 'US Dollar')")
+        cursor.executemany(
+            "INSERT INTO catalog_date (date_key, full_date_alternate_key, day_number_of_week, "
+            "english_day_name_of_week, spanish_day_name_of_week, french_day_name_of_week, "
+            "day_number_of_month, day_number_of_year, week_number_of_year, english_month_name, "
+            "spanish_month_name, french_month_name, month_number_of_year, calendar_quarter, calendar_year) "
+            "VALUES (%s, %s, 1, '', '', '', 1, 1, 1, '', '', '', 1, 1, %s)",
+            [(key, start + timedelta(d), (start + timedelta(d)).year) for d, key in enumerate(date_keys)])
+        cursor.executemany(
+            "INSERT INTO catalog_customer (customer_alternate_key, first_name, last_name, birth_date, email_address) "
+            "VALUES (%s, 'First', 'Last', '1980-01-01', %s)",
+            [(f'C{i:014d}', f'customer{i}@example.com') for i in range(n_customers)])
+        cursor.executemany(
+            "INSERT INTO catalog_product (english_product_name, finished_goods_flag, color, inventory_count) "
+            "VALUES (%s, 1, 'Red', 100)",
+            [(f'Product {i}',) for i in range(n_products)])
+        for lo in range(0, n_orders, batch):
+            rows = [(rng.randint(1, n_products), rng.choice(date_keys) if rng.random() > 0.1 else None,
+                     rng.randint(1, n_customers), f'SO{i:08d}', rng.choice('dsp'))
+                    for i in range(lo, min(lo + batch, n_orders))]
+            cursor.executemany(
+                "INSERT INTO catalog_orders (product_id, order_date_id, customer_id, currency_id, "
+                "sales_order_number, sales_order_line_number, order_quantity, unit_price, status) "
+                "VALUES (%s, %s, %s, 1, %s, 1, 1, 10, %s)", rows)
+        cursor.execute("ANALYZE")
+
+
+def offset_page(number):
+    page = Paginator(order_list_queryset(), PAGE_SIZE).page(number)
+    return [order.pk for order in page]
+
+
+def keyset_page(cursor):
+    view = AllOrdersListView()
+    view.setup(RequestFactory().get('/catalog/all-orders/', {'cursor': cursor} if cursor else {}))
+    page = view.paginate_queryset(order_list_queryset(), PAGE_SIZE)[1]
+    return [order.pk for order in page]
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keyset vs offset pagination benchmark')
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    call_command('migrate', verbosity=0)
+    start = time.perf_counter()
+    load_data(args.orders)
+    print(f'Loaded {args.orders:,} orders in {time.perf_counter() - start:.1f}s')
+
+    last = -(-args.orders // PAGE_SIZE)
+    print(f"\n{'page':>8}{'offset':>12}{'keyset':>12}{'speed-up':>10}")
+    for number in sorted({1, 100, 1000, last // 2, last}):
+        # The cursor a reader following "next" links would hold for this page
+        cursor = None
+        if number > 1:
+            before = order_list_queryset()[(number - 1) * PAGE_SIZE - 1]
+            cursor = encode_cursor('n', [before.order_date_id, before.pk])
+        assert offset_page(number) == keyset_page(cursor), number
+        offset_ms = median_ms(lambda: offset_page(number), args.repeat)
+        keyset_ms = median_ms(lambda: keyset_page(cursor), args.repeat)
+        print(f'{number:>8}{offset_ms:>10.2f}ms{keyset_ms:>10.2f}ms{offset_ms / keyset_ms:>9.1f}x')
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""create_order request latency with inline email sending vs the outbox.
+
+    python benchmarks/bench_order_email.py --requests 200 --smtp-latency-ms 50
+
+"inline" reconnects the old post_save handler that called send_mail
+during the request; "outbox" is the current handler, which only writes
+an EmailOutbox row. --smtp-latency-ms adds a per-connection delay to the
+locmem backend to stand in for an SMTP handshake.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_email_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+settings.EMAIL_BACKEND = 'bench_order_email.SlowEmailBackend'
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+from io import StringIO  # noqa: E402
+from contextlib import redirect_stdout  # noqa: E402
+
+from django.core.mail import send_mail  # noqa: E402
+from django.core.mail.backends.locmem import EmailBackend  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models.signals import post_save  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from catalog import signals  # noqa: E402
+from catalog.models import Currency, Customer, EmailOutbox, Orders, Product  # noqa: E402
+
+
+class SlowEmailBackend(EmailBackend):
+    """Locmem backend that pays settings.BENCH_SMTP_LATENCY per connection.
+
+    Like the SMTP backend, sending without an open connection connects
+    (and disconnects) for that call alone.
+    """
+
+    def open(self):
+        if getattr(self, 'opened', False):
+            return False
+        time.sleep(settings.BENCH_SMTP_LATENCY)
+        self.opened = True
+        return True
+
+    def close(self):
+        self.opened = False
+
+    def send_messages(self, messages):
+        new_connection = self.open()
+        try:
+            return super().send_messages(messages)
+        finally:
+            if new_connection:
+                self.close()
+
+
+def send_inline(sender, instance, created, **kwargs):
+    """The pre-outbox handler: send during the request."""
+    subject = 'Order Confirmation' if created else 'Order Updated'
+    send_mail(subject, f'Order {instance.id}', 'customerservice@marketplace.com',
+              [instance.customer.email_address])
+
+
+def time_requests(client, data, n):
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = client.post(reverse('create-order'), data)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 302, response.status_code
+    return timings
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='create_order email latency benchmark')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--smtp-latency-ms', type=float, default=50.0)
+    args = parser.parse_args(argv)
+    settings.BENCH_SMTP_LATENCY = args.smtp_latency_ms / 1000
+
+    call_command('migrate', verbosity=0)
+    product = Product.objects.create(english_product_name='Chair', list_price=10, finished_goods_flag=True)
+    customer = Customer.objects.create(first_name='A', last_name='B', birth_date='1990-01-01',
+                                       email_address='a@example.com')
+    currency = Currency.objects.create(currency_alternate_key='USD', currency_name='US Dollar')
+    data = {'product': product.id, 'order_quantity': 1, 'unit_price': 10,
+            'currency': currency.id, 'customer': customer.id}
+    client = Client()
+
+    results = {}
+    with redirect_stdout(StringIO()):  # the logging signal prints per order
+        post_save.disconnect(signals.update_order_status_email, sender=Orders)
+        post_save.connect(send_inline, sender=Orders)
+        results['inline send_mail'] = time_requests(client, data, args.requests)
+        post_save.disconnect(send_inline, sender=Orders)
+        post_save.connect(signals.update_order_status_email, sender=Orders)
+        results['outbox'] = time_requests(client, data, args.requests)
+
+        start = time.perf_counter()
+        call_command('drain_outbox', batch_size=100, stdout=StringIO())
+        drain_s = time.perf_counter() - start
+    assert not EmailOutbox.objects.filter(sent_at__isnull=True).exists()
+
+    print(f'{args.requests} create_order POSTs, simulated SMTP connect {args.smtp_latency_ms:.0f}ms')
+    print(f"{'handler':<18}{'median':>10}{'p95':>10}")
+    for name, timings in results.items():
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(f'{name:<18}{statistics.median(timings) * 1000:>8.2f}ms{p95 * 1000:>8.2f}ms')
+    print(f'drain_outbox: {args.requests} emails in {drain_s:.2f}s '
+          f'({-(-args.requests // 100)} connection(s))')
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
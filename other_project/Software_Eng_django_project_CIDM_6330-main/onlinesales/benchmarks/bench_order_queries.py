@@ -0,0 +1,157 @@
+"""Query plans and latency of the order list lookups, before and after 0015.
+
+Builds a throwaway SQLite database migrated to 0014, bulk-loads synthetic
+orders, times the lookups, then applies 0015 (indexes + unique_together)
+and times them again:
+
+    python benchmarks/bench_order_queries.py --orders 1000000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_orders_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from catalog.models import Customer  # noqa: E402
+from catalog.views import order_list_queryset  # noqa: E402
+
+
+def load_data(n_orders, n_customers, n_products, n_dates, batch=50_000):
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    # Most orders in a mature history are delivered; few are still in flight
+    statuses = rng.choices('dsp', weights=(90, 7, 3), k=n_orders)
+    with connection.cursor() as cursor:
+        # Throwaway database: trade durability for load speed
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA cache_size=-262144")
+        cursor.execute("INSERT INTO catalog_currency (currency_alternate_key, currency_name) VALUES ('USD', 'US Dollar')")
+        cursor.executemany(
+            "INSERT INTO catalog_date (date_key, full_date_alternate_key, day_number_of_week, "
+            "english_day_name_of_week, spanish_day_name_of_week, french_day_name_of_week, "
+            "day_number_of_month, day_number_of_year, week_number_of_year, english_month_name, "
+            "spanish_month_name, french_month_name, month_number_of_year, calendar_quarter, calendar_year) "
+            "VALUES (%s, %s, 1, '', '', '', 1, 1, 1, '', '', '', 1, 1, %s)",
+            [(int((start + timedelta(d)).strftime('%Y%m%d')), start + timedelta(d), (start + timedelta(d)).year)
+             for d in range(n_dates)])
+        date_keys = [int((start + timedelta(d)).strftime('%Y%m%d')) for d in range(n_dates)]
+        cursor.executemany(
+            "INSERT INTO catalog_customer (customer_alternate_key, first_name, last_name, birth_date, email_address) "
+            "VALUES (%s, 'First', 'Last', '1980-01-01', %s)",
+            [(f'C{i:014d}', f'customer{i}@example.com') for i in range(n_customers)])
+        cursor.executemany(
+            "INSERT INTO catalog_product (english_product_name, finished_goods_flag, color, inventory_count) "
+            "VALUES (%s, 1, 'Red', 100)",
+            [(f'Product {i}',) for i in range(n_products)])
+        for lo in range(0, n_orders, batch):
+            rows = [(rng.randint(1, n_products), rng.choice(date_keys), rng.randint(1, n_customers),
+                     f'SO{i:08d}', 1, statuses[i])
+                    for i in range(lo, min(lo + batch, n_orders))]
+            cursor.executemany(
+                "INSERT INTO catalog_orders (product_id, order_date_id, customer_id, currency_id, "
+                "sales_order_number, sales_order_line_number, order_quantity, unit_price, status) "
+                "VALUES (%s, %s, %s, 1, %s, %s, 1, 10, %s)", rows)
+        cursor.execute("ANALYZE")
+
+
+def lookups(n_customers):
+    rng = random.Random(7)
+
+    def customer_by_email():
+        return Customer.objects.get(email_address=f'customer{rng.randrange(n_customers)}@example.com')
+
+    def recent_orders():
+        return list(order_list_queryset(customer_id=rng.randint(1, n_customers))[:10])
+
+    def my_shipped_orders():
+        return list(order_list_queryset(customer_id=rng.randint(1, n_customers), status='s')[:10])
+
+    def shipped_orders_page():
+        return list(order_list_queryset(status='s')[:25])
+
+    def shipped_orders_count():
+        # What a paginated list runs to number its pages
+        return order_list_queryset(status='s').count()
+
+    return {
+        'customer by email': (customer_by_email, Customer.objects.filter(email_address='customer1@example.com')),
+        'recent orders': (recent_orders, order_list_queryset(customer_id=1)[:10]),
+        'my shipped orders': (my_shipped_orders, order_list_queryset(customer_id=1, status='s')[:10]),
+        'shipped orders page': (shipped_orders_page, order_list_queryset(status='s')[:25]),
+        'shipped orders count': (shipped_orders_count, order_list_queryset(status='s').values('status')),
+    }
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def measure(cases, repeat):
+    results = {}
+    for name, (run, queryset) in cases.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        results[name] = (statistics.median(timings), query_plan(queryset))
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Order lookup index benchmark')
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--customers', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    call_command('migrate', 'catalog', '0014', verbosity=0)
+    start = time.perf_counter()
+    load_data(args.orders, args.customers, n_products=500, n_dates=1500)
+    print(f'Loaded {args.orders:,} orders in {time.perf_counter() - start:.1f}s')
+
+    cases = lookups(args.customers)
+    before = measure(cases, args.repeat)
+    start = time.perf_counter()
+    call_command('migrate', 'catalog', '0015', verbosity=0)
+    print(f'Applied 0015 in {time.perf_counter() - start:.1f}s')
+    after = measure(cases, args.repeat)
+
+    print(f"\n{'lookup':<22}{'before':>12}{'after':>12}{'speed-up':>10}")
+    for name in cases:
+        b, a = before[name][0], after[name][0]
+        print(f'{name:<22}{b * 1000:>10.2f}ms{a * 1000:>10.2f}ms{b / a:>9.1f}x')
+    for name in cases:
+        print(f'\n{name}\n  before: ' + '\n          '.join(before[name][1])
+              + '\n  after:  ' + '\n          '.join(after[name][1]))
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Sales report latency: live aggregation over Orders vs the summary tables.
+
+    python benchmarks/bench_sales_reports.py --orders 10000000
+
+"live" computes the report (monthly totals, subcategory totals, top ten
+customers for one year) with GROUP BYs over Orders; "summaries" is
+catalog.reporting.get_sales_report. Also times the first (full) refresh
+and an incremental refresh after --new-orders more order lines arrive.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onlinesales.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix='bench_reports_')
+settings.DATABASES['default']['NAME'] = os.path.join(WORKDIR, 'bench.sqlite3')
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count, DateField, Sum  # noqa: E402
+from django.db.models.functions import TruncMonth  # noqa: E402
+
+from catalog.models import Orders  # noqa: E402
+from catalog.reporting import LINE_AMOUNT, get_sales_report, refresh_sales_summaries  # noqa: E402
+
+START = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def load_data(n_orders, n_customers, n_products, n_subcategories, days, updated_at, first_id=1, batch=50_000):
+    rng = random.Random(first_id)
+    updated_at = updated_at.strftime('%Y-%m-%d %H:%M:%S')
+    with connection.cursor() as cursor:
+        # Throwaway database: trade durability for load speed
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA cache_size=-262144")
+        if first_id == 1:
+            cursor.execute("INSERT INTO catalog_currency (currency_alternate_key, currency_name) VALUES ('USD', 'US Dollar')")
+            cursor.executemany("INSERT INTO catalog_productsubcategory (english_product_subcategory_name) VALUES (%s)",
+                               [(f'Subcategory {i}',) for i in range(n_subcategories)])
+            cursor.executemany(
+                "INSERT INTO catalog_customer (customer_alternate_key, first_name, last_name, birth_date, email_address) "
+                "VALUES (%s, 'First', %s, '1980-01-01', %s)",
+                [(f'C{i:014d}', f'Last{i}', f'customer{i}@example.com') for i in range(n_customers)])
+            cursor.executemany(
+                "INSERT INTO catalog_product (english_product_name, product_subcategory_id, finished_goods_flag, color, inventory_count) "
+                "VALUES (%s, %s, 1, 'Red', 100)",
+                [(f'Product {i}', i % n_subcategories + 1) for i in range(n_products)])
+        for lo in range(first_id, first_id + n_orders, batch):
+            rows = []
+            for i in range(lo, min(lo + batch, first_id + n_orders)):
+                quantity, price = rng.randint(1, 5), rng.randint(100, 50_000) / 100
+                ordered = START + timedelta(days=rng.randrange(*days), seconds=rng.randrange(86400))
+                rows.append((rng.randint(1, n_products), rng.randint(1, n_customers), f'SO{i:09d}', quantity, price,
+                             quantity * price, ordered.strftime('%Y-%m-%d %H:%M:%S'), updated_at))
+            cursor.executemany(
+                "INSERT INTO catalog_orders (product_id, customer_id, currency_id, sales_order_number, "
+                "sales_order_line_number, order_quantity, unit_price, extended_amount, order_date_actual, "
+                "updated_at, status) VALUES (%s, %s, 1, %s, 1, %s, %s, %s, %s, %s, 'd')", rows)
+        cursor.execute("ANALYZE")
+
+
+def live_report(year):
+    orders = Orders.objects.filter(order_date_actual__gte=datetime(year, 1, 1, tzinfo=dt_timezone.utc),
+                                   order_date_actual__lt=datetime(year + 1, 1, 1, tzinfo=dt_timezone.utc)).order_by()
+    totals = {'order_lines': Count('id'), 'sales_amount': Sum(LINE_AMOUNT)}
+    return {
+        'months': list(orders.annotate(month=TruncMonth('order_date_actual', output_field=DateField()))
+                       .values('month').annotate(quantity=Sum('order_quantity'), **totals).order_by('month')),
+        'subcategories': list(orders.values('product__product_subcategory__english_product_subcategory_name')
+                              .annotate(quantity=Sum('order_quantity'), **totals).order_by('-sales_amount')),
+        'top_customers': list(orders.values('customer', 'customer__first_name', 'customer__last_name')
+                              .annotate(**totals).order_by('-sales_amount')[:10]),
+    }
+
+
+def median_s(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sales summary report benchmark')
+    parser.add_argument('--orders', type=int, default=10_000_000)
+    parser.add_argument('--new-orders', type=int, default=10_000)
+    parser.add_argument('--customers', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    n_days = 4 * 365
+
+    call_command('migrate', verbosity=0)
+    start = time.perf_counter()
+    now = datetime.now(dt_timezone.utc)
+    load_data(args.orders, args.customers, n_products=500, n_subcategories=40, days=(0, n_days),
+              updated_at=now - timedelta(hours=1))
+    print(f'Loaded {args.orders:,} order lines in {time.perf_counter() - start:.1f}s')
+
+    start = time.perf_counter()
+    months = refresh_sales_summaries()
+    print(f'Full refresh: {len(months)} months in {time.perf_counter() - start:.1f}s')
+
+    year = 2022
+    live_s, live = median_s(lambda: live_report(year), args.repeat)
+    summary_s, summary = median_s(lambda: get_sales_report(year), args.repeat)
+    assert all(abs(a['sales_amount'] - b.sales_amount) < 0.01 for a, b in zip(live['months'], summary['months']))
+    assert [c['customer'] for c in live['top_customers']] == [c['customer'] for c in summary['top_customers']]
+
+    # New lines land in the last two weeks of the history
+    load_data(args.new_orders, args.customers, 500, 40, days=(n_days - 14, n_days),
+              updated_at=datetime.now(dt_timezone.utc), first_id=args.orders + 1)
+    start = time.perf_counter()
+    months = refresh_sales_summaries()
+    incremental_s = time.perf_counter() - start
+
+    print(f"\n{'report for ' + str(year):<28}{'seconds':>10}")
+    print(f"{'live aggregation':<28}{live_s:>10.3f}")
+    print(f"{'summary tables':<28}{summary_s:>10.3f}  ({live_s / summary_s:,.0f}x)")
+    print(f"{'incremental refresh':<28}{incremental_s:>10.3f}  "
+          f"({args.new_orders:,} new lines, {len(months)} month(s) rebuilt)")
+
+    connection.close()
+    for name in os.listdir(WORKDIR):
+        os.remove(os.path.join(WORKDIR, name))
+    os.rmdir(WORKDIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Orders, Customer, Date, Promotion, Currency, Product, ProductSubcategory
+from .models import Orders, Customer, Date, Promotion, Currency, Product, ProductSubcategory, EmailOutbox, DailySales, MonthlySales
 
 # Register your models here.
 # Function to display shipping status in the admin list view
@@ -11,6 +11,11 @@ class OrdersAdmin(admin.ModelAdmin):
     list_display = ('sales_order_number', 'customer', 'order_date_actual', 'sales_amount', order_status)
     list_filter = ('order_date_actual', 'ship_date_actual','customer', 'status')  # filtering by status
     search_fields = ('sales_order_number', 'customer__first_name', 'customer__last_name')
+    # The changelist pages with OFFSET; keep it on the order-date index and
+    # skip the extra unfiltered COUNT(*) it runs beside the filtered one
+    ordering = ('-order_date', '-id')
+    list_select_related = ('customer',)
+    show_full_result_count = False
 
 admin.site.register(Orders, OrdersAdmin)
 
@@ -53,3 +58,21 @@ class ProductSubcategoryAdmin(admin.ModelAdmin):
 
 admin.site.register(ProductSubcategory, ProductSubcategoryAdmin)
 
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'created_at', 'sent_at', 'attempts')
+    list_filter = ('sent_at',)
+    search_fields = ('to', 'subject', 'last_error')
+
+admin.site.register(EmailOutbox, EmailOutboxAdmin)
+
+class MonthlySalesAdmin(admin.ModelAdmin):
+    list_display = ('month', 'order_lines', 'quantity', 'sales_amount')
+    date_hierarchy = 'month'
+
+admin.site.register(MonthlySales, MonthlySalesAdmin)
+
+class DailySalesAdmin(admin.ModelAdmin):
+    list_display = ('day', 'order_lines', 'quantity', 'sales_amount')
+    date_hierarchy = 'day'
+
+admin.site.register(DailySales, DailySalesAdmin)
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Product, ProductSubcategory
+
+# Cached data is stored under a version token; product signals replace the
+# token, so stale entries are simply never read again and expire on their own.
+CACHE_TIMEOUT = 60 * 60
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def _versioned_key(name):
+    version = cache.get_or_set(f'catalog:{name}:version', _new_version, None)
+    return f'catalog:{name}:{version}'
+
+
+def _invalidate(name):
+    cache.set(f'catalog:{name}:version', _new_version(), None)
+
+
+def invalidate_price_map():
+    # Only once the change is committed: bumped earlier, a concurrent request
+    # could cache the still-visible old prices under the new version
+    transaction.on_commit(lambda: _invalidate('price_map'))
+
+
+def get_price_map():
+    """Return ``(json_text, etag)`` for the {product id: list price} map."""
+    key = _versioned_key('price_map')
+    cached = cache.get(key)
+    if cached is None:
+        prices = {
+            str(pk): float(price) if price else 0
+            for pk, price in Product.objects.values_list('id', 'list_price').iterator()
+        }
+        body = json.dumps(prices)
+        cached = (body, '"%s"' % hashlib.md5(body.encode()).hexdigest())
+        cache.set(key, cached, CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_subcategory_counts():
+    # After commit, for the same reason as invalidate_price_map
+    transaction.on_commit(lambda: _invalidate('subcategory_counts'))
+
+
+def get_subcategory_counts():
+    """Subcategories annotated with ``total_products``, without a GROUP BY per request."""
+    key = _versioned_key('subcategory_counts')
+    subcategories = cache.get(key)
+    if subcategories is None:
+        subcategories = list(ProductSubcategory.objects.annotate(total_products=Count('product')))
+        cache.set(key, subcategories, CACHE_TIMEOUT)
+    return subcategories
@@ -20,6 +20,13 @@ class OrderForm(forms.ModelForm):
         
         self.fields['product'].queryset = Product.objects.all()
         self.fields['product'].label_from_instance = lambda obj: f"{obj.english_product_name} (ID: {obj.id})"
+        # A text box backed by the product autocomplete endpoint: a <select>
+        # would load and render every product in the catalog on each request
+        self.fields['product'].widget = forms.TextInput(attrs={
+            'list': 'product-options',
+            'autocomplete': 'off',
+            'placeholder': 'Type a product name or ID',
+        })
 
         self.fields['product'].help_text = "Select a product by its ID and name"
 
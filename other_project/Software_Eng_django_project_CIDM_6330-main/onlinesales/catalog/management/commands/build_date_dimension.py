@@ -0,0 +1,100 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.models import Date
+
+# Indexed by day_number_of_week - 1 (Sunday = 1, as in the AdventureWorks warehouse)
+DAY_NAMES = {
+    'english': ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'),
+    'spanish': ('Domingo', 'Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado'),
+    'french': ('Dimanche', 'Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi'),
+}
+# Indexed by month_number_of_year - 1
+MONTH_NAMES = {
+    'english': ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December'),
+    'spanish': ('Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+                'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'),
+    'french': ('Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet',
+               'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre'),
+}
+
+
+def parse_date(value):
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}; use YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = ("Fill the Date dimension for every day from --start to --end (inclusive). "
+            "Days already present are left as they are, so the command can be re-run.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help="First date, YYYY-MM-DD")
+        parser.add_argument('--end', required=True, help="Last date, YYYY-MM-DD")
+        parser.add_argument('--fiscal-start-month', type=int, default=7,
+                            help="Month the fiscal year starts in; it is named after the year it ends in (default 7, July)")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per INSERT")
+
+    def handle(self, *args, **options):
+        start, end = parse_date(options['start']), parse_date(options['end'])
+        if end < start:
+            raise CommandError("--end must not be before --start")
+        if not 1 <= options['fiscal_start_month'] <= 12:
+            raise CommandError("--fiscal-start-month must be between 1 and 12")
+
+        in_range = Date.objects.filter(full_date_alternate_key__range=(start, end))
+        before = in_range.count()
+        Date.objects.bulk_create(self.build_dates(start, end, options['fiscal_start_month']),
+                                 batch_size=options['batch_size'], ignore_conflicts=True)
+        added = in_range.count() - before
+        total = (end - start).days + 1
+        self.stdout.write(f"Added {added} date(s) from {start} to {end}; {total - added} already present.")
+
+    def build_dates(self, start, end, fiscal_start_month):
+        """Date rows for the range, with every attribute derived from the day's ordinal."""
+        # Per-year and per-month attributes are worked out once, not per day
+        months = {}
+        for year in range(start.year, end.year + 1):
+            jan1 = date(year, 1, 1)
+            # SQL Server style week numbers: weeks start on Sunday, week 1 holds 1 January
+            jan1_offset = (jan1.weekday() + 1) % 7
+            for month in range(1, 13):
+                fiscal_month = (month - fiscal_start_month) % 12
+                months[year, month] = dict(
+                    english_month_name=MONTH_NAMES['english'][month - 1],
+                    spanish_month_name=MONTH_NAMES['spanish'][month - 1],
+                    french_month_name=MONTH_NAMES['french'][month - 1],
+                    month_number_of_year=month,
+                    calendar_quarter=(month - 1) // 3 + 1,
+                    calendar_year=year,
+                    calendar_semester=(month - 1) // 6 + 1,
+                    fiscal_quarter=fiscal_month // 3 + 1,
+                    fiscal_year=year + 1 if fiscal_start_month > 1 and month >= fiscal_start_month else year,
+                    fiscal_semester=fiscal_month // 6 + 1,
+                ), jan1.toordinal(), jan1_offset
+
+        dates = []
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            day = date.fromordinal(ordinal)
+            month_fields, jan1_ordinal, jan1_offset = months[day.year, day.month]
+            day_of_week = ordinal % 7  # ordinal 7 (0001-01-07) was a Sunday
+            day_of_year = ordinal - jan1_ordinal + 1
+            dates.append(Date(
+                date_key=day.year * 10000 + day.month * 100 + day.day,
+                full_date_alternate_key=day,
+                day_number_of_week=day_of_week + 1,
+                english_day_name_of_week=DAY_NAMES['english'][day_of_week],
+                spanish_day_name_of_week=DAY_NAMES['spanish'][day_of_week],
+                french_day_name_of_week=DAY_NAMES['french'][day_of_week],
+                day_number_of_month=day.day,
+                day_number_of_year=day_of_year,
+                week_number_of_year=(day_of_year + jan1_offset - 1) // 7 + 1,
+                **month_fields,
+            ))
+        return dates
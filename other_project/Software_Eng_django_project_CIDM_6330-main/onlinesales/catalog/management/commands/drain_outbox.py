@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from catalog.models import EmailOutbox
+
+# Longest a claimed batch may take to send before other workers retake it
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+class Command(BaseCommand):
+    help = "Send queued order emails from the outbox in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help="Emails claimed and sent per batch")
+        parser.add_argument('--max-attempts', type=int, default=5, help="Give up on an email after this many failures")
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when the outbox is empty")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            # Emails that failed in this run are retried on the next run/poll
+            failed_ids = set()
+            while True:
+                sent, failed = self.drain_batch(options['batch_size'], options['max_attempts'], failed_ids)
+                total_sent += sent
+                total_failed += failed
+                if not (sent or failed):
+                    break
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f"Sent {total_sent} email(s), {total_failed} failed attempt(s).")
+
+    def drain_batch(self, batch_size, max_attempts, failed_ids):
+        """Send one batch of pending emails, skipping ``failed_ids``; returns (sent, failed).
+
+        Rows are claimed and their results recorded in two short
+        transactions; the SMTP round trips in between run outside any
+        transaction, so order requests never wait on the mail server.
+        """
+        batch = self.claim_batch(batch_size, max_attempts, failed_ids)
+        if not batch:
+            return 0, 0
+
+        # One connection (one SMTP login) for the whole batch; each email
+        # is sent on its own so one bad address does not fail the rest
+        mail = get_connection(fail_silently=False)
+        try:
+            mail.open()
+        except Exception as exc:
+            errors = {email.id: exc for email in batch}
+        else:
+            errors = {}
+            try:
+                for email in batch:
+                    message = EmailMessage(email.subject, email.body, email.from_email, [email.to])
+                    try:
+                        mail.send_messages([message])
+                    except Exception as exc:
+                        errors[email.id] = exc
+            finally:
+                mail.close()
+
+        now = timezone.now()
+        for email in batch:
+            email.attempts += 1
+            email.claimed_at = None
+            if email.id in errors:
+                email.last_error = str(errors[email.id])
+                failed_ids.add(email.id)
+            else:
+                email.sent_at = now
+        with transaction.atomic():
+            EmailOutbox.objects.bulk_update(batch, ['attempts', 'last_error', 'sent_at', 'claimed_at'])
+        return len(batch) - len(errors), len(errors)
+
+    def claim_batch(self, batch_size, max_attempts, failed_ids):
+        """Lease up to ``batch_size`` pending emails to this worker."""
+        now = timezone.now()
+        # A worker that died mid-batch loses its lease after CLAIM_LEASE
+        claimable = (EmailOutbox.objects
+                     .filter(sent_at__isnull=True, attempts__lt=max_attempts)
+                     .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - CLAIM_LEASE)))
+        with transaction.atomic():
+            pending = claimable.exclude(id__in=failed_ids).order_by('id')
+            if connection.features.has_select_for_update_skip_locked:
+                # Several workers can drain concurrently without sending twice
+                pending = pending.select_for_update(skip_locked=True)
+            ids = list(pending.values_list('id', flat=True)[:batch_size])
+            # Re-checking the lease makes the claim safe without row locks too
+            claimable.filter(id__in=ids).update(claimed_at=now)
+        return list(EmailOutbox.objects.filter(id__in=ids, claimed_at=now).order_by('id'))
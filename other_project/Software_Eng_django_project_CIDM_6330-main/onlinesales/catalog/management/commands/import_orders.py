@@ -0,0 +1,168 @@
+import csv
+import json
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from catalog.models import Currency, Customer, Date, Orders, Product
+
+STATUSES = {code for code, _ in Orders.ORDER_STATUS}
+
+
+class Command(BaseCommand):
+    help = ("Bulk-load order lines from a CSV or JSONL file (- for stdin). Columns: sales_order_number, "
+            "sales_order_line_number (default 1), product (alternate key or id), customer (alternate key or email), "
+            "currency (code), order_date (YYYY-MM-DD, must exist in the Date dimension; see build_date_dimension), "
+            "order_quantity, unit_price, and optionally due_date, ship_date, unit_price_discount_pct, status. "
+            "Lines already imported are skipped. Inventory is decremented per batch; order "
+            "signals do not run, so no confirmation emails are queued.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file of order lines, or - for stdin")
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help="Input format (default: from the file extension)")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Order lines inserted per transaction")
+        parser.add_argument('--skip-invalid', action='store_true', help="Report and skip bad lines instead of stopping")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.ndjson')) else 'csv')
+        self.load_lookups()
+        imported = duplicates = invalid = 0
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        try:
+            if fmt == 'csv':
+                # The reader skips blank lines and joins quoted multi-line
+                # fields, so take each record's line number from it
+                reader = csv.DictReader(stream)
+                rows, parse = ((reader.line_num, row) for row in reader), dict
+            else:
+                rows, parse = enumerate(stream, start=1), self.parse_json
+            batch = []
+            for line_number, row in rows:
+                if fmt == 'jsonl' and not row.strip():
+                    continue
+                try:
+                    batch.append(self.build_order(parse(row)))
+                except KeyError as exc:
+                    invalid += self.invalid_line(f"Line {line_number}: missing column {exc}", imported, options)
+                    continue
+                except (ValueError, TypeError, InvalidOperation) as exc:
+                    invalid += self.invalid_line(f"Line {line_number}: {exc}", imported, options)
+                    continue
+                if len(batch) >= options['batch_size']:
+                    added, skipped = self.save_batch(batch)
+                    imported, duplicates, batch = imported + added, duplicates + skipped, []
+            if batch:
+                added, skipped = self.save_batch(batch)
+                imported, duplicates = imported + added, duplicates + skipped
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(f"Imported {imported} order line(s), skipped {duplicates} duplicate(s), {invalid} invalid.")
+
+    def invalid_line(self, message, imported, options):
+        if not options['skip_invalid']:
+            raise CommandError(f"{message} ({imported} line(s) imported before it)")
+        self.stderr.write(message)
+        return 1
+
+    @staticmethod
+    def parse_json(line):
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError(f"expected a JSON object, got {type(row).__name__}")
+        return row
+
+    def load_lookups(self):
+        """Map natural keys to primary keys once, instead of a query per line."""
+        self.products = {str(pk): pk for pk in Product.objects.values_list('id', flat=True)}
+        self.products.update(Product.objects.exclude(product_alternate_key=None)
+                             .values_list('product_alternate_key', 'id'))
+        self.customers = dict(Customer.objects.values_list('email_address', 'id'))
+        self.customers.update(Customer.objects.values_list('customer_alternate_key', 'id'))
+        self.currencies = dict(Currency.objects.values_list('currency_alternate_key', 'id'))
+        self.dates = {d.isoformat(): key for key, d in Date.objects.values_list('date_key', 'full_date_alternate_key')}
+
+    def lookup(self, mapping, value, name):
+        try:
+            return mapping[str(value).strip()]
+        except KeyError:
+            raise ValueError(f"unknown {name} {value!r}") from None
+
+    def day(self, value, name):
+        """``(date_key, midnight datetime)`` for a YYYY-MM-DD value."""
+        date_key = self.lookup(self.dates, value, name)
+        moment = datetime.combine(date.fromisoformat(str(value).strip()), datetime.min.time())
+        return date_key, timezone.make_aware(moment) if settings.USE_TZ else moment
+
+    def build_order(self, row):
+        # Optional columns may be missing or empty in either format
+        optional = {key: value for key, value in row.items() if value not in (None, '')}
+        quantity = int(row['order_quantity'])
+        if quantity <= 0:
+            raise ValueError(f"order_quantity must be positive, got {quantity}")
+        unit_price = Decimal(str(row['unit_price']))
+        discount_pct = float(optional.get('unit_price_discount_pct', 0))
+        extended_amount = quantity * unit_price
+        discount_amount = float(extended_amount) * discount_pct
+        status = optional.get('status', 'p')
+        if status not in STATUSES:
+            raise ValueError(f"unknown status {status!r}")
+
+        # Orders.save() stamps the actual dates (due +1 day, ship +2) on
+        # creation; imported lines take them from the file where given
+        order_date, order_time = self.day(row['order_date'], 'order_date')
+        due_date, due_time = (self.day(optional['due_date'], 'due_date') if 'due_date' in optional
+                              else (None, order_time + timedelta(days=1)))
+        ship_date, ship_time = (self.day(optional['ship_date'], 'ship_date') if 'ship_date' in optional
+                                else (None, order_time + timedelta(days=2)))
+        return Orders(
+            sales_order_number=str(row['sales_order_number']).strip(),
+            sales_order_line_number=int(optional.get('sales_order_line_number', 1)),
+            product_id=self.lookup(self.products, row['product'], 'product'),
+            customer_id=self.lookup(self.customers, row['customer'], 'customer'),
+            currency_id=self.lookup(self.currencies, row['currency'], 'currency'),
+            order_date_id=order_date,
+            due_date_id=due_date,
+            ship_date_id=ship_date,
+            order_quantity=quantity,
+            unit_price=unit_price,
+            unit_price_discount_pct=discount_pct,
+            extended_amount=extended_amount,
+            discount_amount=discount_amount,
+            sales_amount=extended_amount - Decimal(str(discount_amount)),
+            status=status,
+            order_date_actual=order_time,
+            due_date_actual=due_time,
+            ship_date_actual=ship_time,
+        )
+
+    def save_batch(self, batch):
+        """Insert new lines and take their stock in one transaction; returns (imported, duplicates)."""
+        with transaction.atomic():
+            existing = set(Orders.objects
+                           .filter(sales_order_number__in={order.sales_order_number for order in batch})
+                           .values_list('sales_order_number', 'sales_order_line_number'))
+            new = []
+            for order in batch:
+                key = (order.sales_order_number, order.sales_order_line_number)
+                if key not in existing:
+                    existing.add(key)  # a line repeated within the file counts once
+                    new.append(order)
+            Orders.objects.bulk_create(new)
+
+            # One UPDATE for the batch instead of one per order line
+            taken = Counter()
+            for order in new:
+                taken[order.product_id] += order.order_quantity
+            if taken:
+                Product.objects.filter(pk__in=taken).update(inventory_count=F('inventory_count') - Case(
+                    *[When(pk=pk, then=Value(quantity)) for pk, quantity in taken.items()],
+                    output_field=IntegerField()))
+        return len(new), len(batch) - len(new)
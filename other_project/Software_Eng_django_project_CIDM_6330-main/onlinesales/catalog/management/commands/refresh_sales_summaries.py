@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from catalog.reporting import refresh_sales_summaries
+
+
+class Command(BaseCommand):
+    help = ("Refresh the pre-aggregated sales tables behind the sales report. Only months with orders "
+            "created or changed since the last refresh are rebuilt. Use --full after changing which "
+            "subcategory products belong to, since that does not touch any order.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Rebuild every month instead of only changed ones")
+
+    def handle(self, *args, **options):
+        months = refresh_sales_summaries(full=options['full'])
+        if months:
+            self.stdout.write(f"Rebuilt {len(months)} month(s): {months[0]:%Y-%m} to {months[-1]:%Y-%m}.")
+        else:
+            self.stdout.write("Sales summaries are up to date.")
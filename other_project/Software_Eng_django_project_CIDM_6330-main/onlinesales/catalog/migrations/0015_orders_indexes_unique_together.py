@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0014_alter_date_full_date_alternate_key'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='orders',
+            options={'permissions': (('can_mark_shipped', 'Can mark order as shipped'),), 'verbose_name': 'Order', 'verbose_name_plural': 'Orders'},
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='email_address',
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+        migrations.AlterUniqueTogether(
+            name='orders',
+            unique_together={('sales_order_number', 'sales_order_line_number')},
+        ),
+        migrations.AddIndex(
+            model_name='orders',
+            index=models.Index(fields=['customer', 'status', 'order_date'], name='orders_cust_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orders',
+            index=models.Index(fields=['status', 'order_date'], name='orders_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0016_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerMonthlySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_lines', models.PositiveIntegerField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('sales_amount', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('month', models.DateField(help_text='First day of the month')),
+            ],
+            options={
+                'verbose_name': 'Customer Monthly Sales',
+                'verbose_name_plural': 'Customer Monthly Sales',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_lines', models.PositiveIntegerField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('sales_amount', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('day', models.DateField(unique=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Sales',
+                'verbose_name_plural': 'Daily Sales',
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_lines', models.PositiveIntegerField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('sales_amount', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('month', models.DateField(help_text='First day of the month', unique=True)),
+            ],
+            options={
+                'verbose_name': 'Monthly Sales',
+                'verbose_name_plural': 'Monthly Sales',
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesSummaryState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('high_water_mark', models.DateTimeField(blank=True, help_text='Orders updated before this time are summarised', null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StaleSalesMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month', unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SubcategoryMonthlySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_lines', models.PositiveIntegerField()),
+                ('quantity', models.PositiveIntegerField()),
+                ('sales_amount', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('month', models.DateField(help_text='First day of the month')),
+            ],
+            options={
+                'verbose_name': 'Subcategory Monthly Sales',
+                'verbose_name_plural': 'Subcategory Monthly Sales',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='orders',
+            options={'permissions': (('can_mark_shipped', 'Can mark order as shipped'), ('can_view_sales_reports', 'Can view sales reports')), 'verbose_name': 'Order', 'verbose_name_plural': 'Orders'},
+        ),
+        migrations.AddField(
+            model_name='orders',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='orders',
+            index=models.Index(fields=['order_date_actual'], name='orders_date_actual_idx'),
+        ),
+        migrations.AddField(
+            model_name='customermonthlysales',
+            name='customer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='catalog.customer'),
+        ),
+        migrations.AddField(
+            model_name='subcategorymonthlysales',
+            name='product_subcategory',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='catalog.productsubcategory'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='customermonthlysales',
+            unique_together={('month', 'customer')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='subcategorymonthlysales',
+            unique_together={('month', 'product_subcategory')},
+        ),
+    ]
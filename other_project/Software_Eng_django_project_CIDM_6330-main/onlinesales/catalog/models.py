@@ -34,6 +34,8 @@ class Orders(models.Model):
     order_date_actual = models.DateTimeField(null=True, blank=True, help_text="Enter the actual order date")
     due_date_actual = models.DateTimeField(null=True, blank=True, help_text="Enter the actual due date")
     ship_date_actual = models.DateTimeField(null=True, blank=True, help_text="Enter the actual ship date")
+    # High-water mark for refresh_sales_summaries; also set by bulk_create
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     promotions = models.ManyToManyField('Promotion', blank=True, help_text="Select promotions for this order")
     ORDER_STATUS = (
         ('p', 'Processing'),
@@ -53,11 +55,17 @@ class Orders(models.Model):
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         unique_together = ('sales_order_number', 'sales_order_line_number')
-
-    class Meta:
         permissions = (
             ("can_mark_shipped", "Can mark order as shipped"),
-        )  
+            ("can_view_sales_reports", "Can view sales reports"),
+        )
+        # Order lists filter by customer and/or status, newest first;
+        # sales summaries are rebuilt a month of order_date_actual at a time
+        indexes = [
+            models.Index(fields=['customer', 'status', 'order_date'], name='orders_cust_status_date_idx'),
+            models.Index(fields=['status', 'order_date'], name='orders_status_date_idx'),
+            models.Index(fields=['order_date_actual'], name='orders_date_actual_idx'),
+        ]
 
     def __str__(self):
         """String for representing the Model object."""
@@ -96,7 +104,7 @@ class Customer(models.Model):
     last_name = models.CharField(max_length=50, null=False, blank=False)
     birth_date = models.DateField(null=False, blank=False)
     gender = models.CharField(max_length=1, null=True, blank=True)
-    email_address = models.CharField(max_length=50, null=False, blank=False)
+    email_address = models.CharField(max_length=50, null=False, blank=False, db_index=True)  # Users are matched to customers by email
     english_education = models.CharField(max_length=40, null=True, blank=True)
     spanish_education = models.CharField(max_length=40, null=True, blank=True)
     french_education = models.CharField(max_length=40, null=True, blank=True)
@@ -251,3 +259,128 @@ class ProductSubcategory(models.Model):
     def __str__(self):
         """String for representing the Model object."""
         return self.english_product_subcategory_name
+
+
+class EmailOutbox(models.Model):
+    """Model representing a notification email waiting to be sent.
+
+    Rows are written in the same transaction as the order change that
+    caused them and sent later by the ``drain_outbox`` command.
+    """
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.CharField(max_length=254, help_text="Recipient email address")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Lease taken by a drain_outbox worker while it sends the email
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Outbox Email'
+        verbose_name_plural = 'Outbox Emails'
+        # drain_outbox reads unsent rows oldest first
+        indexes = [
+            models.Index(fields=['sent_at', 'id'], name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'{self.subject} -> {self.to}'
+
+
+class SalesSummary(models.Model):
+    """Totals shared by the pre-aggregated sales tables.
+
+    The tables are rebuilt from Orders by ``refresh_sales_summaries`` (see
+    ``catalog.reporting``); reports read them instead of aggregating Orders.
+    """
+    order_lines = models.PositiveIntegerField()
+    quantity = models.PositiveIntegerField()
+    sales_amount = models.DecimalField(max_digits=19, decimal_places=4)
+
+    class Meta:
+        abstract = True
+
+
+class DailySales(SalesSummary):
+    """Model representing sales totals for one day."""
+    day = models.DateField(unique=True)
+
+    class Meta:
+        verbose_name = 'Daily Sales'
+        verbose_name_plural = 'Daily Sales'
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'{self.day}: {self.sales_amount}'
+
+
+class MonthlySales(SalesSummary):
+    """Model representing sales totals for one month."""
+    month = models.DateField(unique=True, help_text="First day of the month")
+
+    class Meta:
+        verbose_name = 'Monthly Sales'
+        verbose_name_plural = 'Monthly Sales'
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'{self.month:%Y-%m}: {self.sales_amount}'
+
+
+class SubcategoryMonthlySales(SalesSummary):
+    """Model representing one product subcategory's sales in one month."""
+    month = models.DateField(help_text="First day of the month")
+    product_subcategory = models.ForeignKey('ProductSubcategory', on_delete=models.CASCADE, null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Subcategory Monthly Sales'
+        verbose_name_plural = 'Subcategory Monthly Sales'
+        unique_together = ('month', 'product_subcategory')
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'{self.month:%Y-%m} {self.product_subcategory}: {self.sales_amount}'
+
+
+class CustomerMonthlySales(SalesSummary):
+    """Model representing one customer's purchases in one month."""
+    month = models.DateField(help_text="First day of the month")
+    customer = models.ForeignKey('Customer', on_delete=models.CASCADE)
+
+    class Meta:
+        verbose_name = 'Customer Monthly Sales'
+        verbose_name_plural = 'Customer Monthly Sales'
+        unique_together = ('month', 'customer')
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'{self.month:%Y-%m} {self.customer}: {self.sales_amount}'
+
+
+class StaleSalesMonth(models.Model):
+    """Model representing a month whose summaries lost an order.
+
+    Deleted orders, and orders moved to another month, leave no newer
+    ``updated_at`` behind for the high-water mark to find, so signals queue
+    the month they left here for the next refresh.
+    """
+    month = models.DateField(unique=True, help_text="First day of the month")
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'{self.month:%Y-%m}'
+
+
+class SalesSummaryState(models.Model):
+    """Model representing how far the sales summaries have been refreshed."""
+    high_water_mark = models.DateTimeField(null=True, blank=True,
+                                           help_text="Orders updated before this time are summarised")
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """String for representing the Model object."""
+        return f'Summaries up to {self.high_water_mark}'
@@ -0,0 +1,167 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.http import Http404
+
+
+def encode_cursor(direction, values):
+    """Opaque URL-safe token for a page boundary ('n' = rows after, 'p' = rows before)."""
+    payload = json.dumps([direction, list(values)], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        direction, values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise Http404('Invalid cursor')
+    if direction not in ('n', 'p') or not isinstance(values, list):
+        raise Http404('Invalid cursor')
+    return direction, values
+
+
+class KeysetPage:
+    """One page of a keyset-paginated list, with cursors to its neighbours."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, count=None, count_capped=False):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_capped = count_capped
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginationMixin:
+    """ListView mixin that pages with ``WHERE key < last key`` instead of OFFSET.
+
+    ``keyset`` is the ordering, e.g. ``('-order_date', '-id')``; its last field
+    must be unique and non-null. A nullable leading field sorts its NULLs
+    last and is paged as a second segment, so every query stays an index
+    range. No COUNT is run unless ``count_limit`` is set, in which case the
+    count stops at that many rows (shown as "1000+").
+    """
+    keyset = ('-id',)
+    cursor_kwarg = 'cursor'
+    count_limit = None
+
+    def paginate_queryset(self, queryset, page_size):
+        token = self.request.GET.get(self.cursor_kwarg)
+        direction, values = decode_cursor(token) if token else ('n', None)
+        fields = [(name.lstrip('-'), name.startswith('-')) for name in self.keyset]
+        if values is not None:
+            values = self._parse_key(queryset.model, fields, values)
+
+        rows = self._fetch(queryset, fields, values, page_size + 1, reverse=direction == 'p')
+        if direction == 'p' and len(rows) <= page_size:
+            # Reached the start: show a full first page rather than a short one
+            direction, values = 'n', None
+            rows = self._fetch(queryset, fields, None, page_size + 1, reverse=False)
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == 'p':
+            rows.reverse()
+        page = self._page(queryset, fields, rows,
+                          has_next=more or direction == 'p', has_previous=values is not None)
+        return None, page, page.object_list, page.has_other_pages()
+
+    def _page(self, queryset, fields, rows, has_next, has_previous):
+        count = capped = None
+        if self.count_limit is not None:
+            count = queryset.order_by()[:self.count_limit + 1].count()
+            capped = count > self.count_limit
+            count = min(count, self.count_limit)
+        return KeysetPage(
+            rows,
+            encode_cursor('n', self._key(queryset.model, fields, rows[-1])) if rows and has_next else None,
+            encode_cursor('p', self._key(queryset.model, fields, rows[0])) if rows and has_previous else None,
+            count, capped,
+        )
+
+    @staticmethod
+    def _parse_key(model, fields, values):
+        """Cursor values converted to the keyset fields' types; Http404 if they don't fit."""
+        if len(values) != len(fields):
+            raise Http404('Invalid cursor')
+        parsed = []
+        for i, ((name, _), value) in enumerate(zip(fields, values)):
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            if value is None:
+                # Only a nullable leading key marks the NULL segment
+                if i == 0 and len(fields) > 1 and field.null:
+                    parsed.append(None)
+                    continue
+                raise Http404('Invalid cursor')
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise Http404('Invalid cursor')
+            try:
+                value = field.to_python(value)
+            except (ValidationError, ValueError, TypeError):
+                raise Http404('Invalid cursor')
+            if value is None:
+                raise Http404('Invalid cursor')
+            parsed.append(value)
+        return parsed
+
+    @staticmethod
+    def _key(model, fields, obj):
+        return [getattr(obj, model._meta.pk.attname if name == 'pk' else model._meta.get_field(name).attname)
+                for name, _ in fields]
+
+    def _segments(self, queryset, fields):
+        """(queryset, key fields) pairs in forward order; NULL leading keys come last."""
+        name = fields[0][0]
+        if len(fields) > 1 and name != 'pk' and queryset.model._meta.get_field(name).null:
+            return [(queryset.filter(**{f'{name}__isnull': False}), fields),
+                    (queryset.filter(**{f'{name}__isnull': True}), fields[1:])]
+        return [(queryset, fields)]
+
+    def _fetch(self, queryset, fields, values, limit, reverse):
+        segments = self._segments(queryset, fields)
+        start = 0
+        if values is not None and len(segments) > 1 and values[0] is None:
+            start, values = 1, values[1:]
+        order = range(start, len(segments)) if not reverse else range(start, -1, -1)
+        rows = []
+        for i in order:
+            segment, keys = segments[i]
+            if i == start and values is not None:
+                segment = segment.filter(self._beyond(keys, values[-len(keys):], reverse))
+            ordering = [F(name).asc() if descending == reverse else F(name).desc() for name, descending in keys]
+            rows.extend(segment.order_by(*ordering)[:limit - len(rows)])
+            if len(rows) >= limit:
+                break
+        return rows
+
+    @staticmethod
+    def _beyond(keys, values, reverse):
+        """Rows strictly after ``values`` in the key order (before, if ``reverse``)."""
+        def lookup(descending, inclusive=False):
+            return ('lt' if descending != reverse else 'gt') + ('e' if inclusive else '')
+
+        name, descending = keys[-1]
+        condition = Q(**{f'{name}__{lookup(descending)}': values[-1]})
+        for (name, descending), value in reversed(list(zip(keys[:-1], values[:-1]))):
+            condition = Q(**{f'{name}__{lookup(descending)}': value}) | (Q(**{name: value}) & condition)
+        if len(keys) > 1:
+            # A redundant bound on the leading key lets the database seek the index
+            name, descending = keys[0]
+            condition &= Q(**{f'{name}__{lookup(descending, inclusive=True)}': values[0]})
+        return condition
@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DateField, DecimalField, F, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import (CustomerMonthlySales, DailySales, MonthlySales, Orders, SalesSummaryState,
+                     StaleSalesMonth, SubcategoryMonthlySales)
+
+# Orders committed shortly before a refresh may carry an updated_at older
+# than the mark it sets; re-reading this window catches them, and
+# rebuilding a month twice gives the same rows.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+AMOUNT_FIELD = DecimalField(max_digits=19, decimal_places=4)
+
+# Site orders store extended_amount; imported lines also store sales_amount (after discount)
+LINE_AMOUNT = Coalesce('sales_amount', 'extended_amount', F('order_quantity') * F('unit_price'),
+                       output_field=AMOUNT_FIELD)
+
+# Coalesced so a group whose amounts are all NULL still sums to 0, as the
+# non-null summary columns require
+TOTALS = {
+    'order_lines': Count('id'),
+    'quantity': Coalesce(Sum('order_quantity'), 0),
+    'sales_amount': Coalesce(Sum(LINE_AMOUNT), Decimal(0), output_field=AMOUNT_FIELD),
+}
+
+
+def month_start(moment):
+    """First day of the month ``moment`` falls in, in the current time zone."""
+    return timezone.localtime(moment).date().replace(day=1)
+
+
+def queue_stale_month(moment):
+    if moment is not None:
+        StaleSalesMonth.objects.get_or_create(month=month_start(moment))
+
+
+def rebuild_month(month):
+    """Replace every summary row for ``month`` with totals aggregated from Orders."""
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    tz = timezone.get_current_timezone()
+    orders = Orders.objects.filter(
+        order_date_actual__gte=timezone.make_aware(datetime.combine(month, datetime.min.time()), tz),
+        order_date_actual__lt=timezone.make_aware(datetime.combine(next_month, datetime.min.time()), tz),
+    ).order_by()
+
+    with transaction.atomic():
+        DailySales.objects.filter(day__gte=month, day__lt=next_month).delete()
+        days = [DailySales(day=row.pop('day'), **row)
+                for row in orders.annotate(day=TruncDate('order_date_actual')).values('day').annotate(**TOTALS)]
+        DailySales.objects.bulk_create(days)
+
+        # The month is the sum of its days; no second pass over Orders
+        MonthlySales.objects.filter(month=month).delete()
+        if days:
+            MonthlySales.objects.create(
+                month=month,
+                order_lines=sum(day.order_lines for day in days),
+                quantity=sum(day.quantity for day in days),
+                sales_amount=sum(day.sales_amount for day in days),
+            )
+
+        SubcategoryMonthlySales.objects.filter(month=month).delete()
+        SubcategoryMonthlySales.objects.bulk_create([
+            SubcategoryMonthlySales(month=month, product_subcategory_id=row.pop('product__product_subcategory'), **row)
+            for row in orders.values('product__product_subcategory').annotate(**TOTALS)])
+
+        CustomerMonthlySales.objects.filter(month=month).delete()
+        CustomerMonthlySales.objects.bulk_create(
+            [CustomerMonthlySales(month=month, customer_id=row.pop('customer'), **row)
+             for row in orders.values('customer').annotate(**TOTALS)],
+            batch_size=5000)
+
+
+def refresh_sales_summaries(full=False):
+    """Bring the summary tables up to date; returns the months rebuilt.
+
+    Only months holding orders created or changed since the last refresh
+    (by ``Orders.updated_at``), or queued in StaleSalesMonth, are rebuilt.
+    ``full`` rebuilds every month, as the first refresh does.
+    """
+    with transaction.atomic():
+        # Readers keep seeing the previous summaries until the refresh commits
+        state, _ = SalesSummaryState.objects.get_or_create(pk=1)
+        started = timezone.now()
+        stale = list(StaleSalesMonth.objects.all())
+        dated = Orders.objects.exclude(order_date_actual=None).order_by()
+        if full or state.high_water_mark is None:
+            for model in (DailySales, MonthlySales, SubcategoryMonthlySales, CustomerMonthlySales):
+                model.objects.all().delete()
+        else:
+            dated = dated.filter(updated_at__gte=state.high_water_mark - REFRESH_OVERLAP)
+
+        months = set(dated.annotate(month=TruncMonth('order_date_actual', output_field=DateField()))
+                     .values_list('month', flat=True).distinct())
+        months.update(entry.month for entry in stale)
+        for month in sorted(months):
+            rebuild_month(month)
+
+        StaleSalesMonth.objects.filter(pk__in=[entry.pk for entry in stale]).delete()
+        state.high_water_mark = started
+        state.refreshed_at = timezone.now()
+        state.save()
+    return sorted(months)
+
+
+def get_sales_report(year, month=None):
+    """Monthly totals, subcategory totals and top customers for ``year``, from the summaries.
+
+    With ``month`` (1-12) the subcategory and customer figures cover that
+    month only, and its daily totals are included.
+    """
+    months = MonthlySales.objects.filter(month__year=year).order_by('month')
+    period = {'month__year': year} if month is None else {'month': date(year, month, 1)}
+    subcategories = (SubcategoryMonthlySales.objects.filter(**period)
+                     .values('product_subcategory__english_product_subcategory_name')
+                     .annotate(order_lines=Coalesce(Sum('order_lines'), 0),
+                               quantity=Coalesce(Sum('quantity'), 0),
+                               sales_amount=Coalesce(Sum('sales_amount'), Decimal(0), output_field=AMOUNT_FIELD))
+                     .order_by('-sales_amount'))
+    customers = (CustomerMonthlySales.objects.filter(**period)
+                 .values('customer', 'customer__first_name', 'customer__last_name')
+                 .annotate(order_lines=Coalesce(Sum('order_lines'), 0),
+                           sales_amount=Coalesce(Sum('sales_amount'), Decimal(0), output_field=AMOUNT_FIELD))
+                 .order_by('-sales_amount')[:10])
+    days = DailySales.objects.none()
+    if month is not None:
+        days = DailySales.objects.filter(day__year=year, day__month=month).order_by('day')
+    return {
+        'months': list(months),
+        'days': list(days),
+        'subcategories': list(subcategories),
+        'top_customers': list(customers),
+    }
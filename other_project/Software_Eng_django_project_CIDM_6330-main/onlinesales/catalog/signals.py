@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import Orders, Product
-from django.core.mail import send_mail
+from .models import EmailOutbox, Orders, Product, ProductSubcategory
+from django.db.models import F
+from .caching import invalidate_price_map, invalidate_subcategory_counts
+from .reporting import month_start, queue_stale_month
 
 
 #This handler logs a message whenever an order is created or updated
@@ -12,33 +14,64 @@ def update_order_status(sender, instance, created, **kwargs):
     else:
         print(f"Order updated with ID: {instance.id}")
 
+# Product changes must reach the cached price map served to the order form
+# and the cached per-subcategory product counts on the home and product pages
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_caches(sender, **kwargs):
+    invalidate_price_map()
+    invalidate_subcategory_counts()
+
+@receiver(post_save, sender=ProductSubcategory)
+@receiver(post_delete, sender=ProductSubcategory)
+def invalidate_subcategory_caches(sender, **kwargs):
+    invalidate_subcategory_counts()
+
 # This logs a message right before a product is deleted
 @receiver(pre_delete, sender=Product)
 def product_pre_delete(sender, instance, **kwargs):
     print(f"Product to be deleted: {instance.english_product_name}")
 
-#This handler sends an email notification to customer whenever an order is created or updated
+#This handler queues an email notification to the customer whenever an order is created or updated.
+# The outbox row is part of the order's transaction (it is only sent if the order
+# commits) and drain_outbox sends it later, so requests never wait on SMTP.
 @receiver(post_save, sender=Orders)
 def update_order_status_email(sender, instance, created, **kwargs):
     if created:
-        send_mail(
-            'Order Confirmation',
-            'Thank you for your order! Your order number is {}'.format(instance.id),
-            'customerservice@marketplace.com',
-            [instance.customer.email_address],
-            fail_silently=False,
-        )
+        subject = 'Order Confirmation'
+        body = 'Thank you for your order! Your order number is {}'.format(instance.id)
     else:
-        send_mail(
-            'Order Updated',
-            'Your order with number {} has been updated.'.format(instance.id),
-            'customerservice@marketplace.com',
-            [instance.customer.email_address],
-            fail_silently=False,
-        )
+        subject = 'Order Updated'
+        body = 'Your order with number {} has been updated.'.format(instance.id)
+    EmailOutbox.objects.create(
+        subject=subject,
+        body=body,
+        from_email='customerservice@marketplace.com',
+        to=instance.customer.email_address,
+    )
+
 # This handler manages inventory after an order is placed
 @receiver(post_save, sender=Orders)
-def manage_inventory(sender, instance, **kwargs):
-    product = instance.product
-    product.inventory_count -= instance.order_quantity
-    product.save()
+def manage_inventory(sender, instance, created, **kwargs):
+    # Only a new order takes stock; status updates re-save the same order.
+    # A single UPDATE ... SET inventory_count = inventory_count - n is atomic
+    # in the database, so concurrent orders cannot overwrite each other.
+    if created:
+        Product.objects.filter(pk=instance.product_id).update(
+            inventory_count=F('inventory_count') - instance.order_quantity)
+
+# The sales summaries are refreshed from orders with a newer updated_at.
+# A deleted order, or one moved to another month, leaves nothing newer in the
+# month it came from, so that month is queued to be rebuilt.
+@receiver(pre_save, sender=Orders)
+def queue_sales_month_left(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (update_fields is not None and 'order_date_actual' not in update_fields):
+        return
+    previous = Orders.objects.filter(pk=instance.pk).values_list('order_date_actual', flat=True).first()
+    if previous is not None and (instance.order_date_actual is None
+                                 or month_start(previous) != month_start(instance.order_date_actual)):
+        queue_stale_month(previous)
+
+@receiver(post_delete, sender=Orders)
+def queue_sales_month_deleted(sender, instance, **kwargs):
+    queue_stale_month(instance.order_date_actual)
@@ -0,0 +1,345 @@
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User, Permission
+from catalog.models import Product, Orders, Customer, Currency, EmailOutbox, Date, ProductSubcategory, DailySales, MonthlySales, SubcategoryMonthlySales, CustomerMonthlySales
+from catalog.reporting import LINE_AMOUNT
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+class FlakyEmailBackend(EmailBackend):
+    """Locmem backend that rejects one recipient."""
+
+    def send_messages(self, messages):
+        if any('bounce@example.com' in message.to for message in messages):
+            raise ConnectionError('550 mailbox unavailable')
+        return super().send_messages(messages)
+
+
+class TransactionDepthEmailBackend(EmailBackend):
+    """Locmem backend that records how many atomic blocks surround each send."""
+    depths = []
+
+    def send_messages(self, messages):
+        self.depths.append(len(connection.atomic_blocks))
+        return super().send_messages(messages)
+
+
+class DrainOutboxCommandTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='12345')
+        self.user.user_permissions.add(Permission.objects.get(codename='can_mark_shipped'))
+        self.client.login(username='staff', password='12345')
+        self.customer = Customer.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email_address='johndoe@example.com',
+            birth_date='1980-01-01'
+        )
+        self.currency = Currency.objects.create(currency_alternate_key='USD', currency_name='United States Dollar')
+        self.product = Product.objects.create(
+            english_product_name='Example Product',
+            list_price=150.00,
+            finished_goods_flag=True
+        )
+
+    def create_order(self):
+        return self.client.post(reverse('create-order'), {
+            'product': self.product.id,
+            'order_quantity': 1,
+            'unit_price': self.product.list_price,
+            'currency': self.currency.id,
+            'customer': self.customer.id
+        })
+
+    def drain(self, **options):
+        out = StringIO()
+        call_command('drain_outbox', stdout=out, **options)
+        return out.getvalue()
+
+    def test_requests_queue_email_instead_of_sending(self):
+        self.assertEqual(self.create_order().status_code, 302)
+        order = Orders.objects.get()
+        self.client.post(reverse('update-order-status', kwargs={'pk': order.pk}), {'status': 's'})
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            list(EmailOutbox.objects.order_by('id').values_list('subject', 'to')),
+            [('Order Confirmation', 'johndoe@example.com'), ('Order Updated', 'johndoe@example.com')])
+
+    def test_drain_sends_in_batches_and_marks_sent(self):
+        for _ in range(5):
+            self.create_order()
+        output = self.drain(batch_size=2)
+
+        self.assertIn('Sent 5 email(s)', output)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(EmailOutbox.objects.filter(sent_at__isnull=True).exists())
+        self.assertIn('Sent 0 email(s)', self.drain())
+
+    @override_settings(EMAIL_BACKEND='catalog.tests.test_commands.FlakyEmailBackend')
+    def test_failed_email_is_retried_until_max_attempts(self):
+        self.create_order()
+        EmailOutbox.objects.create(subject='Hi', body='...', from_email='a@example.com', to='bounce@example.com')
+
+        self.assertIn('Sent 1 email(s), 1 failed', self.drain(max_attempts=2))
+        bounced = EmailOutbox.objects.get(to='bounce@example.com')
+        self.assertEqual((bounced.attempts, bounced.sent_at), (1, None))
+        self.assertIn('550', bounced.last_error)
+
+        self.drain(max_attempts=2)
+        self.assertIn('Sent 0 email(s), 0 failed', self.drain(max_attempts=2))
+        bounced.refresh_from_db()
+        self.assertEqual(bounced.attempts, 2)
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(EMAIL_BACKEND='catalog.tests.test_commands.TransactionDepthEmailBackend')
+    def test_emails_are_sent_outside_transactions(self):
+        self.create_order()
+        TransactionDepthEmailBackend.depths = []
+        # TestCase's own atomic blocks are the only ones open while sending
+        outer = len(connection.atomic_blocks)
+        self.assertIn('Sent 1 email(s)', self.drain())
+        self.assertEqual(TransactionDepthEmailBackend.depths, [outer])
+        self.assertIsNone(EmailOutbox.objects.get().claimed_at)
+
+    def test_claimed_emails_wait_for_their_lease_to_expire(self):
+        self.create_order()
+        email = EmailOutbox.objects.get()
+        EmailOutbox.objects.update(claimed_at=timezone.now())
+        self.assertIn('Sent 0 email(s)', self.drain())
+
+        EmailOutbox.objects.update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertIn('Sent 1 email(s)', self.drain())
+        email.refresh_from_db()
+        self.assertIsNotNone(email.sent_at)
+
+
+class ImportOrdersCommandTest(TestCase):
+    HEADER = 'sales_order_number,sales_order_line_number,product,customer,currency,order_date,order_quantity,unit_price\n'
+
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            first_name='John', last_name='Doe', email_address='johndoe@example.com', birth_date='1980-01-01',
+            customer_alternate_key='AW00011000')
+        Currency.objects.create(currency_alternate_key='USD', currency_name='United States Dollar')
+        self.chair = Product.objects.create(english_product_name='Chair', product_alternate_key='FR-R92B-58',
+                                            finished_goods_flag=True)
+        self.desk = Product.objects.create(english_product_name='Desk', finished_goods_flag=True)
+        for day in (1, 2):
+            Date.objects.create(
+                date_key=20240100 + day, full_date_alternate_key=date(2024, 1, day), day_number_of_week=1,
+                english_day_name_of_week='', spanish_day_name_of_week='', french_day_name_of_week='',
+                day_number_of_month=day, day_number_of_year=day, week_number_of_year=1, english_month_name='',
+                spanish_month_name='', french_month_name='', month_number_of_year=1, calendar_quarter=1,
+                calendar_year=2024)
+
+    def write(self, text, suffix='.csv'):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, **options):
+        out = StringIO()
+        call_command('import_orders', path, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_csv_lines_resolve_keys_and_take_stock_per_batch(self):
+        path = self.write(self.HEADER
+                          + 'SO1,1,FR-R92B-58,AW00011000,USD,2024-01-01,2,10.50\n'
+                          + f'SO1,2,{self.desk.id},johndoe@example.com,USD,2024-01-02,3,100\n'
+                          + 'SO2,1,FR-R92B-58,johndoe@example.com,USD,2024-01-02,1,10.50\n')
+        output = self.run_import(path, batch_size=2)
+
+        self.assertIn('Imported 3 order line(s)', output)
+        line = Orders.objects.get(sales_order_number='SO1', sales_order_line_number=2)
+        self.assertEqual((line.product, line.customer, line.order_date_id), (self.desk, self.customer, 20240102))
+        self.assertEqual(line.extended_amount, Decimal('300'))
+        self.assertEqual(line.order_date_actual.date(), date(2024, 1, 2))
+        self.chair.refresh_from_db()
+        self.desk.refresh_from_db()
+        self.assertEqual((self.chair.inventory_count, self.desk.inventory_count), (97, 97))
+        # No per-order signals: nothing is queued for email
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_reimport_skips_existing_lines(self):
+        path = self.write(self.HEADER + 'SO1,1,FR-R92B-58,AW00011000,USD,2024-01-01,2,10.50\n')
+        self.run_import(path)
+        self.assertIn('Imported 0 order line(s), skipped 1 duplicate(s)', self.run_import(path))
+        self.chair.refresh_from_db()
+        self.assertEqual(self.chair.inventory_count, 98)
+
+    def test_jsonl(self):
+        path = self.write(json.dumps({'sales_order_number': 'SO9', 'product': self.desk.id, 'customer': 'AW00011000',
+                                      'currency': 'USD', 'order_date': '2024-01-01', 'order_quantity': 1,
+                                      'unit_price': 5, 'status': 's'}) + '\n', suffix='.jsonl')
+        self.assertIn('Imported 1 order line(s)', self.run_import(path))
+        self.assertEqual(Orders.objects.get().status, 's')
+
+    def test_invalid_line_stops_unless_skipped(self):
+        path = self.write(self.HEADER
+                          + 'SO1,1,FR-R92B-58,AW00011000,USD,2024-01-01,2,10.50\n'
+                          + 'SO2,1,FR-R92B-58,AW00011000,USD,1999-01-01,2,10.50\n')
+        with self.assertRaisesMessage(CommandError, "Line 3: unknown order_date '1999-01-01'"):
+            self.run_import(path)
+        self.assertFalse(Orders.objects.exists())
+
+        self.assertIn('Imported 1 order line(s), skipped 0 duplicate(s), 1 invalid', self.run_import(path, skip_invalid=True))
+
+    def test_invalid_line_numbers_count_blank_lines(self):
+        good = json.dumps({'sales_order_number': 'SO9', 'product': self.desk.id, 'customer': 'AW00011000',
+                           'currency': 'USD', 'order_date': '2024-01-01', 'order_quantity': 1, 'unit_price': 5})
+        path = self.write(f'{good}\n\n[1, 2]\n', suffix='.jsonl')
+        with self.assertRaisesMessage(CommandError, "Line 3: expected a JSON object, got list"):
+            self.run_import(path)
+
+        csv_path = self.write(self.HEADER + '\n' + 'SO2,1,FR-R92B-58,AW00011000,USD,1999-01-01,2,10.50\n')
+        with self.assertRaisesMessage(CommandError, "Line 3: unknown order_date '1999-01-01'"):
+            self.run_import(csv_path)
+
+    def test_non_object_json_lines_are_skipped_as_invalid(self):
+        good = json.dumps({'sales_order_number': 'SO9', 'product': self.desk.id, 'customer': 'AW00011000',
+                           'currency': 'USD', 'order_date': '2024-01-01', 'order_quantity': 1, 'unit_price': 5})
+        path = self.write(f'null\n[]\n7\n{good}\n', suffix='.jsonl')
+        self.assertIn('Imported 1 order line(s), skipped 0 duplicate(s), 3 invalid',
+                      self.run_import(path, skip_invalid=True))
+
+
+class BuildDateDimensionCommandTest(TestCase):
+    def build(self, start, end):
+        out = StringIO()
+        call_command('build_date_dimension', start=start, end=end, stdout=out)
+        return out.getvalue()
+
+    def test_builds_every_attribute(self):
+        self.assertIn('Added 366 date(s)', self.build('2024-01-01', '2024-12-31'))
+        day = Date.objects.get(date_key=20240704)
+        self.assertEqual(day.full_date_alternate_key, date(2024, 7, 4))
+        self.assertEqual(
+            (day.day_number_of_week, day.english_day_name_of_week, day.spanish_day_name_of_week,
+             day.french_day_name_of_week),
+            (5, 'Thursday', 'Jueves', 'Jeudi'))
+        self.assertEqual(
+            (day.day_number_of_month, day.day_number_of_year, day.week_number_of_year),
+            (4, 186, 27))
+        self.assertEqual(
+            (day.english_month_name, day.spanish_month_name, day.french_month_name, day.month_number_of_year),
+            ('July', 'Julio', 'Juillet', 7))
+        self.assertEqual(
+            (day.calendar_quarter, day.calendar_year, day.calendar_semester),
+            (3, 2024, 2))
+        # The fiscal year starts in July and is named after the year it ends in
+        self.assertEqual((day.fiscal_quarter, day.fiscal_year, day.fiscal_semester), (1, 2025, 1))
+        self.assertEqual(Date.objects.get(date_key=20241231).week_number_of_year, 53)
+
+    def test_is_idempotent(self):
+        self.build('2024-01-01', '2024-01-31')
+        self.assertIn('Added 0 date(s) from 2024-01-01 to 2024-01-31; 31 already present', self.build('2024-01-01', '2024-01-31'))
+        self.assertIn('Added 29 date(s)', self.build('2024-01-15', '2024-02-29'))
+        self.assertEqual(Date.objects.count(), 60)
+
+    def test_rejects_reversed_range(self):
+        with self.assertRaisesMessage(CommandError, '--end must not be before --start'):
+            self.build('2024-02-01', '2024-01-01')
+
+
+class RefreshSalesSummariesCommandTest(TestCase):
+    def setUp(self):
+        self.currency = Currency.objects.create(currency_alternate_key='USD', currency_name='United States Dollar')
+        self.customer = Customer.objects.create(first_name='John', last_name='Doe',
+                                                email_address='johndoe@example.com', birth_date='1980-01-01')
+        self.bikes = ProductSubcategory.objects.create(english_product_subcategory_name='Bikes')
+        self.bike = Product.objects.create(english_product_name='Road Bike', product_subcategory=self.bikes,
+                                           finished_goods_flag=True)
+        # Everything here is committed well before each refresh
+        patcher = mock.patch('catalog.reporting.REFRESH_OVERLAP', timedelta(0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def order(self, day, quantity=1, unit_price=10):
+        order = Orders.objects.create(product=self.bike, customer=self.customer, currency=self.currency,
+                                      order_quantity=quantity, unit_price=unit_price, extended_amount=quantity * unit_price)
+        # Orders.save() stamps the creation time; date the order ``day`` as an import would
+        order.order_date_actual = datetime(day.year, day.month, day.day, 12, tzinfo=dt_timezone.utc)
+        Orders.objects.filter(pk=order.pk).update(order_date_actual=order.order_date_actual,
+                                                  updated_at=order.updated_at)
+        return order
+
+    def refresh(self, **options):
+        out = StringIO()
+        call_command('refresh_sales_summaries', stdout=out, **options)
+        return out.getvalue()
+
+    def assertSummariesMatchOrders(self):
+        live = {row['day']: (row['lines'], row['quantity'], row['amount']) for row in
+                Orders.objects.annotate(day=TruncDate('order_date_actual')).values('day')
+                .annotate(lines=Count('id'), quantity=Sum('order_quantity'), amount=Sum(LINE_AMOUNT))}
+        self.assertEqual({row.day: (row.order_lines, row.quantity, row.sales_amount) for row in DailySales.objects.all()}, live)
+        total = Orders.objects.aggregate(amount=Sum(LINE_AMOUNT))['amount']
+        for model in (MonthlySales, SubcategoryMonthlySales, CustomerMonthlySales):
+            self.assertEqual(model.objects.aggregate(amount=Sum('sales_amount'))['amount'], total, model.__name__)
+
+    def test_first_refresh_builds_every_month(self):
+        self.order(date(2024, 1, 5), quantity=2)
+        self.order(date(2024, 1, 5))
+        self.order(date(2024, 3, 1), unit_price=25)
+
+        self.assertIn('Rebuilt 2 month(s): 2024-01 to 2024-03', self.refresh())
+        self.assertSummariesMatchOrders()
+        january = MonthlySales.objects.get(month=date(2024, 1, 1))
+        self.assertEqual((january.order_lines, january.quantity, january.sales_amount), (2, 3, Decimal('30')))
+        self.assertEqual(SubcategoryMonthlySales.objects.get(month=date(2024, 3, 1)).product_subcategory, self.bikes)
+        self.assertIn('up to date', self.refresh())
+
+    def test_incremental_refresh_rebuilds_changed_months_only(self):
+        january = self.order(date(2024, 1, 5))
+        self.order(date(2024, 3, 1))
+        self.refresh()
+
+        self.order(date(2024, 3, 2), quantity=4)
+        self.assertIn('Rebuilt 1 month(s): 2024-03 to 2024-03', self.refresh())
+        self.assertSummariesMatchOrders()
+
+        # Deleting, or moving an order to another month, leaves no newer
+        # updated_at in the month it came from; signals queue that month
+        january.order_date_actual = datetime(2024, 2, 1, 12, tzinfo=dt_timezone.utc)
+        january.save()
+        self.assertIn('Rebuilt 2 month(s): 2024-01 to 2024-02', self.refresh())
+        self.assertFalse(MonthlySales.objects.filter(month=date(2024, 1, 1)).exists())
+        self.assertSummariesMatchOrders()
+
+        Orders.objects.get(pk=january.pk).delete()
+        self.assertIn('Rebuilt 1 month(s): 2024-02 to 2024-02', self.refresh())
+        self.assertSummariesMatchOrders()
+
+    def test_imported_orders_are_picked_up(self):
+        self.refresh()
+        Date.objects.create(
+            date_key=20240105, full_date_alternate_key=date(2024, 1, 5), day_number_of_week=6,
+            english_day_name_of_week='', spanish_day_name_of_week='', french_day_name_of_week='',
+            day_number_of_month=5, day_number_of_year=5, week_number_of_year=1, english_month_name='',
+            spanish_month_name='', french_month_name='', month_number_of_year=1, calendar_quarter=1,
+            calendar_year=2024)
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as f:
+            f.write('sales_order_number,product,customer,currency,order_date,order_quantity,unit_price\n'
+                    f'SO1,{self.bike.id},johndoe@example.com,USD,2024-01-05,3,10\n')
+        self.addCleanup(os.remove, path)
+        call_command('import_orders', path, stdout=StringIO())
+
+        self.assertIn('Rebuilt 1 month(s): 2024-01', self.refresh())
+        self.assertEqual(DailySales.objects.get(day=date(2024, 1, 5)).sales_amount, Decimal('30'))
@@ -1,4 +1,6 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
 from django.urls import reverse
 from catalog.models import Product, Customer, Orders, Date, Currency
 from django.contrib.auth.models import User
@@ -109,3 +111,56 @@ class CatalogIntegrationTests(TestCase):
         response = self.client.get(reverse('product-detail', args=[999]))  # Assuming ID 999 does not exist
         self.assertEqual(response.status_code, 404)
 
+
+
+class ConcurrentOrderInventoryTests(TransactionTestCase):
+    """Simultaneous order submissions must each take stock exactly once."""
+
+    def setUp(self):
+        self.product = Product.objects.create(
+            english_product_name='Chair',
+            list_price=29.99,
+            inventory_count=1000,
+            finished_goods_flag=True
+        )
+        self.customer = Customer.objects.create(
+            first_name='John',
+            last_name='Doe',
+            birth_date='1990-01-01',
+            email_address='johndoe@example.com'
+        )
+        self.currency = Currency.objects.create(
+            currency_alternate_key='USD',
+            currency_name='United States Dollar'
+        )
+
+    def submit_order(self, quantity):
+        try:
+            response = Client().post(reverse('create-order'), {
+                'product': self.product.id,
+                'order_quantity': quantity,
+                'unit_price': self.product.list_price,
+                'currency': self.currency.id,
+                'customer': self.customer.id
+            })
+            return response.status_code
+        finally:
+            connection.close()
+
+    def test_concurrent_orders_decrement_inventory_once_each(self):
+        quantities = [1, 2, 3] * 100
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            statuses = list(pool.map(self.submit_order, quantities))
+
+        self.assertEqual(statuses, [302] * len(quantities))
+        self.assertEqual(Orders.objects.count(), len(quantities))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_count, 1000 - sum(quantities))
+
+    def test_status_update_does_not_take_stock_again(self):
+        self.assertEqual(self.submit_order(5), 302)
+        order = Orders.objects.get()
+        order.status = 's'
+        order.save()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_count, 995)
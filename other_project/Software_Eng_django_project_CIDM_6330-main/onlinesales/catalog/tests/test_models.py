@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from catalog.models import Orders, Product, Customer, Currency, ProductSubcategory
 from django.contrib.auth.models import User
@@ -55,6 +56,23 @@ class OrdersModelTest(TestCase):
         total_cost = Decimal('1500.00')
         self.assertEqual(order.extended_amount, total_cost)
 
+    def test_order_line_is_unique(self):
+        order = Orders.objects.get(id=1)
+        order.sales_order_line_number = 1
+        order.save()
+        duplicate = Orders(
+            product=order.product,
+            customer=order.customer,
+            currency=order.currency,
+            order_quantity=1,
+            unit_price=150.00,
+            sales_order_number=order.sales_order_number,
+            sales_order_line_number=1
+        )
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                duplicate.save()
+
 class CustomerModelTest(TestCase):
 
     @classmethod
@@ -1,7 +1,18 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User, Permission
-from catalog.models import Product, Orders, Customer, ProductSubcategory, Currency
+from catalog.models import Product, Orders, Customer, ProductSubcategory, Currency, Date
+from catalog.views import AllOrdersListView
+from catalog.caching import get_price_map
+from catalog.pagination import encode_cursor
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
+from unittest import mock
 import json
 
 class IndexViewTest(TestCase):
@@ -82,3 +93,252 @@ class OrderStatusUpdateViewTest(TestCase):
     def test_HTTP404_for_invalid_order_if_logged_in(self):
         response = self.client.get(reverse('update-order-status', kwargs={'pk': 999}))
         self.assertEqual(response.status_code, 404)
+
+class OrderListQueryCountTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='12345', email='staff@example.com')
+        permission = Permission.objects.get(codename='can_mark_shipped')
+        self.user.user_permissions.add(permission)
+        self.client.login(username='staff', password='12345')
+
+        self.currency = Currency.objects.create(currency_alternate_key='USD', currency_name='United States Dollar')
+        self.customer = Customer.objects.create(
+            first_name='Jane',
+            last_name='Doe',
+            email_address='staff@example.com',
+            birth_date='1980-01-01'
+        )
+
+    def create_orders(self, count):
+        for _ in range(count):
+            product = Product.objects.create(
+                english_product_name='Example Product',
+                list_price=150.00,
+                finished_goods_flag=True
+            )
+            Orders.objects.create(
+                product=product,
+                customer=self.customer,
+                currency=self.currency,
+                order_quantity=1,
+                unit_price=100.00,
+                status='s'
+            )
+
+    def count_queries(self, url_name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        for url_name in ('all-orders', 'shipped-orders', 'recent-orders', 'my-shipped-orders'):
+            self.create_orders(2)
+            few = self.count_queries(url_name)
+            self.create_orders(8)
+            many = self.count_queries(url_name)
+            self.assertEqual(few, many, url_name)
+
+    def test_all_orders_is_paginated(self):
+        self.create_orders(30)
+        response = self.client.get(reverse('all-orders'))
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(len(response.context['orders']), 25)
+
+class ProductPriceEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.chair = Product.objects.create(english_product_name='Chair', list_price=29.99, finished_goods_flag=True)
+        self.table = Product.objects.create(english_product_name='Table', list_price=None, finished_goods_flag=True)
+
+    def test_price_map_json_with_etag(self):
+        response = self.client.get(reverse('product-prices'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {str(self.chair.id): 29.99, str(self.table.id): 0})
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        cached = self.client.get(reverse('product-prices'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_price_map_is_cached_until_a_product_changes(self):
+        etag = self.client.get(reverse('product-prices'))['ETag']
+        with self.assertNumQueries(0):
+            self.client.get(reverse('product-prices'))
+
+        self.chair.list_price = 35
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chair.save()
+        response = self.client.get(reverse('product-prices'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)[str(self.chair.id)], 35.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.table.delete()
+        self.assertNotIn(str(self.table.id), json.loads(self.client.get(reverse('product-prices')).content))
+
+    def test_price_map_is_invalidated_after_commit(self):
+        etag = self.client.get(reverse('product-prices'))['ETag']
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.chair.list_price = 35
+            self.chair.save()
+            # Until the save commits, the cached map keeps its version
+            self.assertEqual(self.client.get(reverse('product-prices'))['ETag'], etag)
+        self.assertTrue(callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(self.client.get(reverse('product-prices'))['ETag'], etag)
+
+    def test_price_map_is_read_once_per_request(self):
+        with mock.patch('catalog.views.get_price_map', wraps=get_price_map) as read:
+            response = self.client.get(reverse('product-prices'))
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(response['ETag'], get_price_map()[1])
+
+    def test_autocomplete_matches_name_or_id(self):
+        response = self.client.get(reverse('product-autocomplete'), {'q': 'cha'})
+        self.assertEqual(response.json(), {'results': [{'id': self.chair.id, 'name': 'Chair'}]})
+        response = self.client.get(reverse('product-autocomplete'), {'q': str(self.table.id)})
+        self.assertIn({'id': self.table.id, 'name': 'Table'}, response.json()['results'])
+        self.assertEqual(self.client.get(reverse('product-autocomplete')).json(), {'results': []})
+
+    def test_order_page_does_not_list_products(self):
+        with self.assertNumQueries(2):  # the customer and currency <select>s
+            response = self.client.get(reverse('create-order'))
+        self.assertNotContains(response, 'Chair')
+        self.assertContains(response, 'list="product-options"')
+
+class SubcategoryCountCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bikes = ProductSubcategory.objects.create(english_product_subcategory_name='Bikes')
+        Product.objects.create(english_product_name='Road Bike', product_subcategory=self.bikes, finished_goods_flag=True)
+
+    def counts(self, response):
+        return {s.english_product_subcategory_name: s.total_products for s in response.context['product_subcategories']}
+
+    def test_counts_are_served_without_aggregation(self):
+        self.assertEqual(self.counts(self.client.get(reverse('index'))), {'Bikes': 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('index'))
+            self.client.get(reverse('products'))
+        self.assertFalse([q for q in queries if 'GROUP BY' in q['sql']])
+
+    def test_counts_follow_product_and_subcategory_changes(self):
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks(execute=True):
+            bike = Product.objects.create(english_product_name='Mountain Bike', product_subcategory=self.bikes,
+                                          finished_goods_flag=True)
+        self.assertEqual(self.counts(self.client.get(reverse('products'))), {'Bikes': 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            helmets = ProductSubcategory.objects.create(english_product_subcategory_name='Helmets')
+            bike.product_subcategory = helmets
+            bike.save()
+        self.assertEqual(self.counts(self.client.get(reverse('index'))), {'Bikes': 1, 'Helmets': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bike.delete()
+        self.assertEqual(self.counts(self.client.get(reverse('index'))), {'Bikes': 1, 'Helmets': 0})
+
+    def test_counts_are_invalidated_after_commit(self):
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            ProductSubcategory.objects.create(english_product_subcategory_name='Helmets')
+            # Until the create commits, the cached counts keep their version
+            self.assertEqual(self.counts(self.client.get(reverse('index'))), {'Bikes': 1})
+        self.assertTrue(callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.counts(self.client.get(reverse('index'))), {'Bikes': 1, 'Helmets': 0})
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', password='12345', email='staff@example.com')
+        self.user.user_permissions.add(Permission.objects.get(codename='can_mark_shipped'))
+        self.client.login(username='staff', password='12345')
+        currency = Currency.objects.create(currency_alternate_key='USD', currency_name='United States Dollar')
+        customer = Customer.objects.create(first_name='Jane', last_name='Doe',
+                                           email_address='staff@example.com', birth_date='1980-01-01')
+        product = Product.objects.create(english_product_name='Example Product', finished_goods_flag=True)
+        dates = [Date.objects.create(
+            date_key=20240100 + day, full_date_alternate_key=date(2024, 1, day), day_number_of_week=1,
+            english_day_name_of_week='', spanish_day_name_of_week='', french_day_name_of_week='',
+            day_number_of_month=day, day_number_of_year=day, week_number_of_year=1, english_month_name='',
+            spanish_month_name='', french_month_name='', month_number_of_year=1, calendar_quarter=1,
+            calendar_year=2024) for day in (1, 2, 3)]
+        # Several orders share each date, and orders placed on the site have none
+        for i in range(62):
+            Orders.objects.create(product=product, customer=customer, currency=currency, order_quantity=1,
+                                  unit_price=1, order_date=dates[i % 4] if i % 4 < 3 else None)
+        self.expected = [o.pk for o in sorted(Orders.objects.all(),
+                                              key=lambda o: (o.order_date_id is not None, o.order_date_id or 0, o.pk),
+                                              reverse=True)]
+
+    def walk(self, link):
+        pages, params = [], {}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('all-orders'), params)
+            self.assertFalse([q for q in queries if 'OFFSET' in q['sql']])
+            page = response.context['page_obj']
+            pages.append([o.pk for o in page])
+            if not getattr(page, 'has_' + link)():
+                return pages, page
+            params = {'cursor': getattr(page, link + '_cursor')}
+
+    def test_cursors_walk_every_order_once(self):
+        pages, last = self.walk('next')
+        self.assertEqual([len(p) for p in pages], [25, 25, 12])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        # Paging back from the last page returns the same pages in reverse
+        params = {'cursor': last.previous_cursor}
+        back = []
+        while params:
+            page = self.client.get(reverse('all-orders'), params).context['page_obj']
+            back.append([o.pk for o in page])
+            params = {'cursor': page.previous_cursor} if page.has_previous() else None
+        self.assertEqual(back, pages[-2::-1])
+
+    def test_count_is_capped(self):
+        self.assertEqual(self.client.get(reverse('all-orders')).context['page_obj'].count, 62)
+        with mock.patch.object(AllOrdersListView, 'count_limit', 50):
+            page = self.client.get(reverse('all-orders')).context['page_obj']
+        self.assertEqual((page.count, page.count_capped), (50, True))
+        self.assertContains(self.client.get(reverse('all-orders')), '62 in total')
+
+    def test_invalid_cursor_is_404(self):
+        for cursor in ('not-a-cursor', 'WyJuIiwxXQ'):
+            self.assertEqual(self.client.get(reverse('all-orders'), {'cursor': cursor}).status_code, 404)
+        # Well-formed cursors whose values do not fit the ('-order_date', '-id') keyset
+        for values in ([1], [1, 2, 3], ['x', 1], [1, 'x'], [1, None], [None, None], [{}, 1], [[1], 1], [True, 1]):
+            cursor = encode_cursor('n', values)
+            self.assertEqual(self.client.get(reverse('all-orders'), {'cursor': cursor}).status_code, 404, values)
+
+
+class SalesReportViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='analyst', password='12345')
+        self.client.login(username='analyst', password='12345')
+        currency = Currency.objects.create(currency_alternate_key='USD', currency_name='United States Dollar')
+        customer = Customer.objects.create(first_name='Jane', last_name='Doe',
+                                           email_address='jane@example.com', birth_date='1980-01-01')
+        product = Product.objects.create(english_product_name='Road Bike', finished_goods_flag=True)
+        Orders.objects.create(product=product, customer=customer, currency=currency,
+                              order_quantity=2, unit_price=10, extended_amount=20)
+        call_command('refresh_sales_summaries', stdout=StringIO())
+
+    def test_requires_permission(self):
+        self.assertEqual(self.client.get(reverse('sales-report')).status_code, 403)
+
+    def test_reads_summaries_only(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='can_view_sales_reports'))
+        now = timezone.now()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('sales-report'), {'year': now.year, 'month': now.month})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Jane Doe')
+        self.assertEqual(response.context['months'][0].sales_amount, 20)
+        self.assertFalse([q for q in queries if 'catalog_orders' in q['sql']])
+        self.assertEqual(self.client.get(reverse('sales-report'), {'month': 13}).status_code, 404)
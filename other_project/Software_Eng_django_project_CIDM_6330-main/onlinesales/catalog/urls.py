@@ -31,8 +31,11 @@ urlpatterns = [
     path('my-shipped-orders/', ShippedOrdersByUserListView.as_view(), name='my-shipped-orders'),
 
     path('create-order/', create_order, name='create-order'),
+    path('products/prices.json', views.product_prices, name='product-prices'),
+    path('products/autocomplete/', views.product_autocomplete, name='product-autocomplete'),
     path('register/', register_customer, name='register-customer'),
     path('order/<int:pk>/update-status/', update_order_status, name='update-order-status'),
-    path('all-orders/', AllOrdersListView.as_view(), name='all-orders')
+    path('all-orders/', AllOrdersListView.as_view(), name='all-orders'),
+    path('reports/sales/', views.sales_report, name='sales-report'),
 ]
 
@@ -1,25 +1,52 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView
-from .models import Product, Orders, Customer, ProductSubcategory
+from .models import Product, Orders, Customer, ProductSubcategory, MonthlySales, SalesSummaryState
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import permission_required
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Q
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from .forms import OrderForm
-from django.http import HttpResponse
-import json
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from django.core.exceptions import ObjectDoesNotExist
 from .forms import CustomerRegistrationForm
 from .forms import OrderStatusForm
+from .caching import get_price_map, get_subcategory_counts
+from .pagination import KeysetPaginationMixin
+from .reporting import get_sales_report
+from django.utils import timezone
+
+# Columns the order list templates render; related rows come from one JOIN
+ORDER_LIST_FIELDS = (
+    'sales_order_number', 'sales_order_line_number', 'status',
+    'order_quantity', 'extended_amount', 'order_date_actual', 'ship_date_actual',
+    'customer__first_name', 'customer__last_name',
+    'product__english_product_name',
+    'currency__currency_alternate_key', 'currency__currency_name',
+    'order_date__full_date_alternate_key',
+)
+
+
+def order_list_queryset(**filters):
+    """Orders for list pages, newest first, in a constant number of queries."""
+    return (Orders.objects.filter(**filters)
+            .select_related('customer', 'product', 'currency', 'order_date')
+            .only(*ORDER_LIST_FIELDS)
+            .order_by('-order_date', '-id'))
+
 
 def index(request):
     """View function for the home page of the site."""
     num_visits = request.session.get('num_visits', 0)
     request.session['num_visits'] = num_visits + 1
     
-    product_subcategories = ProductSubcategory.objects.annotate(total_products=Count('product'))
+    # Cached; product and subcategory signals invalidate it
+    product_subcategories = get_subcategory_counts()
     
     context = {
         'product_subcategories': product_subcategories,
@@ -41,9 +68,10 @@ def index(request):
     return render(request, 'catalog/index.html', context)
 
 
-class ProductListView(ListView):
+class ProductListView(KeysetPaginationMixin, ListView):
     model = Product
     paginate_by = 5  # Display 5 products per page
+    keyset = ('id',)
     template_name = 'catalog/product_list.html'
     context_object_name = 'product_list'
 
@@ -56,7 +84,7 @@ class ProductListView(ListView):
         # Add number of visits to context
         context['num_visits'] = num_visits
         # Add in the product subcategories
-        context['product_subcategories'] = ProductSubcategory.objects.annotate(total_products=Count('product'))
+        context['product_subcategories'] = get_subcategory_counts()
         return context
 
 '''@login_required
@@ -70,11 +98,12 @@ def RecentOrdersView(request):
 
     return render(request, 'catalog/recent_orders_list.html', context=context)'''
 
-class RecentOrdersListView(LoginRequiredMixin, ListView):
+class RecentOrdersListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Orders
     template_name = 'catalog/recent_orders_list.html'
     context_object_name = 'recent_orders_list'
     paginate_by = 10  # Display 10 orders per page
+    keyset = ('-order_date', '-id')
 
     def get_queryset(self):
         # Ensure the user is authenticated and has an email
@@ -84,7 +113,7 @@ class RecentOrdersListView(LoginRequiredMixin, ListView):
                 # Attempt to find a matching Customer based on the User's email
                 customer = Customer.objects.get(email_address=user_email)
                 # Filter orders by the retrieved customer and return them
-                return Orders.objects.filter(customer=customer).order_by('-order_date')
+                return order_list_queryset(customer=customer)
             except ObjectDoesNotExist:
                 # If no Customer matches, return an empty queryset
                 return Orders.objects.none()
@@ -119,7 +148,7 @@ class ShippedOrdersListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         """Override to filter orders to those that have been shipped."""
-        return Orders.objects.filter(status='s').order_by('-order_date')
+        return order_list_queryset(status='s')
 
 class ShippedOrdersByUserListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     permission_required = 'catalog.can_mark_shipped'
@@ -133,7 +162,7 @@ class ShippedOrdersByUserListView(LoginRequiredMixin, PermissionRequiredMixin, L
             # Attempt to find the Customer by email
             customer = Customer.objects.get(email_address=user_email)
             # Filter Orders by Customer
-            return Orders.objects.filter(customer=customer, status='s').order_by('-order_date')
+            return order_list_queryset(customer=customer, status='s')
         except ObjectDoesNotExist:
             # If no matching Customer is found, return an empty queryset
             return Orders.objects.none()
@@ -142,14 +171,47 @@ def create_order(request):
     if request.method == 'POST':
         form = OrderForm(request.POST)
         if form.is_valid():
-            form.save()
+            # The order and its inventory decrement (post_save) commit together
+            with transaction.atomic():
+                form.save()
             return redirect('index')
     else:
         form = OrderForm()
 
-    products = Product.objects.all().values('id', 'list_price')
-    product_prices = json.dumps({str(product['id']): (float(product['list_price']) if product['list_price'] else 0) for product in products})
-    return render(request, 'catalog/order_form.html', {'form': form, 'product_prices': product_prices})
+    # Prices and product search are fetched by the page from the endpoints below
+    return render(request, 'catalog/order_form.html', {'form': form})
+
+
+def request_price_map(request):
+    """get_price_map() once per request, so the body always matches the ETag."""
+    if not hasattr(request, '_price_map'):
+        request._price_map = get_price_map()
+    return request._price_map
+
+
+@condition(etag_func=lambda request: request_price_map(request)[1])
+def product_prices(request):
+    """JSON {product id: list price}, cached until a product changes."""
+    response = HttpResponse(request_price_map(request)[0], content_type='application/json')
+    # Browsers keep the map and revalidate with If-None-Match (304 if unchanged)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+AUTOCOMPLETE_LIMIT = 20
+
+
+def product_autocomplete(request):
+    """Up to AUTOCOMPLETE_LIMIT products matching ?q= by ID or name."""
+    query = request.GET.get('q', '').strip()
+    products = Product.objects.none()
+    if query.isdigit():
+        products = Product.objects.filter(Q(pk=int(query)) | Q(english_product_name__icontains=query))
+    elif query:
+        products = Product.objects.filter(english_product_name__icontains=query)
+    results = list(products.order_by('english_product_name', 'id')
+                   .values('id', 'english_product_name')[:AUTOCOMPLETE_LIMIT])
+    return JsonResponse({'results': [{'id': p['id'], 'name': p['english_product_name']} for p in results]})
 
 
 '''def register_customer(request):
@@ -188,7 +250,9 @@ def update_order_status(request, pk):
     if request.method == 'POST':
         form = OrderStatusForm(request.POST, instance=order)
         if form.is_valid():
-            form.save()
+            # The status change and its queued notification commit together
+            with transaction.atomic():
+                form.save()
             return redirect('all-orders')  # Redirect to  orders listing page
     else:
         form = OrderStatusForm(instance=order)
@@ -196,11 +260,36 @@ def update_order_status(request, pk):
     return render(request, 'catalog/update_order_status.html', {'form': form, 'order': order})
 
 
-class AllOrdersListView(PermissionRequiredMixin, ListView):
+class AllOrdersListView(PermissionRequiredMixin, KeysetPaginationMixin, ListView):
     model = Orders
     template_name = 'catalog/all_orders_list.html'
     context_object_name = 'orders'
     permission_required = 'catalog.can_mark_shipped'  # Ensuring only authorized users can view this
+    paginate_by = 25  # The full order history is never rendered on one page
+    keyset = ('-order_date', '-id')
+    count_limit = 1000  # "1000+ orders" instead of counting the whole table
 
     def get_queryset(self):
-        return Orders.objects.all().order_by('-order_date')  
\ No newline at end of file
+        return order_list_queryset()
+
+
+@permission_required('catalog.can_view_sales_reports', raise_exception=True)
+def sales_report(request):
+    """Sales by month, subcategory and customer for ?year= (and ?month=), read from the summary tables."""
+    latest = MonthlySales.objects.order_by('-month').values_list('month', flat=True).first()
+    try:
+        year = int(request.GET.get('year') or (latest or timezone.now()).year)
+        month = int(request.GET['month']) if request.GET.get('month') else None
+    except ValueError:
+        raise Http404('Invalid report period')
+    if month is not None and not 1 <= month <= 12:
+        raise Http404('Invalid report period')
+
+    context = get_sales_report(year, month)
+    context.update({
+        'year': year,
+        'month': month,
+        # Summaries are as fresh as the last refresh_sales_summaries run
+        'summary_state': SalesSummaryState.objects.first(),
+    })
+    return render(request, 'catalog/sales_report.html', context)
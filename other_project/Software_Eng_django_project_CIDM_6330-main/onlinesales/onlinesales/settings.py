@@ -80,6 +80,14 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,  # Concurrent order writes wait for the lock instead of failing
+        },
+        'TEST': {
+            # A file rather than shared-cache memory, so tests see the same
+            # locking as the real database (shared cache fails instead of waiting)
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -134,6 +142,15 @@ LOGIN_URL = '/accounts/login/'
 # Redirect to home URL after logout (Default redirects to /accounts/profile/)
 LOGOUT_REDIRECT_URL = '/'
 
+# Per-process cache for the product price map. Use a shared cache (Redis,
+# Memcached) when running several processes, so invalidation reaches them all.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'onlinesales',
+    }
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 STATIC_URL = '/static/'